@@ -17,20 +17,41 @@ Key Concepts:
 from .core import (
     Vote,
     VoteStatus,
+    VoteRetention,
     VotingResult,
+    VoteTally,
+    VoteCanonicalizer,
+    SequentialVoting,
     RedFlagCriteria,
+    RedFlaggedResponse,
+    StreamingRedFlagMonitor,
     FirstToAheadByKVoting,
     Microagent,
     Step,
+    StepDescription,
+    compact_dependencies,
     TaskDecomposer,
+    ExecutionStats,
+    StepEvent,
     MAKEROrchestrator,
 )
 
+from .cache import DecidedResultCache
+
+from .journal import (
+    StepRecord,
+    StepJournal,
+    FileStepJournal,
+    SQLiteStepJournal,
+    create_step_journal,
+)
+
 from .entertainment_agents import (
     ContentType,
     MoodCategory,
     UserPreferences,
     ContentItem,
+    HardConstraints,
     RecommendationResult,
     MoodAnalyzerAgent,
     GenreMatcherAgent,
@@ -41,6 +62,15 @@ from .entertainment_agents import (
     EntertainmentDiscoveryDecomposer,
 )
 
+from .batch_scoring import (
+    CandidateBlock,
+    ScoreBlock,
+    BatchContentScorerAgent,
+    score_block,
+)
+
+from .catalog import ContentCatalog, CatalogIndex
+
 from .config import (
     MAKERConfig,
     LLMConfig,
@@ -118,18 +148,35 @@ __all__ = [
     # Core
     "Vote",
     "VoteStatus",
+    "VoteRetention",
     "VotingResult",
+    "VoteTally",
+    "VoteCanonicalizer",
+    "SequentialVoting",
     "RedFlagCriteria",
+    "RedFlaggedResponse",
+    "StreamingRedFlagMonitor",
     "FirstToAheadByKVoting",
     "Microagent",
     "Step",
+    "StepDescription",
+    "compact_dependencies",
     "TaskDecomposer",
+    "ExecutionStats",
+    "StepEvent",
     "MAKEROrchestrator",
+    "DecidedResultCache",
+    "StepRecord",
+    "StepJournal",
+    "FileStepJournal",
+    "SQLiteStepJournal",
+    "create_step_journal",
     # Entertainment Agents
     "ContentType",
     "MoodCategory",
     "UserPreferences",
     "ContentItem",
+    "HardConstraints",
     "RecommendationResult",
     "MoodAnalyzerAgent",
     "GenreMatcherAgent",
@@ -138,6 +185,12 @@ __all__ = [
     "ContentRankerAgent",
     "ExplanationGeneratorAgent",
     "EntertainmentDiscoveryDecomposer",
+    "CandidateBlock",
+    "ScoreBlock",
+    "BatchContentScorerAgent",
+    "score_block",
+    "ContentCatalog",
+    "CatalogIndex",
     # Config
     "MAKERConfig",
     "LLMConfig",
@@ -8,18 +8,21 @@ into the vibecast platform.
 import asyncio
 import logging
 from dataclasses import dataclass, field
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
 from .core import (
     MAKEROrchestrator,
     RedFlagCriteria,
+    SequentialVoting,
     Step,
+    VoteRetention,
 )
 from .entertainment_agents import (
     ContentType,
     MoodCategory,
     UserPreferences,
     ContentItem,
+    HardConstraints,
     RecommendationResult,
     MoodAnalyzerAgent,
     GenreMatcherAgent,
@@ -30,7 +33,10 @@ from .entertainment_agents import (
     EntertainmentDiscoveryDecomposer,
     ENTERTAINMENT_RED_FLAG_CRITERIA,
 )
+from .cache import DecidedResultCache
+from .catalog import ContentCatalog, Rows
 from .config import MAKERConfig, PRODUCTION_CONFIG
+from .journal import create_step_journal
 from .benchmark import MAKERBenchmark, VotingOptimizer, PerformanceProfiler
 from .llm_client import create_llm_client, BaseLLMClient
 
@@ -43,6 +49,8 @@ class DiscoveryRequest:
     user_input: str
     preferences: UserPreferences = field(default_factory=UserPreferences)
     candidates: list[ContentItem] = field(default_factory=list)
+    catalog: Optional[ContentCatalog] = None  # Candidates from catalog rows instead
+    catalog_rows: Rows = None  # Range, slice or index array (None = whole catalog)
     top_k: int = 5
     time_available_minutes: Optional[int] = None
     content_type: Optional[ContentType] = None
@@ -60,6 +68,7 @@ class DiscoveryResponse:
     stats: dict = field(default_factory=dict)
     success: bool = True
     error: Optional[str] = None
+    complete: bool = True  # False for partial responses from discover_stream
 
 
 class VibecastMAKER:
@@ -88,14 +97,34 @@ class VibecastMAKER:
         self.llm_client = llm_client or create_llm_client(self.config.llm)
 
         # Initialize decomposer
-        self.decomposer = EntertainmentDiscoveryDecomposer()
+        self.decomposer = EntertainmentDiscoveryDecomposer(
+            batch_scoring=self.config.batch_scoring,
+            prefilter=self.config.prefilter_mode
+        )
 
         # Initialize orchestrator
         self.orchestrator = MAKEROrchestrator(
             decomposer=self.decomposer,
             voting_k=self.config.voting.k,
             max_voting_rounds=self.config.voting.max_rounds,
-            red_flag_criteria=ENTERTAINMENT_RED_FLAG_CRITERIA
+            red_flag_criteria=ENTERTAINMENT_RED_FLAG_CRITERIA,
+            parallel_votes=self.config.voting.parallel_votes,
+            vote_timeout_ms=self.config.voting.timeout_ms,
+            step_timeout_ms=self.config.voting.step_timeout_ms,
+            vote_retention=VoteRetention(self.config.voting.vote_retention),
+            deterministic_fast_path=self.config.voting.deterministic_fast_path,
+            voting=self._build_voting(),
+            result_cache=self._build_result_cache(),
+            max_concurrent_steps=self.config.max_concurrent_steps,
+            decomposition_lookahead=self.config.decomposition_lookahead,
+            journal=(
+                create_step_journal(
+                    self.config.journal_path,
+                    self.config.journal_backend,
+                    fsync_interval_s=self.config.journal_fsync_interval_s
+                )
+                if self.config.journal_path else None
+            )
         )
 
         # Register agents
@@ -108,6 +137,36 @@ class VibecastMAKER:
         self.benchmark = MAKERBenchmark(self.orchestrator, self.config.benchmark.cost_per_vote)
         self.optimizer = VotingOptimizer(self.config.benchmark.target_success_rate)
 
+    def _build_voting(self) -> Optional[SequentialVoting]:
+        """Build the SPRT engine when selected; None keeps ahead-by-k."""
+        voting = self.config.voting
+        if voting.strategy == "ahead_by_k":
+            return None
+        if voting.strategy != "sprt":
+            raise ValueError(f"Unknown voting strategy: {voting.strategy}")
+
+        return SequentialVoting(
+            error_rate=voting.sprt_error_rate,
+            vote_accuracy=voting.vote_accuracy,
+            wrong_answer_spread=voting.sprt_wrong_answer_spread,
+            max_rounds=voting.max_rounds,
+            red_flag_criteria=ENTERTAINMENT_RED_FLAG_CRITERIA,
+            parallel_votes=voting.parallel_votes,
+            vote_timeout_ms=voting.timeout_ms,
+            step_timeout_ms=voting.step_timeout_ms,
+            retention=VoteRetention(voting.vote_retention)
+        )
+
+    def _build_result_cache(self) -> Optional[DecidedResultCache]:
+        """Build the cross-request result cache; None when disabled."""
+        voting = self.config.voting
+        if voting.result_cache_size <= 0:
+            return None
+        return DecidedResultCache(
+            max_entries=voting.result_cache_size,
+            ttl_seconds=voting.result_cache_ttl_s
+        )
+
     def _register_agents(self):
         """Register all microagents with the orchestrator."""
         agents = [
@@ -119,9 +178,55 @@ class VibecastMAKER:
             ExplanationGeneratorAgent(self.llm_client),
         ]
 
+        if self.config.batch_scoring:
+            from .batch_scoring import BatchContentScorerAgent
+            agents.append(BatchContentScorerAgent(self.llm_client))
+
         for agent in agents:
             self.orchestrator.register_agent(agent)
 
+    def _build_task(self, request: DiscoveryRequest) -> dict[str, Any]:
+        """Build the orchestrator task for a discovery request."""
+        candidates = request.candidates
+        if request.catalog is not None:
+            rows = request.catalog_rows
+            constraints = HardConstraints.from_preferences(request.preferences)
+            if self.config.prefilter_mode == "drop" and constraints.active:
+                # Unviable rows are never materialized
+                rows = request.catalog.prefilter(constraints, rows)
+
+            # Block scoring reads the catalog columns directly
+            if self.config.batch_scoring:
+                candidates = request.catalog.block(rows)
+            else:
+                candidates = request.catalog.items(rows)
+
+        return {
+            "user_input": request.user_input,
+            "preferences": request.preferences,
+            "candidates": candidates,
+            "top_k": request.top_k,
+            "time_available": request.time_available_minutes,
+            "content_type": request.content_type,
+            **request.context
+        }
+
+    def _select_agent(self, step: Step) -> str:
+        """Select the appropriate agent based on step."""
+        if step.step_id == 1:
+            return "mood_analyzer"
+        elif step.step_id == 2:
+            return "genre_matcher"
+        elif step.step_id == 3:
+            return "duration_filter"
+        elif EntertainmentDiscoveryDecomposer.is_score_step(step.step_id):
+            return "content_block_scorer" if self.config.batch_scoring else "content_scorer"
+        elif step.step_id == EntertainmentDiscoveryDecomposer.RANK_STEP_ID:
+            return "content_ranker"
+        elif EntertainmentDiscoveryDecomposer.is_explanation_step(step.step_id):
+            return "explanation_generator"
+        return "mood_analyzer"  # Default
+
     async def discover(self, request: DiscoveryRequest) -> DiscoveryResponse:
         """
         Discover content recommendations using MAKER methodology.
@@ -133,35 +238,10 @@ class VibecastMAKER:
             Discovery response with recommendations and explanations
         """
         try:
-            # Build task from request
-            task = {
-                "user_input": request.user_input,
-                "preferences": request.preferences,
-                "candidates": request.candidates,
-                "top_k": request.top_k,
-                "time_available": request.time_available_minutes,
-                "content_type": request.content_type,
-                **request.context
-            }
-
-            # Select appropriate agent based on step
-            def agent_selector(step: Step) -> str:
-                if step.step_id == 1:
-                    return "mood_analyzer"
-                elif step.step_id == 2:
-                    return "genre_matcher"
-                elif step.step_id == 3:
-                    return "duration_filter"
-                elif 100 <= step.step_id < 200:
-                    return "content_scorer"
-                elif step.step_id == 200:
-                    return "content_ranker"
-                elif step.step_id >= 300:
-                    return "explanation_generator"
-                return "mood_analyzer"  # Default
-
             # Execute task
-            result = await self.orchestrator.execute_task(task, agent_selector)
+            result = await self.orchestrator.execute_task(
+                self._build_task(request), self._select_agent
+            )
 
             # Extract response
             composed = result.get("result", {})
@@ -185,6 +265,57 @@ class VibecastMAKER:
                 error=str(e)
             )
 
+    async def discover_stream(
+        self,
+        request: DiscoveryRequest
+    ) -> AsyncIterator[DiscoveryResponse]:
+        """
+        Discover content recommendations, streaming partial responses.
+
+        Yields a response with ``complete=False`` each time the result
+        grows (mood detected, genres matched, items ranked, an explanation
+        generated), then the same final response ``discover`` returns.
+
+        Args:
+            request: Discovery request with user input and preferences
+
+        Yields:
+            Partial discovery responses, then the complete response
+        """
+        last_partial = None
+        try:
+            async for event in self.orchestrator.stream_task(
+                self._build_task(request), self._select_agent
+            ):
+                if event.final:
+                    composed = event.result.get("result", {})
+                    stats = event.result.get("stats", {})
+                elif event.partial is not last_partial:
+                    composed = last_partial = event.partial
+                    stats = {"completed_steps": event.completed_steps}
+                else:
+                    continue
+
+                yield DiscoveryResponse(
+                    recommendations=composed.get("recommendations", []),
+                    explanations=composed.get("explanations", {}),
+                    mood=composed.get("mood"),
+                    matched_genres=composed.get("matched_genres", []),
+                    duration_range=composed.get("duration_range"),
+                    stats=stats,
+                    success=True,
+                    complete=event.final
+                )
+
+        except Exception as e:
+            logger.error(f"Discovery error: {e}")
+            yield DiscoveryResponse(
+                recommendations=[],
+                explanations={},
+                success=False,
+                error=str(e)
+            )
+
     async def quick_recommend(
         self,
         query: str,
@@ -256,6 +387,10 @@ class VibecastMAKER:
         return {
             "orchestrator": self.orchestrator.execution_stats,
             "llm_client": self.llm_client.get_stats(),
+            "result_cache": (
+                self.orchestrator.result_cache.get_stats()
+                if self.orchestrator.result_cache else None
+            ),
             "profiler": self.profiler.get_summary(),
             "config": self.config.to_dict()
         }
@@ -0,0 +1,374 @@
+"""
+Vectorized Batch Scoring for MAKER
+
+``ContentScorerAgent`` scores one ``ContentItem`` per step: every call
+builds dicts, sets and a sorted factor list, and the decomposer emits one
+step per candidate. For catalogs of 10k-1M items that per-item Python
+overhead is the whole cost.
+
+``BatchContentScorerAgent`` scores a columnar ``CandidateBlock`` in one
+step with NumPy array operations. Every factor, the weighted sum and the
+confidence are computed with the same float operations in the same order
+as the per-item scorer, so scores match it exactly.
+
+Requires numpy (``pip install numpy``); it is imported on first use.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Collection, Optional, Sequence
+
+from .core import Microagent
+from .entertainment_agents import (
+    ContentItem,
+    ContentScorerAgent,
+    HardConstraints,
+    RecommendationResult,
+    UserPreferences,
+)
+
+
+_WORD_MASK = (1 << 64) - 1
+
+
+def _numpy():
+    """Import numpy, with an install hint when it is missing."""
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("numpy package not installed. Run: pip install numpy")
+    return numpy
+
+
+def _fingerprint(*parts: Any) -> str:
+    """Digest of arrays (by dtype, shape and bytes) and plain values."""
+    np = _numpy()
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            digest.update(f"{part.dtype.str}{part.shape}".encode())
+            digest.update(np.ascontiguousarray(part).tobytes())
+        else:
+            digest.update(repr(part).encode())
+    return digest.hexdigest()
+
+
+@dataclass
+class CandidateBlock:
+    """
+    Candidate content stored column-wise.
+
+    Genres are a bitset per row over ``genre_vocab`` (``genre_bits`` has
+    shape ``(rows, ceil(len(genre_vocab) / 64))``, dtype uint64) and
+    platforms are codes into ``platform_vocab``. Columns may be views of a
+    memory-mapped ``ContentCatalog``.
+    """
+    content_ids: Any  # str array
+    genre_vocab: list[str]
+    genre_bits: Any  # uint64 array, (rows, words)
+    ratings: Any  # float64 array
+    durations: Any  # int array, minutes
+    release_years: Any  # int array
+    platform_vocab: list[str]
+    platform_codes: Any  # int array
+
+    def __len__(self) -> int:
+        return len(self.content_ids)
+
+    def __vote_key__(self) -> tuple[str, str]:
+        """Compact key over every column (the default would repr the arrays)."""
+        return "CandidateBlock", _fingerprint(
+            self.content_ids, self.genre_vocab, self.genre_bits, self.ratings,
+            self.durations, self.release_years, self.platform_vocab, self.platform_codes
+        )
+
+    def __red_flag_text__(self) -> str:
+        return f"{len(self)} candidates"
+
+    @classmethod
+    def from_items(cls, items: Sequence[ContentItem]) -> "CandidateBlock":
+        """Build a block from content items."""
+        np = _numpy()
+
+        # Genre bitsets are built as Python ints, then split into 64-bit words
+        genre_index: dict[str, int] = {}
+        row_bits = []
+        for item in items:
+            bits = 0
+            for genre in item.genres:
+                bits |= 1 << genre_index.setdefault(genre, len(genre_index))
+            row_bits.append(bits)
+
+        platform_index: dict[str, int] = {}
+        platform_codes = [
+            platform_index.setdefault(item.platform, len(platform_index)) for item in items
+        ]
+
+        return cls(
+            content_ids=np.array([item.content_id for item in items], dtype=str),
+            genre_vocab=list(genre_index),
+            genre_bits=split_bitsets(row_bits, len(genre_index)),
+            ratings=np.array([item.rating for item in items], dtype=np.float64),
+            durations=np.array([item.duration_minutes for item in items], dtype=np.int64),
+            release_years=np.array([item.release_year for item in items], dtype=np.int64),
+            platform_vocab=list(platform_index),
+            platform_codes=np.array(platform_codes, dtype=np.int32),
+        )
+
+    def genre_mask(self, genres: Sequence[str]) -> Any:
+        """Bitset (one row of uint64 words) of the given genres."""
+        return bitset_mask(self.genre_vocab, genres, self.genre_bits.shape[1])
+
+    def take(self, rows: Any) -> "CandidateBlock":
+        """Block of the given rows (an index array), in that order."""
+        return CandidateBlock(
+            content_ids=self.content_ids[rows],
+            genre_vocab=self.genre_vocab,
+            genre_bits=self.genre_bits[rows],
+            ratings=self.ratings[rows],
+            durations=self.durations[rows],
+            release_years=self.release_years[rows],
+            platform_vocab=self.platform_vocab,
+            platform_codes=self.platform_codes[rows],
+        )
+
+    def admitted(self, constraints: HardConstraints) -> Any:
+        """Boolean row mask of items meeting every hard constraint."""
+        np = _numpy()
+        keep = np.ones(len(self), dtype=bool)
+        if constraints.available_platforms is not None:
+            keep &= self.platform_mask(constraints.available_platforms)
+        if constraints.max_duration_minutes is not None:
+            keep &= self.durations <= constraints.max_duration_minutes
+        if constraints.disliked_genres:
+            keep &= ~(self.genre_bits & self.genre_mask(constraints.disliked_genres)).any(axis=1)
+        return keep
+
+    def platform_mask(self, platforms: Sequence[str]) -> Any:
+        """Boolean row mask of items on any of the given platforms."""
+        np = _numpy()
+        wanted = set(platforms)
+        codes = [code for code, platform in enumerate(self.platform_vocab) if platform in wanted]
+        return np.isin(self.platform_codes, codes)
+
+
+def split_bitsets(row_bits: Sequence[int], num_bits: int) -> Any:
+    """Split per-row Python int bitsets into a (rows, words) uint64 array."""
+    np = _numpy()
+    words = max(1, -(-num_bits // 64))
+    bitsets = np.empty((len(row_bits), words), dtype=np.uint64)
+    for word in range(words):
+        bitsets[:, word] = [(bits >> (64 * word)) & _WORD_MASK for bits in row_bits]
+    return bitsets
+
+
+def bitset_mask(vocab: Sequence[str], values: Sequence[str], words: int) -> Any:
+    """Bitset (one row of uint64 words) of ``values`` over ``vocab``."""
+    np = _numpy()
+    mask = np.zeros(words, dtype=np.uint64)
+    bits = {value: bit for bit, value in enumerate(vocab)}
+    for value in set(values):
+        bit = bits.get(value)
+        if bit is not None:
+            mask[bit // 64] |= np.uint64(1 << (bit % 64))
+    return mask
+
+
+@dataclass
+class ScoreBlock:
+    """
+    Scores of a candidate block, stored column-wise.
+
+    ``factors`` maps each factor name to its column, in the per-item
+    scorer's factor order. ``result(i)`` materializes one row as the
+    ``RecommendationResult`` the per-item scorer would have returned.
+
+    Votes and red-flag checks see a compact key and summary, not the
+    arrays' printed form (whose length grows with the block).
+    """
+    content_ids: Any  # str array
+    scores: Any  # float64 array
+    confidences: Any  # float64 array
+    factors: dict[str, Any]
+
+    def __len__(self) -> int:
+        return len(self.content_ids)
+
+    def __vote_key__(self) -> tuple[str, str]:
+        return "ScoreBlock", _fingerprint(
+            self.content_ids, self.scores, self.confidences, list(self.factors), *self.factors.values()
+        )
+
+    def __red_flag_text__(self) -> str:
+        return f"{len(self)} scored items"
+
+    def result(self, index: int) -> RecommendationResult:
+        """Materialize one row as a RecommendationResult."""
+        factors = {name: float(column[index]) for name, column in self.factors.items()}
+        top_factors = sorted(factors.items(), key=lambda x: x[1], reverse=True)[:3]
+        return RecommendationResult(
+            content_id=str(self.content_ids[index]),
+            score=float(self.scores[index]),
+            reasoning=f"Strong on: {', '.join(f[0] for f in top_factors)}",
+            confidence=float(self.confidences[index]),
+            factors=factors
+        )
+
+    def to_results(self) -> list[RecommendationResult]:
+        """Materialize every row."""
+        return [self.result(i) for i in range(len(self))]
+
+    def top_rows(self, top_k: Optional[int] = None, demoted: Collection[str] = ()) -> Any:
+        """
+        Rows of the best ``top_k`` items by (score, confidence), best first.
+
+        Ties keep block order, as ``ContentRankerAgent``'s stable ranking
+        does, and ``demoted`` ids rank after all others. Uses argpartition
+        to find the k-th best score, then sorts only the rows scoring at
+        least that (every row tied at the threshold is kept, so ties are
+        broken exactly as a full stable sort would).
+        """
+        np = _numpy()
+        top_k = len(self) if top_k is None else max(0, top_k)
+        if not demoted:
+            return self._top_rows(np.arange(len(self)), top_k)
+
+        is_demoted = np.isin(self.content_ids, list(demoted))
+        top = self._top_rows(np.flatnonzero(~is_demoted), top_k)
+        if len(top) < top_k:
+            top = np.concatenate([top, self._top_rows(np.flatnonzero(is_demoted), top_k - len(top))])
+        return top
+
+    def _top_rows(self, rows: Any, top_k: int) -> Any:
+        """Best ``top_k`` of ``rows`` (ascending row indices), best first."""
+        np = _numpy()
+        if top_k == 0:
+            return rows[:0]
+        scores = self.scores[rows]
+        if top_k < len(rows):
+            threshold = np.partition(scores, len(rows) - top_k)[len(rows) - top_k]
+            rows = rows[scores >= threshold]
+            scores = self.scores[rows]
+        order = np.lexsort((-self.confidences[rows], -scores))
+        return rows[order[:top_k]]
+
+    def ranked_ids(
+        self,
+        top_k: Optional[int] = None,
+        demoted: Collection[str] = ()
+    ) -> list[str]:
+        """Content ids of ``top_rows(top_k, demoted)``."""
+        return [str(content_id) for content_id in self.content_ids[self.top_rows(top_k, demoted)]]
+
+
+class BatchContentScorerAgent(Microagent[ScoreBlock]):
+    """
+    Microagent for scoring a block of content items at once.
+
+    Atomic task: Given a candidate block and context, return a score block.
+    Reads the same context keys as ``ContentScorerAgent``, with
+    ``candidates`` (a ``CandidateBlock`` or a list of ``ContentItem``) in
+    place of ``content``.
+    """
+
+    deterministic = True
+
+    def __init__(self, llm_client: Any = None):
+        super().__init__(agent_id="content_block_scorer", temperature=0.1)
+        self.llm_client = llm_client
+
+    async def execute(self, context: dict[str, Any]) -> ScoreBlock:
+        """Score every candidate in the block."""
+        self.call_count += 1
+
+        candidates = context.get("candidates")
+        if candidates is None:
+            raise ValueError("No candidates provided for scoring")
+        block = candidates if isinstance(candidates, CandidateBlock) else CandidateBlock.from_items(candidates)
+        return score_block(
+            block,
+            preferences=context.get("preferences", UserPreferences()),
+            matched_genres=context.get("matched_genres", []),
+            duration_range=context.get("duration_range", (0, 999))
+        )
+
+    def validate_output(self, output: ScoreBlock) -> bool:
+        if not isinstance(output, ScoreBlock):
+            return False
+        if len(output) == 0:
+            return True
+        return bool(
+            output.scores.min() >= 0 and output.scores.max() <= 1 and
+            output.confidences.min() >= 0 and output.confidences.max() <= 1
+        )
+
+
+def score_block(
+    block: CandidateBlock,
+    preferences: Any,
+    matched_genres: Sequence[str],
+    duration_range: tuple[int, int]
+) -> ScoreBlock:
+    """
+    Score a candidate block exactly as ``ContentScorerAgent`` scores items.
+
+    Args:
+        block: Candidates to score
+        preferences: UserPreferences (platforms and watch history)
+        matched_genres: Genres from the genre matching step
+        duration_range: (min, max) minutes from the duration step
+
+    Returns:
+        Column-wise scores, factors and confidences
+    """
+    np = _numpy()
+    factors = {}
+
+    # Genre match score (0-1)
+    matching = np.bitwise_count(block.genre_bits & block.genre_mask(matched_genres)).sum(
+        axis=1, dtype=np.int64
+    )
+    factors["genre_match"] = np.minimum(1.0, matching / max(1, len(matched_genres)))
+
+    # Rating score (0-1)
+    factors["rating"] = block.ratings / 10.0
+
+    # Duration fit score (0-1), penalized by how far out of range
+    min_dur, max_dur = duration_range
+    durations = block.durations
+    with np.errstate(divide="ignore", invalid="ignore"):
+        factors["duration_fit"] = np.where(
+            durations < min_dur,
+            durations / min_dur,
+            np.where(durations > max_dur, max_dur / durations, 1.0)
+        )
+
+    # Recency boost for newer content
+    factors["recency"] = np.maximum(0.3, 1.0 - ((2025 - block.release_years) * 0.02))
+
+    # Platform availability
+    if hasattr(preferences, 'available_platforms'):
+        available = block.platform_mask(preferences.available_platforms)
+        factors["availability"] = np.where(available, 1.0, 0.3)
+    else:
+        factors["availability"] = np.full(len(block), 0.7)
+
+    # Watch history penalty (avoid rewatches)
+    if hasattr(preferences, 'watch_history'):
+        watched = np.isin(block.content_ids, list(preferences.watch_history))
+        factors["novelty"] = np.where(watched, 0.1, 1.0)
+    else:
+        factors["novelty"] = np.ones(len(block))
+
+    # Weighted sum in the per-item scorer's order, so rounding is identical
+    scores = np.zeros(len(block))
+    for name, column in factors.items():
+        scores = scores + column * ContentScorerAgent.WEIGHTS[name]
+    confidences = np.minimum.reduce(list(factors.values()))
+
+    return ScoreBlock(
+        content_ids=block.content_ids,
+        scores=scores,
+        confidences=confidences,
+        factors=factors
+    )
@@ -0,0 +1,112 @@
+"""
+Decided-Result Cache for MAKER
+
+Identical steps recur across requests: the same mood text, the same
+preferences, the same catalog item scored for the same mood. Voting on
+them again costs k or more agent calls for an answer that is already
+known. This cache sits in front of voting and replays decided results.
+
+Keys are the agent_id plus a stable fingerprint of the step context.
+Entries are evicted least-recently-used beyond ``max_entries`` and
+expire after ``ttl_seconds``.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from .core import VoteCanonicalizer, VoteStatus, VotingResult
+
+
+class DecidedResultCache:
+    """
+    LRU + TTL cache of decided voting results.
+
+    Only ``VoteStatus.DECIDED`` results are stored; timeouts and red-flagged
+    steps are always re-voted. Results are deep-copied on ``put`` and on
+    every ``get``, so mutating a returned winner never leaks into later
+    requests.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl_seconds: Optional[float] = 3600.0,
+        canonicalizer: Optional[VoteCanonicalizer] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            max_entries: Max cached results before LRU eviction
+            ttl_seconds: Lifetime of an entry (None = no expiry)
+            canonicalizer: Maps contexts to stable keys; equal canonical
+                contexts (e.g. floats equal to 6 places) share an entry
+            clock: Monotonic time source
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.canonicalizer = canonicalizer or VoteCanonicalizer()
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, str], tuple[float, VotingResult]] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def key(self, agent_id: str, context: dict[str, Any]) -> tuple[str, str]:
+        """Build the cache key for an agent and its step context."""
+        canonical = self.canonicalizer.key(context)
+        fingerprint = hashlib.sha256(repr(canonical).encode()).hexdigest()
+        return agent_id, fingerprint
+
+    def get(self, key: tuple[str, str]) -> Optional[VotingResult]:
+        """Return the cached result for ``key``, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        stored_at, result = entry
+        if self.ttl_seconds is not None and self._clock() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result.copy()
+
+    def put(self, key: tuple[str, str], result: VotingResult) -> None:
+        """Store a decided result, evicting the least recently used entry."""
+        if result.status != VoteStatus.DECIDED or self.max_entries <= 0:
+            return
+
+        self._entries[key] = (self._clock(), result.copy())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / max(1, lookups),
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
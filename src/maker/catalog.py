@@ -0,0 +1,447 @@
+"""
+Columnar Content Catalog for MAKER
+
+``DiscoveryRequest.candidates`` is a list of ``ContentItem`` objects, each
+with its own genre list, mood list and metadata dict, rebuilt for every
+request. ``ContentCatalog`` stores the catalog once, column by column:
+ids, titles, ratings, durations, years and type/platform codes as typed
+arrays, and genres and moods as bitsets.
+
+A catalog is saved as a directory of ``.npy`` files (one per column) plus
+a ``catalog.json`` manifest with the vocabularies. Loading memory-maps
+the columns, so opening even a million-item catalog is near zero-copy and
+only the pages a request touches are read. Requests reference catalog
+rows (a range, a slice or an index array, e.g. from ``select``) instead
+of shipping item objects.
+
+``CatalogIndex`` (``catalog.index``) keeps a posting-list bitmap per
+genre, mood, platform and content type, so ``select`` and ``prefilter``
+combine a few bitmaps instead of scanning every row.
+
+Requires numpy (``pip install numpy``); it is imported on first use.
+"""
+
+import json
+import os
+from typing import Any, Iterable, Optional, Sequence, Union
+
+from .batch_scoring import CandidateBlock, _numpy, split_bitsets
+from .entertainment_agents import ContentItem, ContentType, HardConstraints, MoodCategory
+
+# Selector of catalog rows: all (None), a range/slice, or an index array
+Rows = Union[None, range, slice, Sequence[int], Any]
+
+MANIFEST = "catalog.json"
+FORMAT_VERSION = 1
+
+
+class ContentCatalog:
+    """
+    Content catalog stored as typed column arrays.
+
+    ``description`` and ``metadata`` of items are not stored; materialized
+    items have them empty, and list genres and moods in vocabulary order.
+    """
+
+    COLUMNS = (
+        "content_ids",
+        "titles",
+        "content_type_codes",
+        "genre_bits",
+        "mood_bits",
+        "durations",
+        "release_years",
+        "ratings",
+        "platform_codes",
+    )
+
+    def __init__(
+        self,
+        columns: dict[str, Any],
+        genre_vocab: list[str],
+        platform_vocab: list[str]
+    ):
+        """
+        Initialize catalog from column arrays.
+
+        Args:
+            columns: Array for each name in ``COLUMNS``, all the same length
+            genre_vocab: Genre of each bit of ``genre_bits``
+            platform_vocab: Platform of each code in ``platform_codes``
+        """
+        for name in self.COLUMNS:
+            setattr(self, name, columns[name])
+        self.genre_vocab = genre_vocab
+        self.platform_vocab = platform_vocab
+        self.content_type_vocab = [content_type.value for content_type in ContentType]
+        self.mood_vocab = [mood.value for mood in MoodCategory]
+        self._rows_by_id: Optional[dict[str, int]] = None
+        self._index: Optional["CatalogIndex"] = None
+
+    def __len__(self) -> int:
+        return len(self.content_ids)
+
+    @classmethod
+    def from_items(cls, items: Sequence[ContentItem]) -> "ContentCatalog":
+        """Build a catalog from content items."""
+        np = _numpy()
+
+        genre_index: dict[str, int] = {}
+        platform_index: dict[str, int] = {}
+        content_type_index = {content_type: code for code, content_type in enumerate(ContentType)}
+        mood_index = {mood: bit for bit, mood in enumerate(MoodCategory)}
+
+        genre_rows, mood_rows, platform_codes = [], [], []
+        for item in items:
+            bits = 0
+            for genre in item.genres:
+                bits |= 1 << genre_index.setdefault(genre, len(genre_index))
+            genre_rows.append(bits)
+            bits = 0
+            for mood in item.mood_tags:
+                bits |= 1 << mood_index[mood]
+            mood_rows.append(bits)
+            platform_codes.append(platform_index.setdefault(item.platform, len(platform_index)))
+
+        columns = {
+            "content_ids": np.array([item.content_id for item in items], dtype=str),
+            "titles": np.array([item.title for item in items], dtype=str),
+            "content_type_codes": np.array(
+                [content_type_index[item.content_type] for item in items], dtype=np.int8
+            ),
+            "genre_bits": split_bitsets(genre_rows, len(genre_index)),
+            "mood_bits": split_bitsets(mood_rows, len(mood_index)),
+            "durations": np.array([item.duration_minutes for item in items], dtype=np.int32),
+            "release_years": np.array([item.release_year for item in items], dtype=np.int32),
+            "ratings": np.array([item.rating for item in items], dtype=np.float64),
+            "platform_codes": np.array(platform_codes, dtype=np.int32),
+        }
+        return cls(columns, list(genre_index), list(platform_index))
+
+    def save(self, directory: str) -> None:
+        """Write the catalog as one ``.npy`` file per column plus a manifest."""
+        np = _numpy()
+        os.makedirs(directory, exist_ok=True)
+        for name in self.COLUMNS:
+            np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(directory, MANIFEST), "w", encoding="utf-8") as f:
+            json.dump({
+                "format_version": FORMAT_VERSION,
+                "rows": len(self),
+                "genre_vocab": self.genre_vocab,
+                "platform_vocab": self.platform_vocab,
+                "content_type_vocab": self.content_type_vocab,
+                "mood_vocab": self.mood_vocab,
+            }, f)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "ContentCatalog":
+        """
+        Open a saved catalog.
+
+        Args:
+            directory: Directory written by ``save``
+            mmap: Memory-map the columns read-only instead of reading them
+
+        Returns:
+            The catalog
+        """
+        np = _numpy()
+        with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest["format_version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported catalog format: {manifest['format_version']}")
+        if (
+            manifest["content_type_vocab"] != [content_type.value for content_type in ContentType]
+            or manifest["mood_vocab"] != [mood.value for mood in MoodCategory]
+        ):
+            raise ValueError("Catalog was saved with different content types or moods")
+
+        columns = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r" if mmap else None)
+            for name in cls.COLUMNS
+        }
+        return cls(columns, manifest["genre_vocab"], manifest["platform_vocab"])
+
+    @property
+    def index(self) -> "CatalogIndex":
+        """Lookup indexes over the catalog (built on first use)."""
+        if self._index is None:
+            self._index = CatalogIndex(self)
+        return self._index
+
+    def prefilter(self, constraints: HardConstraints, rows: Rows = None) -> Any:
+        """
+        Rows (of ``rows``, default all) meeting every hard constraint.
+
+        Combines posting-list bitmaps (platforms, duration, disliked
+        genres) with word-wide bitmap operations instead of scanning items.
+
+        Returns:
+            Index array of viable rows, in catalog order
+        """
+        index = self.index
+        terms = []
+        if rows is not None:
+            terms.append(index.to_bitmap(self._row_indices(rows)))
+        if constraints.available_platforms is not None:
+            terms.append(index.union(
+                index.bitmap("platform", platform) for platform in constraints.available_platforms
+            ))
+        if constraints.max_duration_minutes is not None:
+            terms.append(index.duration_bitmap(constraints.max_duration_minutes))
+        if constraints.disliked_genres:
+            terms.append(index.complement(index.union(
+                index.bitmap("genre", genre) for genre in constraints.disliked_genres
+            )))
+        return index.rows(index.intersection(terms))
+
+    def row_of(self, content_id: str) -> int:
+        """Row index of a content id (index built on first use)."""
+        if self._rows_by_id is None:
+            self._rows_by_id = {
+                str(content_id): row for row, content_id in enumerate(self.content_ids)
+            }
+        return self._rows_by_id[content_id]
+
+    def item(self, row: int) -> ContentItem:
+        """Materialize one row as a ContentItem."""
+        return ContentItem(
+            content_id=str(self.content_ids[row]),
+            title=str(self.titles[row]),
+            content_type=ContentType(self.content_type_vocab[self.content_type_codes[row]]),
+            genres=self._decode_bits(self.genre_bits[row], self.genre_vocab),
+            duration_minutes=int(self.durations[row]),
+            release_year=int(self.release_years[row]),
+            rating=float(self.ratings[row]),
+            platform=self.platform_vocab[self.platform_codes[row]],
+            mood_tags=[MoodCategory(mood) for mood in self._decode_bits(self.mood_bits[row], self.mood_vocab)],
+        )
+
+    def items(self, rows: Rows = None) -> list[ContentItem]:
+        """Materialize the selected rows as ContentItems."""
+        return [self.item(row) for row in self._row_indices(rows)]
+
+    def block(self, rows: Rows = None) -> CandidateBlock:
+        """
+        Columnar candidate block of the selected rows, for batch scoring.
+
+        Ranges and slices are views of the (memory-mapped) columns; index
+        arrays copy only the selected rows.
+        """
+        rows = self._column_index(rows)
+        return CandidateBlock(
+            content_ids=self.content_ids[rows],
+            genre_vocab=self.genre_vocab,
+            genre_bits=self.genre_bits[rows],
+            ratings=self.ratings[rows],
+            durations=self.durations[rows],
+            release_years=self.release_years[rows],
+            platform_vocab=self.platform_vocab,
+            platform_codes=self.platform_codes[rows],
+        )
+
+    def select(
+        self,
+        content_types: Optional[Sequence[ContentType]] = None,
+        platforms: Optional[Sequence[str]] = None,
+        genres: Optional[Sequence[str]] = None,
+        moods: Optional[Sequence[MoodCategory]] = None,
+        max_duration: Optional[int] = None,
+        min_rating: Optional[float] = None
+    ) -> Any:
+        """
+        Rows matching every given filter, in catalog order.
+
+        Each filter matches items with any of its values (union of posting
+        lists); the filters are intersected. Answered from ``index``
+        bitmaps, e.g. "relaxed + netflix/hulu + <= 100 min" is three
+        unions and an intersection over n/64 words, not an item scan.
+
+        Returns:
+            Index array of matching rows
+        """
+        index = self.index
+        terms = []
+        if content_types is not None:
+            terms.append(index.union(
+                index.bitmap("content_type", content_type.value) for content_type in content_types
+            ))
+        if platforms is not None:
+            terms.append(index.union(index.bitmap("platform", platform) for platform in platforms))
+        if genres is not None:
+            terms.append(index.union(index.bitmap("genre", genre) for genre in genres))
+        if moods is not None:
+            terms.append(index.union(index.bitmap("mood", mood.value) for mood in moods))
+        if max_duration is not None:
+            terms.append(index.duration_bitmap(max_duration))
+        if min_rating is not None:
+            terms.append(index.rating_bitmap(min_rating))
+        return index.rows(index.intersection(terms))
+
+    def _column_index(self, rows: Rows) -> Any:
+        """Normalize a row selector into something columns can be indexed with."""
+        if rows is None:
+            return slice(None)
+        if isinstance(rows, range) and rows.step > 0:
+            return slice(rows.start, rows.stop, rows.step)
+        if isinstance(rows, slice):
+            return rows
+        return _numpy().asarray(rows)
+
+    def _row_indices(self, rows: Rows) -> Sequence[int]:
+        """Row numbers selected by a row selector."""
+        if rows is None:
+            return range(len(self))
+        if isinstance(rows, slice):
+            return range(*rows.indices(len(self)))
+        return [int(row) for row in rows]
+
+    @staticmethod
+    def _decode_bits(words: Any, vocab: Sequence[str]) -> list[str]:
+        """Values of the set bits of one bitset row, in vocabulary order."""
+        values = []
+        for bit, value in enumerate(vocab):
+            if int(words[bit // 64]) >> (bit % 64) & 1:
+                values.append(value)
+        return values
+
+
+class CatalogIndex:
+    """
+    Posting-list indexes over a ContentCatalog.
+
+    Each genre, mood, platform and content type has a posting list stored
+    as a row bitmap: ``ceil(rows / 64)`` uint64 words, bit ``r % 64`` of
+    word ``r // 64`` set when row ``r`` has the value. Bitmaps are built on
+    first use of a value and cached; unions and intersections are
+    word-wide numpy ``|`` and ``&``. Duration and rating ranges come from
+    sorted orders of those columns.
+    """
+
+    FIELDS = ("genre", "mood", "platform", "content_type")
+
+    def __init__(self, catalog: ContentCatalog):
+        """Build the sorted orders (O(n log n)); bitmaps are built lazily."""
+        np = _numpy()
+        self.catalog = catalog
+        self.num_rows = len(catalog)
+        self.num_words = -(-self.num_rows // 64)
+        self._bitmaps: dict[tuple[str, str], Any] = {}
+
+        self.duration_order = np.argsort(catalog.durations, kind="stable")
+        self.sorted_durations = catalog.durations[self.duration_order]
+        self.rating_order = np.argsort(catalog.ratings, kind="stable")
+        self.sorted_ratings = catalog.ratings[self.rating_order]
+
+    def bitmap(self, field: str, value: str) -> Any:
+        """
+        Posting list of one value as a row bitmap (treat as read-only).
+
+        Args:
+            field: "genre", "mood", "platform" or "content_type"
+            value: Genre name, mood value, platform or content type value
+
+        Returns:
+            Row bitmap (empty for unknown values)
+        """
+        key = (field, value)
+        bitmap = self._bitmaps.get(key)
+        if bitmap is None:
+            bitmap = self._bitmaps[key] = self._build_bitmap(field, value)
+        return bitmap
+
+    def _build_bitmap(self, field: str, value: str) -> Any:
+        np = _numpy()
+        catalog = self.catalog
+        if field == "genre" or field == "mood":
+            vocab, bits = (
+                (catalog.genre_vocab, catalog.genre_bits) if field == "genre"
+                else (catalog.mood_vocab, catalog.mood_bits)
+            )
+            if value not in vocab:
+                return self.empty()
+            bit = vocab.index(value)
+            mask = (bits[:, bit // 64] >> np.uint64(bit % 64)) & np.uint64(1) == 1
+        elif field == "platform":
+            if value not in catalog.platform_vocab:
+                return self.empty()
+            mask = catalog.platform_codes == catalog.platform_vocab.index(value)
+        elif field == "content_type":
+            if value not in catalog.content_type_vocab:
+                return self.empty()
+            mask = catalog.content_type_codes == catalog.content_type_vocab.index(value)
+        else:
+            raise ValueError(f"Unknown index field: {field}")
+        return self._pack(mask)
+
+    def duration_bitmap(self, max_duration: int) -> Any:
+        """Rows with duration <= ``max_duration``."""
+        np = _numpy()
+        end = np.searchsorted(self.sorted_durations, max_duration, side="right")
+        return self.to_bitmap(self.duration_order[:end])
+
+    def rating_bitmap(self, min_rating: float) -> Any:
+        """Rows with rating >= ``min_rating``."""
+        np = _numpy()
+        start = np.searchsorted(self.sorted_ratings, min_rating, side="left")
+        return self.to_bitmap(self.rating_order[start:])
+
+    def empty(self) -> Any:
+        """Bitmap of no rows."""
+        return _numpy().zeros(self.num_words, dtype="<u8")
+
+    def full(self) -> Any:
+        """Bitmap of every row."""
+        return self.complement(self.empty())
+
+    def to_bitmap(self, rows: Sequence[int]) -> Any:
+        """Bitmap of the given rows."""
+        np = _numpy()
+        rows = np.asarray(rows, dtype=np.int64)
+        bitmap = self.empty()
+        np.bitwise_or.at(
+            bitmap, rows // 64, np.left_shift(np.uint64(1), (rows % 64).astype(np.uint64))
+        )
+        return bitmap
+
+    def union(self, bitmaps: Iterable[Any]) -> Any:
+        """Rows in any of the bitmaps."""
+        result = self.empty()
+        for bitmap in bitmaps:
+            result |= bitmap
+        return result
+
+    def intersection(self, bitmaps: Iterable[Any]) -> Any:
+        """Rows in every bitmap (every row for none)."""
+        result = self.full()
+        for bitmap in bitmaps:
+            result &= bitmap
+        return result
+
+    def complement(self, bitmap: Any) -> Any:
+        """Rows not in the bitmap."""
+        np = _numpy()
+        result = ~bitmap
+        tail = self.num_rows % 64
+        if tail:
+            result[-1] &= np.uint64((1 << tail) - 1)  # No bits past the last row
+        return result
+
+    def rows(self, bitmap: Any) -> Any:
+        """Sorted rows of a bitmap; only non-empty words are decoded."""
+        np = _numpy()
+        words = np.flatnonzero(bitmap)
+        bits = np.unpackbits(
+            bitmap[words].astype("<u8").view(np.uint8), bitorder="little"
+        ).reshape(-1, 64)
+        word_index, bit = np.nonzero(bits)
+        return words[word_index] * 64 + bit
+
+    def _pack(self, mask: Any) -> Any:
+        """Bitmap of a boolean row mask."""
+        np = _numpy()
+        packed = np.packbits(mask, bitorder="little")
+        padded = np.zeros(self.num_words * 8, dtype=np.uint8)
+        padded[:len(packed)] = packed
+        return padded.view("<u8")
@@ -51,7 +51,16 @@ class VotingConfig:
     k: int = 3  # First-to-ahead-by-k threshold
     max_rounds: int = 100  # Maximum voting rounds before timeout
     parallel_votes: int = 5  # Votes to collect in parallel
-    timeout_ms: int = 30000  # Timeout per voting round
+    timeout_ms: int = 30000  # Timeout per vote (single agent call)
+    step_timeout_ms: Optional[int] = 120000  # Wall-clock budget per step
+    vote_retention: str = "full"  # "full", "sampled" or "counts_only"
+    deterministic_fast_path: bool = True  # Run deterministic agents once
+    strategy: str = "ahead_by_k"  # "ahead_by_k" or "sprt"
+    vote_accuracy: float = 0.9  # Assumed per-vote accuracy p
+    sprt_error_rate: float = 1e-3  # Target per-step error for SPRT (approximate)
+    sprt_wrong_answer_spread: float = 1.0  # Distinct wrong answers (m)
+    result_cache_size: int = 10_000  # Decided results cached across requests (0 = off)
+    result_cache_ttl_s: Optional[float] = 3600.0  # Cached result lifetime
 
 
 @dataclass
@@ -87,6 +96,15 @@ class MAKERConfig:
     red_flag: RedFlagConfig = field(default_factory=RedFlagConfig)
     benchmark: BenchmarkConfig = field(default_factory=BenchmarkConfig)
 
+    # Execution settings
+    max_concurrent_steps: int = 16  # Ready DAG steps run at once
+    decomposition_lookahead: Optional[int] = None  # Lazily pulled steps (None = eager)
+    batch_scoring: bool = False  # Score candidates as one numpy block step
+    prefilter_mode: Optional[str] = None  # Hard constraints: "drop", "downtier" or None (off)
+    journal_path: Optional[str] = None  # Step journal for resume (None = off)
+    journal_backend: str = "file"  # "file" or "sqlite"
+    journal_fsync_interval_s: float = 1.0  # Max delay before journal fsync
+
     # Entertainment-specific settings
     top_k_recommendations: int = 5
     max_candidates_per_query: int = 100
@@ -110,6 +128,22 @@ class MAKERConfig:
             config.voting.k = int(os.environ["MAKER_VOTING_K"])
         if os.environ.get("MAKER_MAX_ROUNDS"):
             config.voting.max_rounds = int(os.environ["MAKER_MAX_ROUNDS"])
+        if os.environ.get("MAKER_TIMEOUT_MS"):
+            config.voting.timeout_ms = int(os.environ["MAKER_TIMEOUT_MS"])
+        if os.environ.get("MAKER_STEP_TIMEOUT_MS"):
+            config.voting.step_timeout_ms = int(os.environ["MAKER_STEP_TIMEOUT_MS"])
+        if os.environ.get("MAKER_VOTING_STRATEGY"):
+            config.voting.strategy = os.environ["MAKER_VOTING_STRATEGY"]
+        if os.environ.get("MAKER_SPRT_ERROR_RATE"):
+            config.voting.sprt_error_rate = float(os.environ["MAKER_SPRT_ERROR_RATE"])
+
+        # Execution settings
+        if os.environ.get("MAKER_MAX_CONCURRENT_STEPS"):
+            config.max_concurrent_steps = int(os.environ["MAKER_MAX_CONCURRENT_STEPS"])
+        if os.environ.get("MAKER_JOURNAL_PATH"):
+            config.journal_path = os.environ["MAKER_JOURNAL_PATH"]
+        if os.environ.get("MAKER_JOURNAL_BACKEND"):
+            config.journal_backend = os.environ["MAKER_JOURNAL_BACKEND"]
 
         # Benchmark settings
         if os.environ.get("MAKER_COST_PER_VOTE"):
@@ -130,6 +164,16 @@ class MAKERConfig:
                 "k": self.voting.k,
                 "max_rounds": self.voting.max_rounds,
                 "parallel_votes": self.voting.parallel_votes,
+                "timeout_ms": self.voting.timeout_ms,
+                "step_timeout_ms": self.voting.step_timeout_ms,
+                "vote_retention": self.voting.vote_retention,
+                "deterministic_fast_path": self.voting.deterministic_fast_path,
+                "strategy": self.voting.strategy,
+                "vote_accuracy": self.voting.vote_accuracy,
+                "sprt_error_rate": self.voting.sprt_error_rate,
+                "sprt_wrong_answer_spread": self.voting.sprt_wrong_answer_spread,
+                "result_cache_size": self.voting.result_cache_size,
+                "result_cache_ttl_s": self.voting.result_cache_ttl_s,
             },
             "red_flag": {
                 "max_response_tokens": self.red_flag.max_response_tokens,
@@ -140,6 +184,15 @@ class MAKERConfig:
                 "cost_per_vote": self.benchmark.cost_per_vote,
                 "target_success_rate": self.benchmark.target_success_rate,
             },
+            "execution": {
+                "max_concurrent_steps": self.max_concurrent_steps,
+                "decomposition_lookahead": self.decomposition_lookahead,
+                "batch_scoring": self.batch_scoring,
+                "prefilter_mode": self.prefilter_mode,
+                "journal_path": self.journal_path,
+                "journal_backend": self.journal_backend,
+                "journal_fsync_interval_s": self.journal_fsync_interval_s,
+            },
             "recommendations": {
                 "top_k": self.top_k_recommendations,
                 "max_candidates": self.max_candidates_per_query,
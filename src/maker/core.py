@@ -11,14 +11,25 @@ This implementation adapts MAKER principles for entertainment discovery:
 """
 
 import asyncio
+import copy
+import math
+import random
+import sys
+import threading
 import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from array import array
+from dataclasses import asdict, dataclass, field, fields, is_dataclass
 from enum import Enum
-from typing import Any, Callable, Generic, TypeVar, Optional
-from collections import Counter
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Generic, Iterator, Sequence, TypeVar, Optional, Union
 import logging
 
+from .journal import StepJournal, StepRecord
+
+if TYPE_CHECKING:
+    from .cache import DecidedResultCache
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
@@ -32,20 +43,31 @@ class VoteStatus(Enum):
     TIMEOUT = "timeout"
 
 
-@dataclass
+class VoteRetention(Enum):
+    """How many individual Vote records a voting result keeps."""
+    FULL = "full"                 # Every valid vote
+    SAMPLED = "sampled"           # Uniform reservoir sample of valid votes
+    COUNTS_ONLY = "counts_only"   # No Vote records, only vote_counts
+
+
+@dataclass(slots=True)
 class Vote(Generic[T]):
-    """Represents a single vote from a microagent."""
+    """Represents a single vote from a microagent.
+
+    ``metadata`` and ``red_flags`` are only allocated when a vote has them;
+    retained votes are valid, so they share the empty defaults.
+    """
     value: T
     agent_id: str
     timestamp: float = field(default_factory=time.time)
     confidence: float = 1.0
-    metadata: dict = field(default_factory=dict)
-    red_flags: list[str] = field(default_factory=list)
+    metadata: Optional[dict] = None
+    red_flags: tuple[str, ...] = ()
 
     @property
     def is_valid(self) -> bool:
         """Check if vote has no red flags."""
-        return len(self.red_flags) == 0
+        return not self.red_flags
 
 
 @dataclass
@@ -59,6 +81,24 @@ class VotingResult(Generic[T]):
     winning_margin: int
     all_votes: list[Vote[T]]
     duration_ms: float
+    wasted_votes: int = 0  # Votes dispatched but not needed once decided
+    timed_out_votes: int = 0  # Vote calls dropped for exceeding their timeout
+
+    def copy(self) -> "VotingResult[T]":
+        """Deep copy, so the winner can be mutated without affecting this result."""
+        return copy.deepcopy(self)
+
+
+@dataclass(slots=True)
+class RedFlaggedResponse:
+    """
+    A response its agent already red-flagged, e.g. a stream aborted mid-generation.
+
+    ``RedFlagCriteria.check`` reports its flags as is, so voting discards it
+    like any other red-flagged vote.
+    """
+    partial: Any
+    red_flags: list[str]
 
 
 @dataclass
@@ -77,15 +117,30 @@ class RedFlagCriteria:
     def check(self, response: Any, metadata: dict = None) -> list[str]:
         """Check response against red-flag criteria.
 
+        String responses are measured with ``len`` directly; typed
+        responses (dataclasses, lists, dicts, enums) are walked field by
+        field, so length is the size of their text content and patterns
+        are matched per field instead of against a full repr. The walk stops
+        once the response is too long, so patterns are then only matched in
+        the text collected so far.
+
         Returns list of red flag reasons (empty if valid).
         """
+        if isinstance(response, RedFlaggedResponse):
+            return list(response.red_flags)
+
         flags = []
         metadata = metadata or {}
 
         # Check response length
-        response_str = str(response)
-        if len(response_str) > self.max_response_length:
-            flags.append(f"response_too_long:{len(response_str)}")
+        if isinstance(response, str):
+            texts = [response]
+            length = len(response)
+        else:
+            texts = []
+            length = _collect_text(response, texts, limit=self.max_response_length)
+        if length > self.max_response_length:
+            flags.append(f"response_too_long:{length}")
 
         # Check token count if available
         if 'token_count' in metadata:
@@ -98,9 +153,10 @@ class RedFlagCriteria:
                 if field_name not in response:
                     flags.append(f"missing_field:{field_name}")
 
-        # Check forbidden patterns
-        for pattern in self.forbidden_patterns:
-            if pattern.lower() in response_str.lower():
+        # Check forbidden patterns against the lowered text, built once
+        matcher = _compile_patterns(tuple(self.forbidden_patterns))
+        if matcher is not None:
+            for pattern in matcher.find(texts):
                 flags.append(f"forbidden_pattern:{pattern}")
 
         # Check confidence
@@ -111,6 +167,337 @@ class RedFlagCriteria:
         return flags
 
 
+class StreamingRedFlagMonitor:
+    """
+    Incremental red-flag checks for a response that is still streaming.
+
+    Feed chunks as they arrive; ``feed`` returns the red flags as soon as
+    the response exceeds the token or length limit or contains a forbidden
+    pattern, so the caller can stop generation instead of paying for the
+    rest. Token counts are estimated at ~4 characters per token unless the
+    caller supplies exact counts.
+    """
+
+    CHARS_PER_TOKEN = 4
+
+    def __init__(self, criteria: RedFlagCriteria):
+        self.criteria = criteria
+        self.text = ""
+        self.token_count = 0
+        self.flags: list[str] = []
+        self._matcher = _compile_patterns(tuple(criteria.forbidden_patterns))
+        self._overlap = max((len(p) for p in criteria.forbidden_patterns), default=1) - 1
+
+    @property
+    def tripped(self) -> bool:
+        return bool(self.flags)
+
+    def feed(self, chunk: str, tokens: Optional[int] = None) -> list[str]:
+        """
+        Add a chunk and return red flags (empty while the response is valid).
+
+        Args:
+            chunk: Newly streamed text
+            tokens: Exact token count of the chunk, if the provider reports it
+        """
+        if self.flags or not chunk:
+            return self.flags
+
+        scan_from = max(0, len(self.text) - self._overlap)
+        self.text += chunk
+        if tokens is None:
+            self.token_count = -(-len(self.text) // self.CHARS_PER_TOKEN)
+        else:
+            self.token_count += tokens
+
+        if self.token_count > self.criteria.max_response_tokens:
+            self.flags.append(f"too_many_tokens:{self.token_count}")
+        if len(self.text) > self.criteria.max_response_length:
+            self.flags.append(f"response_too_long:{len(self.text)}")
+        if self._matcher is not None:
+            # Only the new text plus enough overlap to catch split patterns
+            for pattern in self._matcher.find([self.text[scan_from:]]):
+                self.flags.append(f"forbidden_pattern:{pattern}")
+
+        return self.flags
+
+
+class _PatternMatcher:
+    """Case-insensitive multi-pattern matcher for red-flag criteria."""
+
+    __slots__ = ("patterns", "_needles")
+
+    def __init__(self, patterns: tuple[str, ...]):
+        self.patterns = patterns
+        self._needles = tuple(p.lower() for p in patterns)
+
+    def find(self, texts: list[str]) -> list[str]:
+        """Return the patterns occurring in any of ``texts``, in order."""
+        if not texts:
+            return []
+        # NUL never occurs in a pattern, so matches cannot span two fields
+        haystack = (texts[0] if len(texts) == 1 else "\0".join(texts)).lower()
+        return [
+            pattern for pattern, needle in zip(self.patterns, self._needles)
+            if needle in haystack
+        ]
+
+
+@lru_cache(maxsize=64)
+def _compile_patterns(patterns: tuple[str, ...]) -> Optional[_PatternMatcher]:
+    """Compile forbidden patterns once per distinct pattern list."""
+    return _PatternMatcher(patterns) if patterns else None
+
+
+_DATACLASS_FIELDS: dict[type, tuple[str, ...]] = {}
+
+
+class _LeaveContainer:
+    """Stack marker: the walk has finished the container with this id."""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: int):
+        self.key = key
+
+
+def _collect_text(value: Any, out: list[str], limit: Optional[int] = None) -> int:
+    """
+    Append the string content of a typed response to ``out``.
+
+    Returns the response's text length: strings count in full, scalars by
+    their printed width. Values defining ``__red_flag_text__()`` supply
+    their own (compact) text, and other types without a structural walk
+    fall back to ``str``. A container that contains itself is not re-entered, so
+    self-referencing responses terminate, and the walk stops as soon as
+    the length exceeds ``limit``.
+    """
+    length = 0
+    stack = [value]
+    open_containers: set[int] = set()
+    while stack:
+        if limit is not None and length > limit:
+            break
+        item = stack.pop()
+        item_type = type(item)
+        if item_type is str:
+            out.append(item)
+            length += len(item)
+            continue
+        if item is None or item_type is float or item_type is int or item_type is bool:
+            length += len(repr(item))
+            continue
+        if item_type is _LeaveContainer:
+            open_containers.discard(item.key)
+            continue
+        if id(item) in open_containers:
+            continue
+        red_flag_text = getattr(item, "__red_flag_text__", None)
+        if red_flag_text is not None:
+            stack.append(red_flag_text())
+            continue
+        if item_type is list or item_type is tuple or item_type is set or item_type is frozenset:
+            children = item
+        elif item_type is dict:
+            children = [*item.keys(), *item.values()]
+        else:
+            names = _DATACLASS_FIELDS.get(item_type)
+            if names is None and is_dataclass(item) and not isinstance(item, type):
+                names = tuple(f.name for f in fields(item))
+                _DATACLASS_FIELDS[item_type] = names
+            if names is not None:
+                children = [getattr(item, name) for name in names]
+            elif isinstance(item, Enum):
+                stack.append(item.value)
+                continue
+            else:
+                text = str(item)
+                out.append(text)
+                length += len(text)
+                continue
+        open_containers.add(id(item))
+        stack.append(_LeaveContainer(id(item)))
+        stack.extend(children)
+    return length
+
+
+_NO_CANDIDATE = object()
+
+
+class VoteTally(Generic[T]):
+    """
+    Running vote totals with incremental leader/runner-up tracking.
+
+    Counts only ever grow, so after each increment the new top two are
+    among the old leader, the old runner-up and the incremented key.
+    This keeps ``add`` and every winner check O(1) regardless of how many
+    distinct candidates have been seen. Shared by ``FirstToAheadByKVoting``
+    and ``UniversalVoting`` (which adds confidence-weighted votes).
+    """
+
+    __slots__ = ("counts", "total", "_leader", "_runner_up")
+
+    def __init__(self):
+        self.counts: dict[T, float] = {}
+        self.total: float = 0
+        self._leader: Any = _NO_CANDIDATE
+        self._runner_up: Any = _NO_CANDIDATE
+
+    @classmethod
+    def from_counts(cls, counts: dict[T, float]) -> "VoteTally[T]":
+        """Build a tally from existing counts."""
+        tally = cls()
+        for key, count in counts.items():
+            tally.add(key, count)
+        return tally
+
+    def add(self, key: T, weight: float = 1) -> None:
+        """Add a (non-negative) weighted vote for a candidate."""
+        count = self.counts.get(key, 0) + weight
+        self.counts[key] = count
+        self.total += weight
+
+        if self._leader is _NO_CANDIDATE:
+            self._leader = key
+        elif key == self._leader:
+            pass
+        elif count > self.counts[self._leader]:
+            self._runner_up = self._leader
+            self._leader = key
+        elif (
+            self._runner_up is _NO_CANDIDATE or
+            key == self._runner_up or
+            count > self.counts[self._runner_up]
+        ):
+            self._runner_up = key
+
+    @property
+    def leader(self) -> Optional[T]:
+        """Candidate with the most votes (None if no votes)."""
+        return None if self._leader is _NO_CANDIDATE else self._leader
+
+    @property
+    def leader_count(self) -> float:
+        """Votes for the leader."""
+        return 0 if self._leader is _NO_CANDIDATE else self.counts[self._leader]
+
+    @property
+    def runner_up_count(self) -> float:
+        """Votes for the runner-up (0 if only one candidate)."""
+        return 0 if self._runner_up is _NO_CANDIDATE else self.counts[self._runner_up]
+
+    @property
+    def margin(self) -> float:
+        """Lead of the leader over the runner-up."""
+        return self.leader_count - self.runner_up_count
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def __bool__(self) -> bool:
+        return bool(self.counts)
+
+
+class VoteCanonicalizer:
+    """
+    Maps vote values to hashable canonical keys.
+
+    Voting counts equivalent answers together even when they are
+    unhashable (lists, dicts, mutable dataclasses) or differ only in
+    incidental ways:
+    - floats are rounded to ``float_precision`` decimal places
+    - sets become sorted tuples; dicts become sorted item tuples
+    - lists/tuples keep their order (ranked lists are order-sensitive)
+    - dataclass instances become frozen ``(type, field values...)`` tuples
+    - values defining ``__vote_key__()`` supply their own key
+
+    Handlers for other types can be plugged in with ``register``.
+    Keys for hashable values are memoized up to ``cache_size`` entries.
+    """
+
+    def __init__(self, float_precision: int = 6, cache_size: int = 10_000):
+        """
+        Initialize canonicalizer.
+
+        Args:
+            float_precision: Decimal places kept when comparing floats
+            cache_size: Max memoized keys for hashable values
+        """
+        self.float_precision = float_precision
+        self.cache_size = cache_size
+        self._handlers: dict[type, Callable[[Any], Any]] = {}
+        self._cache: dict[tuple[type, Any], Any] = {}
+        self._dataclass_fields: dict[type, tuple[str, ...]] = {}
+
+    def register(self, value_type: type, handler: Callable[[Any], Any]) -> None:
+        """Register a custom key function for a value type."""
+        self._handlers[value_type] = handler
+        self._cache.clear()
+
+    def key(self, value: Any) -> Any:
+        """Return the canonical hashable key for a vote value."""
+        try:
+            cache_key = (type(value), value)
+            cached = self._cache.get(cache_key, _NO_CANDIDATE)
+        except TypeError:
+            return self._canonicalize(value)
+
+        if cached is _NO_CANDIDATE:
+            cached = self._canonicalize(value)
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            self._cache[cache_key] = cached
+        return cached
+
+    def _canonicalize(self, value: Any) -> Any:
+        handler = self._handlers.get(type(value))
+        if handler is not None:
+            return handler(value)
+
+        if value is None or isinstance(value, (str, bool, int, Enum)):
+            return value
+        if isinstance(value, float):
+            return round(value, self.float_precision) + 0.0  # Folds -0.0 into 0.0
+        if hasattr(value, "__vote_key__"):
+            return value.__vote_key__()
+        if isinstance(value, (list, tuple)):
+            return tuple(self._canonicalize(v) for v in value)
+        if isinstance(value, (set, frozenset)):
+            return tuple(sorted((self._canonicalize(v) for v in value), key=repr))
+        if isinstance(value, dict):
+            return tuple(sorted(
+                ((self._canonicalize(k), self._canonicalize(v)) for k, v in value.items()),
+                key=repr
+            ))
+        if is_dataclass(value) and not isinstance(value, type):
+            names = self._dataclass_fields.get(type(value))
+            if names is None:
+                names = tuple(f.name for f in fields(value))
+                self._dataclass_fields[type(value)] = names
+            return (type(value).__qualname__,) + tuple(
+                self._canonicalize(getattr(value, name)) for name in names
+            )
+
+        try:
+            hash(value)
+        except TypeError:
+            return (type(value).__qualname__, repr(value))
+        return value
+
+
+@dataclass
+class _VotingState(Generic[T]):
+    """Mutable bookkeeping for one run of a voting engine."""
+    start_time: float = field(default_factory=time.time)
+    votes: list[Vote[T]] = field(default_factory=list)  # Retained votes only
+    counted: int = 0
+    tally: VoteTally = field(default_factory=VoteTally)
+    representatives: dict = field(default_factory=dict)  # Canonical key -> first value
+    rounds: int = 0
+    dispatched: int = 0
+    timed_out_votes: int = 0
+
+
 class FirstToAheadByKVoting(Generic[T]):
     """
     First-to-ahead-by-k voting algorithm from MAKER.
@@ -129,7 +516,14 @@ class FirstToAheadByKVoting(Generic[T]):
         k: int = 3,
         max_rounds: int = 100,
         red_flag_criteria: Optional[RedFlagCriteria] = None,
-        parallel_votes: int = 5
+        parallel_votes: int = 5,
+        adaptive_batching: bool = True,
+        vote_accuracy: float = 0.9,
+        vote_timeout_ms: Optional[float] = None,
+        step_timeout_ms: Optional[float] = None,
+        canonicalizer: Optional[VoteCanonicalizer] = None,
+        retention: VoteRetention = VoteRetention.FULL,
+        vote_sample_size: int = 5
     ):
         """
         Initialize voting system.
@@ -139,11 +533,30 @@ class FirstToAheadByKVoting(Generic[T]):
             max_rounds: Maximum voting rounds before timeout
             red_flag_criteria: Criteria for filtering bad responses
             parallel_votes: Number of votes to collect in parallel
+                (upper bound on batch size when adaptive_batching is on)
+            adaptive_batching: Size each batch from the current vote margin
+            vote_accuracy: Prior estimate of per-vote accuracy (p), refined
+                by observed agreement while voting
+            vote_timeout_ms: Timeout for a single vote call (None = no limit)
+            step_timeout_ms: Wall-clock budget for the whole voting run
+                (None = no limit)
+            canonicalizer: Maps vote values to hashable keys so equivalent
+                answers are counted together
+            retention: Which Vote records to keep in ``all_votes``
+            vote_sample_size: Votes kept per step with ``SAMPLED`` retention
         """
         self.k = k
         self.max_rounds = max_rounds
         self.red_flag_criteria = red_flag_criteria or RedFlagCriteria()
         self.parallel_votes = parallel_votes
+        self.adaptive_batching = adaptive_batching
+        self.vote_accuracy = vote_accuracy
+        self.vote_timeout_ms = vote_timeout_ms
+        self.step_timeout_ms = step_timeout_ms
+        self.canonicalizer = canonicalizer or VoteCanonicalizer()
+        self.retention = retention
+        self.vote_sample_size = vote_sample_size
+        self._rng = random.Random()
 
     async def run_voting(
         self,
@@ -153,6 +566,12 @@ class FirstToAheadByKVoting(Generic[T]):
         """
         Run first-to-ahead-by-k voting until a winner is decided.
 
+        Async vote functions are dispatched speculatively in batches of
+        ``parallel_votes``; synchronous ones (or ``parallel_votes=1``) are
+        called one at a time. Votes that exceed ``vote_timeout_ms`` are
+        dropped, and if ``step_timeout_ms`` runs out the best-so-far
+        plurality is returned with ``VoteStatus.TIMEOUT``.
+
         Args:
             vote_fn: Async function that returns a vote value
             agent_id_fn: Function that returns the voting agent's ID
@@ -160,99 +579,408 @@ class FirstToAheadByKVoting(Generic[T]):
         Returns:
             VotingResult with the winning value and statistics
         """
-        start_time = time.time()
-        votes: list[Vote[T]] = []
-        vote_counts: Counter[T] = Counter()
-        rounds = 0
+        if self.parallel_votes > 1 and asyncio.iscoroutinefunction(vote_fn):
+            return await self._run_parallel_voting(vote_fn, agent_id_fn)
+
+        state: _VotingState[T] = _VotingState()
+        deadline = self._step_deadline(state.start_time)
 
-        while rounds < self.max_rounds:
-            rounds += 1
+        while state.rounds < self.max_rounds:
+            if deadline is not None and time.time() >= deadline:
+                return self._undecided_result(state, deadline_exceeded=True)
+
+            state.rounds += 1
+            state.dispatched += 1
 
-            # Collect votes in parallel batches
             if asyncio.iscoroutinefunction(vote_fn):
-                vote_value = await vote_fn()
+                try:
+                    vote_value = await asyncio.wait_for(
+                        vote_fn(), self._vote_timeout(deadline)
+                    )
+                except asyncio.TimeoutError:
+                    state.timed_out_votes += 1
+                    logger.debug("Vote timed out")
+                    continue
             else:
                 vote_value = vote_fn()
 
-            # Check for red flags
-            red_flags = self.red_flag_criteria.check(vote_value)
+            if self._count_vote(vote_value, agent_id_fn, state):
+                # Check if we have a winner
+                winner, margin = self._check_winner(state.tally)
+                if winner is not None:
+                    return self._decided_result(winner, margin, state)
 
-            vote = Vote(
-                value=vote_value,
-                agent_id=agent_id_fn(),
-                red_flags=red_flags
-            )
+        return self._undecided_result(state)
 
-            # Only count valid votes
-            if vote.is_valid:
-                votes.append(vote)
-                vote_counts[vote_value] += 1
+    async def run_single(
+        self,
+        vote_fn: Callable[[], T],
+        agent_id_fn: Callable[[], str] = lambda: "agent"
+    ) -> VotingResult[T]:
+        """
+        Take a single vote and record it as decided.
 
-                # Check if we have a winner
-                winner, margin = self._check_winner(vote_counts)
-                if winner is not None:
-                    duration_ms = (time.time() - start_time) * 1000
-                    return VotingResult(
-                        winner=winner,
-                        status=VoteStatus.DECIDED,
-                        vote_counts=dict(vote_counts),
-                        total_votes=len(votes),
-                        rounds_taken=rounds,
-                        winning_margin=margin,
-                        all_votes=votes,
-                        duration_ms=duration_ms
+        Fast path for deterministic agents: repeated votes would all be
+        identical, so k agreeing votes add cost but no reliability. The vote
+        is still red-flagged and bound by the vote/step timeouts.
+
+        Args:
+            vote_fn: Function that returns the (only) vote value
+            agent_id_fn: Function that returns the voting agent's ID
+
+        Returns:
+            VotingResult with ``DECIDED`` status unless the vote was
+            red-flagged or timed out
+        """
+        state: _VotingState[T] = _VotingState()
+        deadline = self._step_deadline(state.start_time)
+        state.rounds = state.dispatched = 1
+
+        if asyncio.iscoroutinefunction(vote_fn):
+            try:
+                vote_value = await asyncio.wait_for(
+                    vote_fn(), self._vote_timeout(deadline)
+                )
+            except asyncio.TimeoutError:
+                state.timed_out_votes += 1
+                return self._undecided_result(state, deadline_exceeded=True)
+        else:
+            vote_value = vote_fn()
+
+        if not self._count_vote(vote_value, agent_id_fn, state):
+            return self._undecided_result(state)
+
+        return self._decided_result(state.tally.leader, 1, state)
+
+    async def _run_parallel_voting(
+        self,
+        vote_fn: Callable[[], T],
+        agent_id_fn: Callable[[], str]
+    ) -> VotingResult[T]:
+        """
+        Speculative parallel voting.
+
+        Dispatches batches of votes concurrently and counts them in the
+        order they finish. As soon as a candidate is ahead by k, any votes
+        still in flight are cancelled, so a decided step costs roughly one
+        LLM round trip instead of k sequential ones.
+        """
+        state: _VotingState[T] = _VotingState()
+        deadline = self._step_deadline(state.start_time)
+        vote_timeout = self._vote_timeout(None)
+
+        while state.dispatched < self.max_rounds:
+            batch_size = self._next_batch_size(
+                state.tally, self.max_rounds - state.dispatched
+            )
+            pending = {
+                asyncio.ensure_future(asyncio.wait_for(vote_fn(), vote_timeout))
+                for _ in range(batch_size)
+            }
+            state.dispatched += batch_size
+            finished: list[asyncio.Future] = []
+
+            try:
+                while pending:
+                    wait_timeout = None
+                    if deadline is not None:
+                        wait_timeout = max(0.0, deadline - time.time())
+
+                    done, pending = await asyncio.wait(
+                        pending,
+                        timeout=wait_timeout,
+                        return_when=asyncio.FIRST_COMPLETED
                     )
-            else:
-                logger.debug(f"Vote red-flagged: {red_flags}")
+                    if not done:
+                        # Step budget exhausted with votes still in flight
+                        return self._undecided_result(state, deadline_exceeded=True)
+
+                    finished = list(done)
+
+                    while finished:
+                        task = finished.pop(0)
+                        state.rounds += 1
+
+                        try:
+                            vote_value = task.result()
+                        except asyncio.TimeoutError:
+                            state.timed_out_votes += 1
+                            logger.debug("Vote timed out")
+                            continue
+
+                        if not self._count_vote(vote_value, agent_id_fn, state):
+                            continue
+
+                        winner, margin = self._check_winner(state.tally)
+                        if winner is not None:
+                            return self._decided_result(winner, margin, state)
+            finally:
+                await self._cancel_votes(pending, finished)
+
+            if deadline is not None and time.time() >= deadline:
+                return self._undecided_result(state, deadline_exceeded=True)
+
+        return self._undecided_result(state)
+
+    def _step_deadline(self, start_time: float) -> Optional[float]:
+        """Absolute wall-clock deadline for a voting run, if any."""
+        if self.step_timeout_ms is None:
+            return None
+        return start_time + self.step_timeout_ms / 1000
+
+    def _vote_timeout(self, deadline: Optional[float]) -> Optional[float]:
+        """Seconds a single vote may take, bounded by the step deadline."""
+        timeout = None
+        if self.vote_timeout_ms is not None:
+            timeout = self.vote_timeout_ms / 1000
+        if deadline is not None:
+            remaining = max(0.0, deadline - time.time())
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        return timeout
+
+    def _next_batch_size(self, tally: VoteTally[T], remaining: int) -> int:
+        """
+        Choose how many votes to dispatch in the next batch.
+
+        The leader needs ``k - gap`` more net votes to win. Each vote moves
+        the gap by +1 with probability p and roughly -1 otherwise, so about
+        ``(k - gap) / (2p - 1)`` votes are expected. A split vote (p <= 0.5)
+        gets the full ``parallel_votes`` batch.
+        """
+        if not self.adaptive_batching:
+            return min(self.parallel_votes, remaining)
+
+        needed = max(1, self.k - tally.margin)
+
+        # Blend prior accuracy with observed leader agreement (2 pseudo-votes)
+        p = (tally.leader_count + 2 * self.vote_accuracy) / (tally.total + 2)
+
+        if p <= 0.5:
+            batch_size = self.parallel_votes
+        else:
+            batch_size = max(needed, round(needed / (2 * p - 1)))
+
+        return max(1, min(batch_size, self.parallel_votes, remaining))
+
+    @staticmethod
+    async def _cancel_votes(
+        pending: set[asyncio.Future],
+        finished: list[asyncio.Future]
+    ) -> None:
+        """Cancel in-flight votes and discard results nobody will count."""
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        # Retrieve exceptions of completed-but-uncounted votes so they are
+        # not reported as "never retrieved"
+        for task in finished:
+            if not task.cancelled():
+                task.exception()
+
+    def _count_vote(
+        self,
+        vote_value: T,
+        agent_id_fn: Callable[[], str],
+        state: _VotingState[T]
+    ) -> bool:
+        """
+        Red-flag check a vote and count it if valid.
+
+        Returns True if the vote was counted.
+        """
+        red_flags = self.red_flag_criteria.check(vote_value)
+
+        # Only count valid votes
+        if red_flags:
+            logger.debug(f"Vote red-flagged: {red_flags}")
+            return False
+
+        key = self.canonicalizer.key(vote_value)
+        state.representatives.setdefault(key, vote_value)
+        state.tally.add(key)
+        state.counted += 1
+        self._retain_vote(vote_value, agent_id_fn, state)
+        return True
+
+    def _retain_vote(
+        self,
+        vote_value: T,
+        agent_id_fn: Callable[[], str],
+        state: _VotingState[T]
+    ) -> None:
+        """Keep a Vote record according to the retention policy."""
+        if self.retention == VoteRetention.COUNTS_ONLY:
+            return
+
+        if self.retention == VoteRetention.SAMPLED:
+            # Reservoir sampling: each counted vote is kept with equal probability
+            if len(state.votes) >= self.vote_sample_size:
+                slot = self._rng.randrange(state.counted)
+                if slot < self.vote_sample_size:
+                    state.votes[slot] = Vote(value=vote_value, agent_id=agent_id_fn())
+                return
+
+        state.votes.append(Vote(value=vote_value, agent_id=agent_id_fn()))
+
+    def _decided_result(
+        self,
+        winner_key: Any,
+        margin: int,
+        state: _VotingState[T]
+    ) -> VotingResult[T]:
+        """
+        Build the result for a decided vote.
 
+        ``vote_counts`` is keyed by canonical vote key; the winner is the
+        first vote value seen for the winning key.
+        """
+        duration_ms = (time.time() - state.start_time) * 1000
+        return VotingResult(
+            winner=state.representatives[winner_key],
+            status=VoteStatus.DECIDED,
+            vote_counts=dict(state.tally.counts),
+            total_votes=state.counted,
+            rounds_taken=state.rounds,
+            winning_margin=margin,
+            all_votes=state.votes,
+            duration_ms=duration_ms,
+            wasted_votes=state.dispatched - state.rounds,
+            timed_out_votes=state.timed_out_votes
+        )
+
+    def _undecided_result(
+        self,
+        state: _VotingState[T],
+        deadline_exceeded: bool = False
+    ) -> VotingResult[T]:
+        """
+        Build the result when voting ends without a k-margin winner.
+
+        Returns the best-so-far plurality with ``VoteStatus.TIMEOUT``; if no
+        valid vote was counted the status is ``RED_FLAGGED`` unless the step
+        deadline was what stopped voting.
+        """
         # Timeout - return most common if any votes
-        duration_ms = (time.time() - start_time) * 1000
-        if vote_counts:
-            winner = vote_counts.most_common(1)[0][0]
-            return VotingResult(
-                winner=winner,
-                status=VoteStatus.TIMEOUT,
-                vote_counts=dict(vote_counts),
-                total_votes=len(votes),
-                rounds_taken=rounds,
-                winning_margin=0,
-                all_votes=votes,
-                duration_ms=duration_ms
-            )
+        duration_ms = (time.time() - state.start_time) * 1000
+        if state.tally:
+            winner = state.representatives[state.tally.leader]
+            status = VoteStatus.TIMEOUT
+        else:
+            winner = None
+            status = VoteStatus.TIMEOUT if deadline_exceeded else VoteStatus.RED_FLAGGED
 
         return VotingResult(
-            winner=None,
-            status=VoteStatus.RED_FLAGGED,
-            vote_counts={},
-            total_votes=0,
-            rounds_taken=rounds,
+            winner=winner,
+            status=status,
+            vote_counts=dict(state.tally.counts),
+            total_votes=state.counted,
+            rounds_taken=state.rounds,
             winning_margin=0,
-            all_votes=votes,
-            duration_ms=duration_ms
+            all_votes=state.votes,
+            duration_ms=duration_ms,
+            timed_out_votes=state.timed_out_votes
         )
 
-    def _check_winner(self, vote_counts: Counter[T]) -> tuple[Optional[T], int]:
+    def _check_winner(self, tally: VoteTally) -> tuple[Optional[Any], int]:
         """
-        Check if any candidate is ahead by k votes.
+        Check if any candidate (canonical key) is ahead by k votes.
 
+        With a single candidate the margin is its own vote count.
         Returns (winner, margin) or (None, 0) if no winner yet.
         """
-        if not vote_counts:
-            return None, 0
+        if tally and tally.margin >= self.k:
+            return tally.leader, tally.margin
 
-        most_common = vote_counts.most_common(2)
-        leader, leader_count = most_common[0]
+        return None, 0
 
-        if len(most_common) == 1:
-            # Only one candidate
-            if leader_count >= self.k:
-                return leader, leader_count
-        else:
-            # Multiple candidates - check margin
-            _, second_count = most_common[1]
-            margin = leader_count - second_count
-            if margin >= self.k:
-                return leader, margin
+
+class SequentialVoting(FirstToAheadByKVoting[T]):
+    """
+    Sequential probability ratio test (SPRT) voting.
+
+    Drop-in alternative to first-to-ahead-by-k with the same ``run_voting``
+    contract. Each vote is treated as evidence for "the leader is correct"
+    against "the runner-up is correct". With per-vote accuracy p and wrong
+    answers scattered over m distinct alternatives, a vote for any one
+    wrong answer has probability (1-p)/m, so
+
+        LLR = (n_leader - n_runner_up) * ln(p * m / (1 - p))
+
+    Voting stops as soon as LLR >= ln((1 - α) / α), where α is the per-step
+    error bound. With m = 1 (every error agrees) this reduces exactly to
+    first-to-ahead-by-k; when errors scatter, each agreeing vote carries
+    more evidence, so α is met with a smaller margin than a k sized for
+    agreeing errors. The stopping rule is still a vote margin, so this is
+    ahead-by-k with k chosen from p and m: calibrated to the same
+    empirical error, both need the same votes. Wald's threshold is an
+    approximation, so the realized error can slightly exceed α (see
+    ``benchmark_sequential_voting``).
+    """
+
+    def __init__(
+        self,
+        error_rate: float = 1e-3,
+        vote_accuracy: float = 0.9,
+        wrong_answer_spread: float = 1.0,
+        **kwargs
+    ):
+        """
+        Initialize SPRT voting.
+
+        Args:
+            error_rate: Per-step error bound α
+            vote_accuracy: Assumed per-vote accuracy p (must exceed the
+                chance of any single wrong answer)
+            wrong_answer_spread: Effective number of distinct wrong answers m
+            **kwargs: Passed to FirstToAheadByKVoting (max_rounds,
+                red_flag_criteria, parallel_votes, timeouts, ...)
+        """
+        if not 0 < error_rate < 0.5:
+            raise ValueError("error_rate must be in (0, 0.5)")
+
+        evidence_ratio = vote_accuracy * wrong_answer_spread / (1 - vote_accuracy)
+        if evidence_ratio <= 1:
+            raise ValueError(
+                "vote_accuracy too low: a vote must favour the correct answer "
+                "over any single wrong answer"
+            )
+
+        self.error_rate = error_rate
+        self.wrong_answer_spread = wrong_answer_spread
+        self.llr_threshold = math.log((1 - error_rate) / error_rate)
+        self.llr_per_vote = math.log(evidence_ratio)
+
+        # Equivalent vote margin, used for adaptive batch sizing
+        kwargs.pop("k", None)
+        k = max(1, math.ceil(self.llr_threshold / self.llr_per_vote - 1e-9))
+        super().__init__(k=k, vote_accuracy=vote_accuracy, **kwargs)
+
+    @classmethod
+    def for_target(
+        cls,
+        target_success_rate: float,
+        total_steps: int,
+        **kwargs
+    ) -> "SequentialVoting":
+        """
+        Build an engine whose per-step error bound meets a full-task target.
+
+        Uses α = 1 - t^(1/s) so that s independent steps succeed with
+        probability at least t.
+        """
+        error_rate = 1 - math.pow(target_success_rate, 1 / max(1, total_steps))
+        return cls(error_rate=error_rate, **kwargs)
+
+    def log_likelihood_ratio(self, tally: VoteTally) -> float:
+        """Evidence that the leader, not the runner-up, is correct."""
+        return tally.margin * self.llr_per_vote
+
+    def _check_winner(self, tally: VoteTally) -> tuple[Optional[Any], int]:
+        """Stop once the likelihood ratio crosses the error bound."""
+        if tally and self.log_likelihood_ratio(tally) >= self.llr_threshold:
+            return tally.leader, tally.margin
 
         return None, 0
 
@@ -267,8 +995,17 @@ class Microagent(ABC, Generic[T]):
     - Independent development: agents can be updated/tested in isolation
     - Scalability: agents can be scaled independently
     - Fault tolerance: designed to tolerate individual failures
+
+    Agents whose output is a pure function of their context should set
+    ``deterministic = True`` so the orchestrator runs them once instead
+    of voting on identical answers. Agents that combine many dependency
+    results can set ``incremental = True`` and take each result through
+    ``fold_result`` as soon as its step finishes.
     """
 
+    deterministic: bool = False
+    incremental: bool = False
+
     def __init__(
         self,
         agent_id: str,
@@ -307,6 +1044,18 @@ class Microagent(ABC, Generic[T]):
         """Validate the output format and content."""
         pass
 
+    def fold_result(self, step: "Step", state: Any, dependency: "Step") -> Any:
+        """
+        Fold a finished dependency's result into ``step``'s running state.
+
+        Only called for ``incremental`` agents, once per dependency with a
+        result, in completion order, before ``step`` runs. ``state`` is
+        None for the first one; the returned state is passed to
+        ``execute`` as ``context["folded"]`` instead of the dependency
+        results, which can then be released as soon as they are folded.
+        """
+        raise NotImplementedError
+
     def get_stats(self) -> dict:
         """Get agent statistics."""
         return {
@@ -317,15 +1066,118 @@ class Microagent(ABC, Generic[T]):
         }
 
 
-@dataclass
+class StepDescription:
+    """
+    Step description rendered on demand from an interned template.
+
+    Large decompositions share a handful of templates
+    (``"Score content: {}"``); storing the template once plus its
+    arguments avoids building millions of description strings that are
+    only read when logging or debugging.
+    """
+
+    __slots__ = ("template", "_args")
+
+    def __init__(self, template: str, *args: Any):
+        self.template = sys.intern(template)
+        # A lone argument is stored bare, saving a tuple per step
+        if len(args) == 1 and not isinstance(args[0], tuple):
+            self._args = args[0]
+        else:
+            self._args = args
+
+    @property
+    def args(self) -> tuple:
+        return self._args if isinstance(self._args, tuple) else (self._args,)
+
+    def __str__(self) -> str:
+        return self.template.format(*self.args)
+
+    def __repr__(self) -> str:
+        return repr(str(self))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (str, StepDescription)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+
+def compact_dependencies(step_ids: Sequence[int]) -> Sequence[int]:
+    """
+    Store dependency ids compactly.
+
+    Contiguous ascending ids become a ``range`` (constant size), short
+    lists a tuple, and anything else a 64-bit ``array``.
+    """
+    if isinstance(step_ids, (range, array)):
+        return step_ids
+    count = len(step_ids)
+    if count > 1 and step_ids[-1] - step_ids[0] == count - 1 and all(
+        b - a == 1 for a, b in zip(step_ids, step_ids[1:])
+    ):
+        return range(step_ids[0], step_ids[-1] + 1)
+    if count <= 8:
+        return tuple(step_ids)
+    return array("q", step_ids)
+
+
+@dataclass(slots=True)
 class Step:
-    """Represents a single step in a decomposed task."""
+    """Represents a single step in a decomposed task.
+
+    Slotted to keep million-step DAGs small. ``description`` may be a
+    ``StepDescription`` rendered on demand, and ``dependencies`` any int
+    sequence: a tuple, a ``range`` for contiguous id blocks, or an
+    ``array`` (see ``compact_dependencies``).
+    """
     step_id: int
-    description: str
+    description: Union[str, StepDescription]
     context: dict[str, Any]
-    dependencies: list[int] = field(default_factory=list)
+    dependencies: Sequence[int] = ()
     result: Any = None
     status: str = "pending"
+    votes: int = 0  # Votes this execution spent deciding the step
+
+
+@dataclass
+class ExecutionStats:
+    """Counters for one task execution, or an aggregate over many."""
+    total_steps: int = 0
+    successful_steps: int = 0
+    failed_steps: int = 0
+    total_votes: int = 0
+    red_flagged_votes: int = 0
+    wasted_votes: int = 0
+    timed_out_votes: int = 0
+    deterministic_steps: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    resumed_steps: int = 0  # Restored from the journal instead of re-run
+    coalesced_steps: int = 0  # Joined an identical step voting elsewhere
+    released_results: int = 0  # Freed once every dependent had consumed them
+    total_rounds: int = 0
+
+    @property
+    def avg_rounds_per_step(self) -> float:
+        return self.total_rounds / self.total_steps if self.total_steps else 0.0
+
+    def merge(self, other: "ExecutionStats") -> None:
+        """Add another execution's counters into this one."""
+        for name, value in asdict(other).items():
+            setattr(self, name, getattr(self, name) + value)
+
+    def to_dict(self) -> dict[str, Any]:
+        stats = asdict(self)
+        stats["avg_rounds_per_step"] = self.avg_rounds_per_step
+        return stats
+
+    @classmethod
+    def from_dict(cls, stats: dict[str, Any]) -> "ExecutionStats":
+        """Rebuild counters from ``to_dict`` output (derived keys are ignored)."""
+        return cls(**{f.name: stats[f.name] for f in fields(cls)})
 
 
 class TaskDecomposer(ABC):
@@ -349,6 +1201,23 @@ class TaskDecomposer(ABC):
         """
         pass
 
+    def iter_steps(self, task: dict[str, Any]) -> Iterator[Step]:
+        """
+        Yield the task's atomic steps lazily.
+
+        Steps must be yielded in dependency order (each step after all of
+        its dependencies), so the orchestrator can run them with bounded
+        lookahead. Override this to generate steps on demand; the default
+        yields from ``decompose``.
+
+        Args:
+            task: The complex task to decompose
+
+        Yields:
+            Atomic steps in dependency order
+        """
+        yield from self.decompose(task)
+
     @abstractmethod
     def compose_result(self, steps: list[Step]) -> Any:
         """
@@ -362,6 +1231,58 @@ class TaskDecomposer(ABC):
         """
         pass
 
+    def retain_result(self, step: Step) -> bool:
+        """
+        Whether ``compose_result`` needs this step's result.
+
+        Results that are not retained are released (``step.result`` set to
+        None) once every dependent step has consumed them, so long tasks do
+        not hold every intermediate result until the end. With lazy
+        decomposition released steps are dropped entirely, and are missing
+        from the steps passed to ``compose_result``. The default retains
+        everything.
+        """
+        return True
+
+    def result_consumers(self, task: dict[str, Any], step: Step) -> Optional[int]:
+        """
+        Number of steps of ``task`` that depend on this step, if known up front.
+
+        Only used with lazy decomposition, where dependents may not have
+        been pulled yet when the step finishes; a non-retained step whose
+        consumer count is unknown (None) is kept. Eagerly decomposed tasks
+        count dependents directly.
+        """
+        return None
+
+    def compose_partial(self, partial: Any, step: Step) -> Any:
+        """
+        Fold one finished step into a partial result while a task streams.
+
+        Called by ``MAKEROrchestrator.stream_task`` as each step finishes,
+        in completion order. Override to expose usable results (e.g. the
+        detected mood) before the whole task is done; the default keeps
+        no partial result.
+
+        Args:
+            partial: Value returned for the previous step (None at first)
+            step: Step that just finished
+
+        Returns:
+            Updated partial result
+        """
+        return partial
+
+
+@dataclass
+class StepEvent:
+    """A step completion (or the final result) streamed from a task."""
+    step: Optional[Step]  # None on the final event
+    partial: Any = None  # decomposer.compose_partial state after this step
+    completed_steps: int = 0
+    final: bool = False
+    result: Optional[dict[str, Any]] = None  # execute_task result, final event only
+
 
 class MAKEROrchestrator:
     """
@@ -379,7 +1300,17 @@ class MAKEROrchestrator:
         decomposer: TaskDecomposer,
         voting_k: int = 3,
         max_voting_rounds: int = 100,
-        red_flag_criteria: Optional[RedFlagCriteria] = None
+        red_flag_criteria: Optional[RedFlagCriteria] = None,
+        parallel_votes: int = 5,
+        vote_timeout_ms: Optional[float] = None,
+        step_timeout_ms: Optional[float] = None,
+        vote_retention: VoteRetention = VoteRetention.FULL,
+        deterministic_fast_path: bool = True,
+        voting: Optional[FirstToAheadByKVoting] = None,
+        result_cache: Optional["DecidedResultCache"] = None,
+        max_concurrent_steps: int = 16,
+        journal: Optional[StepJournal] = None,
+        decomposition_lookahead: Optional[int] = None
     ):
         """
         Initialize MAKER orchestrator.
@@ -389,90 +1320,403 @@ class MAKEROrchestrator:
             voting_k: K threshold for voting (default 3)
             max_voting_rounds: Max rounds per step
             red_flag_criteria: Criteria for red-flagging
+            parallel_votes: Votes dispatched concurrently per voting batch
+            vote_timeout_ms: Timeout for a single agent call
+            step_timeout_ms: Wall-clock budget for voting on one step
+            vote_retention: Which individual votes each VotingResult keeps
+            deterministic_fast_path: Run deterministic agents once instead
+                of voting
+            voting: Prebuilt voting engine (e.g. SequentialVoting); when
+                given, the voting arguments above are ignored
+            result_cache: Cache of decided results shared across tasks;
+                voted steps with an identical agent and context replay it
+            max_concurrent_steps: Steps whose dependencies are met that may
+                run at once (1 = serial, in dependency order)
+            journal: Durable log of decided steps; tasks with a ``task_id``
+                are journaled and resume from it after a crash
+            decomposition_lookahead: When set, steps are pulled lazily from
+                ``decomposer.iter_steps`` with at most this many pulled but
+                unfinished at once, and released steps are dropped, so
+                memory follows the frontier plus retained steps; None
+                builds the full step list up front
         """
         self.decomposer = decomposer
-        self.voting = FirstToAheadByKVoting(
+        self.voting = voting or FirstToAheadByKVoting(
             k=voting_k,
             max_rounds=max_voting_rounds,
-            red_flag_criteria=red_flag_criteria
+            red_flag_criteria=red_flag_criteria,
+            parallel_votes=parallel_votes,
+            vote_timeout_ms=vote_timeout_ms,
+            step_timeout_ms=step_timeout_ms,
+            retention=vote_retention
         )
+        self.result_cache = result_cache
+        self.max_concurrent_steps = max(1, max_concurrent_steps)
+        self.journal = journal
+        self.decomposition_lookahead = decomposition_lookahead
         self.agents: dict[str, Microagent] = {}
-        self.execution_stats = {
-            "total_steps": 0,
-            "successful_steps": 0,
-            "failed_steps": 0,
-            "total_votes": 0,
-            "red_flagged_votes": 0,
-            "avg_rounds_per_step": 0.0
-        }
+        self.deterministic_fast_path = deterministic_fast_path
+        self.deterministic_agents: dict[str, bool] = {}
+        self._aggregate_stats = ExecutionStats()
+        self._stats_lock = threading.Lock()
+
+    @property
+    def execution_stats(self) -> dict[str, Any]:
+        """Snapshot of counters aggregated over all finished executions."""
+        with self._stats_lock:
+            return self._aggregate_stats.to_dict()
 
-    def register_agent(self, agent: Microagent) -> None:
-        """Register a microagent for task execution."""
+    def register_agent(
+        self,
+        agent: Microagent,
+        deterministic: Optional[bool] = None
+    ) -> None:
+        """
+        Register a microagent for task execution.
+
+        Args:
+            agent: Microagent to register
+            deterministic: Per-agent override of ``agent.deterministic``;
+                deterministic agents are run once per step, not voted on
+        """
         self.agents[agent.agent_id] = agent
+        self.deterministic_agents[agent.agent_id] = (
+            agent.deterministic if deterministic is None else deterministic
+        )
 
     async def execute_task(
         self,
         task: dict[str, Any],
-        agent_selector: Callable[[Step], str] = None
+        agent_selector: Callable[[Step], str] = None,
+        task_id: Optional[str] = None
     ) -> dict[str, Any]:
         """
         Execute a complete task using MAKER methodology.
 
+        Steps are scheduled over their dependency DAG: each step starts as
+        soon as all of its dependencies have finished (successfully or not),
+        with at most ``max_concurrent_steps`` steps voting at once.
+
+        With a journal and a ``task_id`` (argument or ``task["task_id"]``),
+        decided steps are journaled, and steps already in the journal are
+        restored instead of re-run. The decomposition must be deterministic
+        so step ids match between runs.
+
         Args:
             task: Task to execute
             agent_selector: Function to select agent for each step
+            task_id: Stable id of the task for journaling/resume
 
         Returns:
-            Task result with execution statistics
+            Task result with this execution's statistics; concurrent
+            executions on one orchestrator do not share counters
         """
-        # Decompose task into atomic steps
-        steps = self.decomposer.decompose(task)
-        self.execution_stats["total_steps"] = len(steps)
+        semaphore = asyncio.Semaphore(self.max_concurrent_steps)
+        return await self._execute(task, agent_selector, semaphore, task_id=task_id)
 
-        logger.info(f"Decomposed task into {len(steps)} steps")
-
-        total_rounds = 0
+    async def stream_task(
+        self,
+        task: dict[str, Any],
+        agent_selector: Callable[[Step], str] = None,
+        task_id: Optional[str] = None
+    ) -> AsyncIterator[StepEvent]:
+        """
+        Execute a task, yielding each step as soon as it finishes.
 
-        # Execute each step with voting
-        for step in steps:
-            agent_id = agent_selector(step) if agent_selector else self._default_agent_selector(step)
-            agent = self.agents.get(agent_id)
+        Steps run exactly as in ``execute_task``. Every finished step is
+        yielded as a ``StepEvent`` carrying the decomposer's partial result
+        (see ``TaskDecomposer.compose_partial``); the last event has
+        ``final=True`` and the ``execute_task`` result. Closing the
+        iterator early cancels the remaining steps. Results the decomposer
+        does not retain may already be released when their event is read.
 
-            if not agent:
-                logger.error(f"No agent found for step {step.step_id}")
-                step.status = "failed"
-                self.execution_stats["failed_steps"] += 1
-                continue
+        Args:
+            task: Task to execute
+            agent_selector: Function to select agent for each step
+            task_id: Stable id of the task for journaling/resume
 
-            # Build context with dependency results
-            context = self._build_context(step, steps)
+        Yields:
+            Step completion events, then the final event
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_steps)
+        finished: asyncio.Queue = asyncio.Queue()
+        execution = asyncio.create_task(self._execute(
+            task, agent_selector, semaphore, task_id=task_id, on_step=finished.put_nowait
+        ))
+        execution.add_done_callback(lambda _: finished.put_nowait(None))
+
+        partial = None
+        completed = 0
+        try:
+            while True:
+                step = await finished.get()
+                if step is None:
+                    break
+                partial = self.decomposer.compose_partial(partial, step)
+                completed += 1
+                yield StepEvent(step=step, partial=partial, completed_steps=completed)
+
+            yield StepEvent(
+                step=None,
+                partial=partial,
+                completed_steps=completed,
+                final=True,
+                result=execution.result()
+            )
+        finally:
+            if not execution.done():
+                execution.cancel()
+                try:
+                    await execution
+                except asyncio.CancelledError:
+                    pass
+
+    async def execute_many(
+        self,
+        tasks: list[dict[str, Any]],
+        agent_selector: Callable[[Step], str] = None,
+        concurrency: Optional[int] = None
+    ) -> list[dict[str, Any]]:
+        """
+        Execute many tasks on one shared step budget.
 
-            # Execute with voting
-            async def vote_fn():
-                return await agent.execute(context)
+        All tasks' DAGs are scheduled together, with at most ``concurrency``
+        steps (across all tasks) running at once. Voted steps of different
+        tasks that are identical (same agent, step id and canonical context)
+        are voted on once and the result fanned out to every task that needs it.
+        If any task raises, the other tasks are cancelled and awaited before
+        the error propagates.
 
-            result = await self.voting.run_voting(
-                vote_fn,
-                lambda: agent_id
-            )
+        Args:
+            tasks: Tasks to execute
+            agent_selector: Function to select agent for each step
+            concurrency: Shared step limit (default ``max_concurrent_steps``)
 
-            total_rounds += result.rounds_taken
-            self.execution_stats["total_votes"] += result.total_votes
+        Returns:
+            One ``execute_task``-style result per task, in input order
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency or self.max_concurrent_steps))
+        # Voted results for this batch, kept until every task has finished
+        shared: dict[Any, asyncio.Future] = {}
+        executions = [
+            asyncio.ensure_future(self._execute(task, agent_selector, semaphore, shared))
+            for task in tasks
+        ]
+        try:
+            return list(await asyncio.gather(*executions))
+        finally:
+            # If one task failed (or the batch was cancelled), stop the
+            # others and wait for their steps to unwind before returning
+            for execution in executions:
+                execution.cancel()
+            await asyncio.gather(*executions, return_exceptions=True)
+
+    async def _execute(
+        self,
+        task: dict[str, Any],
+        agent_selector: Optional[Callable[[Step], str]],
+        semaphore: asyncio.Semaphore,
+        shared: Optional[dict[Any, asyncio.Future]] = None,
+        task_id: Optional[str] = None,
+        on_step: Optional[Callable[[Step], None]] = None
+    ) -> dict[str, Any]:
+        """
+        Decompose and run one task, gating steps on ``semaphore``.
 
-            if result.status == VoteStatus.DECIDED:
-                step.result = result.winner
-                step.status = "completed"
-                self.execution_stats["successful_steps"] += 1
-            else:
-                step.result = result.winner
-                step.status = "timeout" if result.status == VoteStatus.TIMEOUT else "failed"
-                if result.status == VoteStatus.RED_FLAGGED:
-                    self.execution_stats["red_flagged_votes"] += 1
-                self.execution_stats["failed_steps"] += 1
+        ``shared`` maps step keys to voting results reused across a batch;
+        ``on_step`` is called with each step as it finishes.
+        """
+        # Decompose task into atomic steps, eagerly or as a lazy stream
+        lazy = self.decomposition_lookahead is not None
+        if lazy:
+            source = iter(self.decomposer.iter_steps(task))
+            window = max(1, self.decomposition_lookahead)
+        else:
+            source = iter(self.decomposer.decompose(task))
+            window = None
+        stats = ExecutionStats()
+        pulled = 0
+
+        # Pulled steps in pull order, by id, so dependency lookups are O(1).
+        # In lazy mode released steps are evicted, so it holds the frontier
+        # plus retained steps.
+        steps_by_id: dict[int, Step] = {}
+
+        if task_id is None:
+            task_id = task.get("task_id")
+        journal = self.journal if task_id is not None else None
+        restored = journal.load(task_id) if journal else {}
+
+        async def run(step: Step) -> Step:
+            record = restored.get(step.step_id)
+            if record is not None:
+                folded.pop(step.step_id, None)
+                step.result = record.result
+                step.status = record.status
+                stats.resumed_steps += 1
+                stats.successful_steps += 1
+                return step
+
+            async with semaphore:
+                result = await self._execute_step(
+                    step, steps_by_id, agent_selector, stats, shared,
+                    folded.pop(step.step_id, None)
+                )
+            if journal and result is not None and result.status == VoteStatus.DECIDED:
+                journal.record(StepRecord(
+                    task_id=task_id,
+                    step_id=step.step_id,
+                    status=step.status,
+                    result=step.result,
+                    total_votes=result.total_votes,
+                    rounds_taken=result.rounds_taken,
+                    winning_margin=result.winning_margin
+                ))
+            return step
+
+        # Indegrees over pulled, unfinished dependencies; dependencies that
+        # are unknown (or, in lazy mode, not yet pulled) count as satisfied
+        indegree: dict[int, int] = {}
+        dependents: dict[int, list[Step]] = {}
+        unfinished: set[int] = set()
+        ready: list[Step] = []
+        exhausted = False
+
+        # Unfinished consumers of each result compose_result does not need;
+        # the result is released when this reaches zero. Journaled results
+        # stay recoverable from the journal.
+        consumers: dict[int, int] = {}
+
+        # Steps run by incremental agents, and their folded state so far;
+        # folding a dependency's result counts as consuming it
+        incremental: set[int] = set()
+        folded: dict[int, Any] = {}
+
+        def agent_for(step: Step) -> Optional[Microagent]:
+            return self.agents.get(
+                agent_selector(step) if agent_selector else self._default_agent_selector(step)
+            )
 
-        # Calculate average rounds
-        if len(steps) > 0:
-            self.execution_stats["avg_rounds_per_step"] = total_rounds / len(steps)
+        def fold(step: Step, dep: Step) -> None:
+            if dep.result is not None:
+                folded[step.step_id] = agent_for(step).fold_result(
+                    step, folded.get(step.step_id), dep
+                )
+            if dep.step_id in consumers:
+                consumers[dep.step_id] -= 1
+                release(dep.step_id)
+
+        def release(step_id: int) -> None:
+            if consumers.get(step_id, 1) <= 0 and step_id not in unfinished:
+                del consumers[step_id]
+                steps_by_id[step_id].result = None
+                stats.released_results += 1
+                if lazy:
+                    del steps_by_id[step_id]
+
+        def pull() -> None:
+            nonlocal exhausted, pulled
+            batch = []
+            while not exhausted and (window is None or len(unfinished) + len(batch) < window):
+                step = next(source, None)
+                if step is None:
+                    exhausted = True
+                else:
+                    batch.append(step)
+            for step in batch:
+                # In lazy mode only ids still held (not evicted) are checked
+                if step.step_id in steps_by_id:
+                    raise ValueError(f"Duplicate step id in decomposition: {step.step_id}")
+                steps_by_id[step.step_id] = step
+                unfinished.add(step.step_id)
+            pulled += len(batch)
+            for step in batch:
+                if not self.decomposer.retain_result(step):
+                    count = self.decomposer.result_consumers(task, step) if lazy else 0
+                    if count is not None:
+                        consumers[step.step_id] = count
+            if not lazy:
+                for step in batch:
+                    for dep_id in step.dependencies:
+                        if dep_id in consumers:
+                            consumers[dep_id] += 1
+            for step in batch:
+                if getattr(agent_for(step), "incremental", False):
+                    incremental.add(step.step_id)
+                    # Dependencies that finished before this step was pulled
+                    for dep_id in step.dependencies:
+                        if dep_id not in unfinished and dep_id in steps_by_id and dep_id != step.step_id:
+                            fold(step, steps_by_id[dep_id])
+                deps = {d for d in step.dependencies if d in unfinished and d != step.step_id}
+                indegree[step.step_id] = len(deps)
+                for dep_id in deps:
+                    dependents.setdefault(dep_id, []).append(step)
+                if not deps:
+                    ready.append(step)
+
+        def finish(step: Step) -> None:
+            unfinished.discard(step.step_id)
+            del indegree[step.step_id]
+            if on_step is not None:
+                on_step(step)
+            for child in dependents.get(step.step_id, ()):
+                if child.step_id in incremental and child.step_id in indegree:
+                    fold(child, step)
+            if step.step_id in incremental:
+                incremental.discard(step.step_id)  # Consumed its dependencies when folding
+            elif consumers:
+                for dep_id in step.dependencies:
+                    if dep_id in consumers:
+                        consumers[dep_id] -= 1
+                        release(dep_id)
+            if consumers:
+                release(step.step_id)
+            if lazy:
+                step.context = {}  # Only needed to build this step's context
+            for child in dependents.pop(step.step_id, ()):
+                if child.step_id not in indegree:
+                    continue  # Already run to break a dependency cycle
+                indegree[child.step_id] -= 1
+                if indegree[child.step_id] == 0:
+                    ready.append(child)
+
+        pending: set[asyncio.Task] = set()
+        try:
+            pull()
+            while ready or pending or unfinished:
+                if not ready and not pending:
+                    # Dependency cycle: run the first blocked step (in pull
+                    # order) to break it; steps it unblocks are scheduled
+                    blocked = next(step for step in steps_by_id.values() if step.step_id in indegree)
+                    logger.warning(f"Step {blocked.step_id} is in a dependency cycle; running it first")
+                    finish(await run(blocked))
+                    pull()
+                    continue
+
+                pending.update(asyncio.create_task(run(step)) for step in ready)
+                ready = []
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for done_task in done:
+                    finish(done_task.result())
+                pull()
+        finally:
+            for pending_task in pending:
+                pending_task.cancel()
+            if pending:
+                # Let cancelled steps unwind before returning, so none of
+                # their journal writes or stats updates land afterwards
+                await asyncio.gather(*pending, return_exceptions=True)
+            if journal:
+                journal.flush()  # Keep steps decided before a failure
+
+        stats.total_steps = pulled
+        logger.info(f"Executed {pulled} decomposed steps")
+        steps = list(steps_by_id.values())
+
+        with self._stats_lock:
+            self._aggregate_stats.merge(stats)
 
         # Compose final result
         final_result = self.decomposer.compose_result(steps)
@@ -480,9 +1724,142 @@ class MAKEROrchestrator:
         return {
             "result": final_result,
             "steps": steps,
-            "stats": self.execution_stats
+            "stats": stats.to_dict()
         }
 
+    async def _execute_step(
+        self,
+        step: Step,
+        steps_by_id: dict[int, Step],
+        agent_selector: Optional[Callable[[Step], str]],
+        stats: ExecutionStats,
+        shared: Optional[dict[Any, asyncio.Future]] = None,
+        folded: Any = None
+    ) -> Optional[VotingResult]:
+        """
+        Run one step with voting and record its outcome in ``stats``.
+
+        ``folded`` is the step's folded dependency state, for incremental
+        agents. Returns the voting result, or None if no agent could run
+        the step.
+        """
+        agent_id = agent_selector(step) if agent_selector else self._default_agent_selector(step)
+        agent = self.agents.get(agent_id)
+
+        if not agent:
+            logger.error(f"No agent found for step {step.step_id}")
+            step.status = "failed"
+            stats.failed_steps += 1
+            return None
+
+        # Build context with dependency results, or the state they were
+        # folded into as they finished
+        if agent.incremental:
+            context = {**step.context, "folded": folded}
+        else:
+            context = self._build_context(step, steps_by_id)
+
+        # Execute with voting
+        async def vote_fn():
+            return await agent.execute(context)
+
+        replayed = False
+        if self.deterministic_fast_path and self.deterministic_agents.get(agent_id):
+            result = await self.voting.run_single(vote_fn, lambda: agent_id)
+            stats.deterministic_steps += 1
+        else:
+            result, replayed = await self._vote_shared(
+                agent_id, step, context, vote_fn, stats, shared
+            )
+
+        if not replayed:
+            step.votes = result.total_votes
+            stats.total_votes += result.total_votes
+            stats.wasted_votes += result.wasted_votes
+            stats.timed_out_votes += result.timed_out_votes
+            stats.total_rounds += result.rounds_taken
+
+        if result.status == VoteStatus.DECIDED:
+            step.result = result.winner
+            step.status = "completed"
+            stats.successful_steps += 1
+        else:
+            step.result = result.winner
+            step.status = "timeout" if result.status == VoteStatus.TIMEOUT else "failed"
+            if result.status == VoteStatus.RED_FLAGGED:
+                stats.red_flagged_votes += 1
+            stats.failed_steps += 1
+
+        return result
+
+    async def _vote_shared(
+        self,
+        agent_id: str,
+        step: Step,
+        context: dict[str, Any],
+        vote_fn: Callable,
+        stats: ExecutionStats,
+        shared: Optional[dict[Any, asyncio.Future]] = None
+    ) -> tuple[VotingResult, bool]:
+        """
+        Vote on a step, reusing a cached or batch-shared result for the same key.
+
+        ``shared`` is the batch map of ``execute_many``: a step joins the
+        step with the same agent, id and context voting (or voted) for
+        another task. Step ids are unique within a task, so a task's own
+        steps are never merged, and outside a batch no key is computed
+        unless there is a result cache.
+
+        Returns the result and whether it was replayed rather than voted on
+        here (replayed results spent no votes in this execution).
+        """
+        if self.result_cache is not None:
+            key = self.result_cache.key(agent_id, context)
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                stats.cache_hits += 1
+                return cached, True
+            stats.cache_misses += 1
+
+        if shared is None:
+            result = await self.voting.run_voting(vote_fn, lambda: agent_id)
+            if self.result_cache is not None:
+                self.result_cache.put(key, result)
+            return result, False
+
+        batch_key = (agent_id, step.step_id, self.voting.canonicalizer.key(context))
+
+        # Join the same step voting (or voted) for another task
+        while (inflight := shared.get(batch_key)) is not None:
+            try:
+                result = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise  # This execution was cancelled
+                continue  # The voting execution was cancelled; vote here
+            stats.coalesced_steps += 1
+            return result.copy(), True  # Each joined step owns its result
+
+        future = asyncio.get_running_loop().create_future()
+        # Mark failures as retrieved even if no other task joined
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        shared[batch_key] = future
+        try:
+            result = await self.voting.run_voting(vote_fn, lambda: agent_id)
+        except asyncio.CancelledError:
+            del shared[batch_key]
+            future.cancel()
+            raise
+        except Exception as e:
+            del shared[batch_key]
+            future.set_exception(e)
+            raise
+
+        if self.result_cache is not None:
+            self.result_cache.put(key, result)
+        future.set_result(result)
+        return result, False
+
     def _default_agent_selector(self, step: Step) -> str:
         """Default agent selection based on step description."""
         # Return first registered agent
@@ -490,13 +1867,13 @@ class MAKEROrchestrator:
             return next(iter(self.agents.keys()))
         return "default"
 
-    def _build_context(self, step: Step, all_steps: list[Step]) -> dict[str, Any]:
+    def _build_context(self, step: Step, steps_by_id: dict[int, Step]) -> dict[str, Any]:
         """Build context for a step including dependency results."""
         context = step.context.copy()
 
         # Add results from dependencies
         for dep_id in step.dependencies:
-            dep_step = next((s for s in all_steps if s.step_id == dep_id), None)
+            dep_step = steps_by_id.get(dep_id)
             if dep_step and dep_step.result is not None:
                 context[f"step_{dep_id}_result"] = dep_step.result
 
@@ -6,14 +6,15 @@ Each agent handles one atomic task in the content discovery pipeline.
 """
 
 import asyncio
+import heapq
 import json
 import re
 from abc import abstractmethod
 from dataclasses import dataclass, field
-from typing import Any, Optional
+from typing import Any, Collection, Iterable, Iterator, Optional
 from enum import Enum
 
-from .core import Microagent, Step, TaskDecomposer, RedFlagCriteria
+from .core import Microagent, Step, StepDescription, TaskDecomposer, RedFlagCriteria
 
 
 class ContentType(Enum):
@@ -70,6 +71,47 @@ class ContentItem:
     metadata: dict = field(default_factory=dict)
 
 
+@dataclass
+class HardConstraints:
+    """
+    Constraints a candidate must meet to be watchable at all.
+
+    Unlike scoring factors, these do not trade off: an item on a platform
+    the user cannot access, longer than their maximum, or in a disliked
+    genre is never a good recommendation.
+    """
+    available_platforms: Optional[frozenset[str]] = None  # None = any platform
+    max_duration_minutes: Optional[int] = None
+    disliked_genres: frozenset[str] = frozenset()
+
+    @classmethod
+    def from_preferences(cls, preferences: Any) -> "HardConstraints":
+        """Constraints implied by user preferences (none for non-UserPreferences)."""
+        if not isinstance(preferences, UserPreferences):
+            return cls()
+        return cls(
+            available_platforms=frozenset(preferences.available_platforms) or None,
+            max_duration_minutes=preferences.max_duration_minutes,
+            disliked_genres=frozenset(preferences.disliked_genres)
+        )
+
+    @property
+    def active(self) -> bool:
+        return (
+            self.available_platforms is not None
+            or self.max_duration_minutes is not None
+            or bool(self.disliked_genres)
+        )
+
+    def admits(self, item: ContentItem) -> bool:
+        """Whether an item meets every constraint."""
+        if self.available_platforms is not None and item.platform not in self.available_platforms:
+            return False
+        if self.max_duration_minutes is not None and item.duration_minutes > self.max_duration_minutes:
+            return False
+        return not self.disliked_genres.intersection(item.genres)
+
+
 @dataclass
 class RecommendationResult:
     """Result from a recommendation microagent."""
@@ -92,6 +134,9 @@ class MoodAnalyzerAgent(Microagent[MoodCategory]):
     Atomic task: Given user input, determine their mood category.
     """
 
+    # Keyword rules only, so the same context always yields the same mood
+    deterministic = True
+
     def __init__(self, llm_client: Any = None):
         super().__init__(agent_id="mood_analyzer", temperature=0.1)
         self.llm_client = llm_client
@@ -199,6 +244,8 @@ class DurationFilterAgent(Microagent[tuple[int, int]]):
     Atomic task: Given context, return (min_duration, max_duration) in minutes.
     """
 
+    deterministic = True
+
     def __init__(self, llm_client: Any = None):
         super().__init__(agent_id="duration_filter", temperature=0.1)
         self.llm_client = llm_client
@@ -254,6 +301,18 @@ class ContentScorerAgent(Microagent[RecommendationResult]):
     Atomic task: Given one content item and context, return a score.
     """
 
+    deterministic = True
+
+    # Factor weights of the overall score
+    WEIGHTS = {
+        "genre_match": 0.30,
+        "rating": 0.20,
+        "duration_fit": 0.15,
+        "recency": 0.10,
+        "availability": 0.15,
+        "novelty": 0.10,
+    }
+
     def __init__(self, llm_client: Any = None):
         super().__init__(agent_id="content_scorer", temperature=0.1)
         self.llm_client = llm_client
@@ -326,16 +385,7 @@ class ContentScorerAgent(Microagent[RecommendationResult]):
             factors["novelty"] = 1.0
 
         # Calculate weighted score
-        weights = {
-            "genre_match": 0.30,
-            "rating": 0.20,
-            "duration_fit": 0.15,
-            "recency": 0.10,
-            "availability": 0.15,
-            "novelty": 0.10,
-        }
-
-        total_score = sum(factors[k] * weights[k] for k in factors)
+        total_score = sum(factors[k] * self.WEIGHTS[k] for k in factors)
         confidence = min(factors.values())  # Confidence based on weakest factor
 
         # Generate reasoning
@@ -358,36 +408,150 @@ class ContentScorerAgent(Microagent[RecommendationResult]):
         )
 
 
+class TopKAccumulator:
+    """
+    Bounded-heap top-k selection of scored items.
+
+    Keeps the ``top_k`` best results by (score, confidence) in a heap of at
+    most ``top_k`` entries, O(log k) per added result, instead of sorting
+    every result. Ties rank in the order results were added, exactly as a
+    stable descending sort would, unless an explicit ``order`` is given;
+    ``demoted`` ids rank after all other results. In the orchestrator,
+    ``ContentRankerAgent`` feeds it each scoring step's result as that
+    step finishes, ordered by scoring step id, so ranking needs no pass
+    over all scores at the end.
+    """
+
+    def __init__(self, top_k: int, demoted: Collection[str] = frozenset()):
+        self.top_k = top_k
+        self.demoted = demoted
+        self._heaps: tuple[list, list] = ([], [])  # Viable, demoted
+        self._added = 0
+
+    def __len__(self) -> int:
+        return len(self._heaps[0]) + len(self._heaps[1])
+
+    def add(self, result: RecommendationResult, order: Optional[tuple[int, ...]] = None) -> None:
+        """Offer one scored item; ties go to the lowest ``order`` (default: added first)."""
+        if self.top_k <= 0:
+            return
+        heap = self._heaps[1 if result.content_id in self.demoted else 0]
+        if order is None:
+            order = (self._added,)
+        self._added += 1
+        # Min-heap on the ranking key; negated order makes earlier items win ties
+        entry = (result.score, result.confidence, tuple(-o for o in order), result)
+        if len(heap) < self.top_k:
+            heapq.heappush(heap, entry)
+        elif entry[:3] > heap[0][:3]:
+            heapq.heapreplace(heap, entry)
+
+    def extend(self, results: Iterable[RecommendationResult]) -> None:
+        """Offer many results in order; faster than repeated ``add``."""
+        if self.top_k <= 0:
+            return
+        results = list(results)
+        tiers = [results]
+        if self.demoted:
+            tiers = [
+                [r for r in results if r.content_id not in self.demoted],
+                [r for r in results if r.content_id in self.demoted],
+            ]
+        for tier in tiers:
+            # Only a tier's own top-k can reach the overall top-k
+            best = heapq.nlargest(
+                self.top_k, enumerate(tier), key=lambda p: (p[1].score, p[1].confidence, -p[0])
+            )
+            for _, result in sorted(best, key=lambda p: p[0]):
+                self.add(result)
+
+    def add_block(self, block: Any, order: Optional[int] = None) -> None:
+        """Offer every row of a ``batch_scoring.ScoreBlock`` in block order."""
+        for row in sorted(block.top_rows(self.top_k, self.demoted)):
+            self.add(block.result(row), None if order is None else (order, int(row)))
+
+    def ranked(self) -> list[RecommendationResult]:
+        """The top-k results, best first."""
+        ranked = []
+        for heap in self._heaps:
+            ranked.extend(entry[3] for entry in sorted(heap, key=lambda e: e[:3], reverse=True))
+        return ranked[:self.top_k]
+
+    def ranked_ids(self) -> list[str]:
+        """Content ids of the top-k results, best first."""
+        return [result.content_id for result in self.ranked()]
+
+
 class ContentRankerAgent(Microagent[list[str]]):
     """
     Microagent for ranking scored content items.
 
     Atomic task: Given scored items, return ordered list of content IDs.
+    Items listed in the ``demoted`` context (down-tiered by the prefilter)
+    rank after every other item. Only the top_k are selected (bounded heap,
+    or argpartition for score blocks) instead of sorting every item. Run
+    by the orchestrator, it is incremental: each scoring step's result is
+    folded into the running top-k as that step finishes.
     """
 
+    deterministic = True
+    incremental = True
+
     def __init__(self, llm_client: Any = None, top_k: int = 10):
         super().__init__(agent_id="content_ranker", temperature=0.1)
         self.llm_client = llm_client
         self.top_k = top_k
 
+    def accumulator(self, demoted: Collection[str] = frozenset()) -> TopKAccumulator:
+        """Top-k selector with this ranker's top_k and tie-break order."""
+        return TopKAccumulator(self.top_k, demoted)
+
+    def fold_result(self, step: Step, state: Any, dependency: Step) -> TopKAccumulator:
+        """Offer a finished scoring step's result to the running top-k."""
+        accumulator = state
+        if accumulator is None:
+            accumulator = self.accumulator(step.context.get("demoted") or frozenset())
+        value = dependency.result
+        if isinstance(value, RecommendationResult):
+            accumulator.add(value, (dependency.step_id,))
+        elif hasattr(value, "top_rows"):
+            accumulator.add_block(value, dependency.step_id)  # batch_scoring.ScoreBlock
+        return accumulator
+
     async def execute(self, context: dict[str, Any]) -> list[str]:
         """Rank content items by score."""
         self.call_count += 1
 
-        scored_items: list[RecommendationResult] = context.get("scored_items", [])
-
-        if not scored_items:
-            return []
-
-        # Sort by score (descending), then by confidence (descending)
-        sorted_items = sorted(
-            scored_items,
-            key=lambda x: (x.score, x.confidence),
-            reverse=True
-        )
+        if "folded" in context:
+            # Scores were folded in as their steps finished
+            folded = context["folded"]
+            return folded.ranked_ids() if folded is not None else []
+
+        demoted = context.get("demoted") or frozenset()
+        scored_items = context.get("scored_items")
+        if scored_items is None:
+            # Gather scores from the scoring steps this step depends on
+            scored_items = [
+                value for value in context.values()
+                if isinstance(value, RecommendationResult) or hasattr(value, "top_rows")
+            ]
+            if len(scored_items) == 1 and hasattr(scored_items[0], "top_rows"):
+                return scored_items[0].ranked_ids(self.top_k, demoted)  # batch_scoring.ScoreBlock
+
+        # Select by score (descending), then by confidence (descending)
+        accumulator = self.accumulator(demoted)
+        pending: list[RecommendationResult] = []
+        for item in scored_items:
+            if isinstance(item, RecommendationResult):
+                pending.append(item)
+            else:
+                accumulator.extend(pending)
+                pending = []
+                accumulator.add_block(item)
+        accumulator.extend(pending)
 
         # Return top K content IDs
-        return [item.content_id for item in sorted_items[:self.top_k]]
+        return accumulator.ranked_ids()
 
     def validate_output(self, output: list[str]) -> bool:
         return isinstance(output, list) and all(isinstance(x, str) for x in output)
@@ -459,15 +623,45 @@ class EntertainmentDiscoveryDecomposer(TaskDecomposer):
     each step is minimal and focused on a single decision.
     """
 
-    def decompose(self, task: dict[str, Any]) -> list[Step]:
+    PREFILTER_MODES = ("drop", "downtier")
+
+    # Step id layout: 1-3 analysis, then ranking, explanations and scoring
+    # in disjoint ranges so any number of candidates fits
+    RANK_STEP_ID = 200
+    EXPLAIN_STEP_BASE = 300
+    SCORE_STEP_BASE = 10_000
+
+    def __init__(self, batch_scoring: bool = False, prefilter: Optional[str] = None):
+        """
+        Initialize decomposer.
+
+        Args:
+            batch_scoring: Score all candidates in one "score block" step
+                (``batch_scoring.BatchContentScorerAgent``, needs numpy)
+                instead of one step per candidate
+            prefilter: Apply the user's hard constraints (see
+                ``HardConstraints``) before scoring: "drop" removes
+                candidates that fail them, "downtier" keeps them but ranks
+                them after every viable candidate; None scores everything
         """
-        Decompose a content discovery request into atomic steps.
+        if prefilter is not None and prefilter not in self.PREFILTER_MODES:
+            raise ValueError(f"Unknown prefilter mode: {prefilter}")
+        self.batch_scoring = batch_scoring
+        self.prefilter = prefilter
+
+    def iter_steps(self, task: dict[str, Any]) -> Iterator[Step]:
+        """
+        Lazily decompose a content discovery request into atomic steps.
+
+        Steps are yielded in dependency order, so the orchestrator can
+        consume them with bounded lookahead.
 
         Standard pipeline:
         1. Analyze user mood
         2. Match genres to mood/preferences
         3. Determine duration constraints
-        4. Score each candidate content
+        4. Prefilter candidates on hard constraints (when enabled), then
+           score each candidate content (or all of them as one block)
         5. Rank scored content
         6. Generate explanations for top picks
         """
@@ -475,11 +669,18 @@ class EntertainmentDiscoveryDecomposer(TaskDecomposer):
         preferences = task.get("preferences", UserPreferences())
         candidate_content = task.get("candidates", [])
         top_k = task.get("top_k", 5)
+        if top_k > self.SCORE_STEP_BASE - self.EXPLAIN_STEP_BASE:
+            raise ValueError(f"top_k too large for the step id layout: {top_k}")
 
-        steps = []
+        # Hard constraints are known from the request, so unviable items
+        # are filtered before any scoring step is created for them
+        demoted: frozenset[str] = frozenset()
+        constraints = HardConstraints.from_preferences(preferences)
+        if self.prefilter and constraints.active:
+            candidate_content, demoted = self._apply_prefilter(candidate_content, constraints)
 
         # Step 1: Mood Analysis
-        steps.append(Step(
+        yield Step(
             step_id=1,
             description="Analyze user mood from input",
             context={
@@ -487,65 +688,122 @@ class EntertainmentDiscoveryDecomposer(TaskDecomposer):
                 "time_of_day": task.get("time_of_day", "evening"),
                 "day_of_week": task.get("day_of_week", "saturday"),
             },
-            dependencies=[]
-        ))
+            dependencies=()
+        )
 
         # Step 2: Genre Matching
-        steps.append(Step(
+        yield Step(
             step_id=2,
             description="Match genres to mood and preferences",
             context={
                 "preferences": preferences,
             },
-            dependencies=[1]  # Needs mood from step 1
-        ))
+            dependencies=(1,)  # Needs mood from step 1
+        )
 
         # Step 3: Duration Filtering
-        steps.append(Step(
+        yield Step(
             step_id=3,
             description="Determine duration constraints",
             context={
                 "time_available_minutes": task.get("time_available"),
                 "content_type": task.get("content_type"),
             },
-            dependencies=[1]  # Needs mood from step 1
-        ))
-
-        # Steps 4.x: Score each content item (parallel-ready)
-        for i, content in enumerate(candidate_content):
-            steps.append(Step(
-                step_id=100 + i,  # 100+ for content scoring
-                description=f"Score content: {content.title if hasattr(content, 'title') else i}",
-                context={
-                    "content": content,
-                    "preferences": preferences,
-                },
-                dependencies=[2, 3]  # Needs genres and duration from steps 2, 3
-            ))
+            dependencies=(1,)  # Needs mood from step 1
+        )
+
+        if self.batch_scoring:
+            # Step 4: Score all content items as one columnar block
+            if candidate_content:
+                yield Step(
+                    step_id=self.SCORE_STEP_BASE,
+                    description=StepDescription(
+                        "Score {} content items as a block", len(candidate_content)
+                    ),
+                    context={
+                        "candidates": candidate_content,
+                        "preferences": preferences,
+                    },
+                    dependencies=(2, 3)  # Needs genres and duration from steps 2, 3
+                )
+        else:
+            # Steps 4.x: Score each content item (parallel-ready)
+            for i, content in enumerate(candidate_content):
+                yield Step(
+                    step_id=self.SCORE_STEP_BASE + i,
+                    description=StepDescription(
+                        "Score content: {}", content.title if hasattr(content, 'title') else i
+                    ),
+                    context={
+                        "content": content,
+                        "preferences": preferences,
+                    },
+                    dependencies=(2, 3)  # Needs genres and duration from steps 2, 3
+                )
 
         # Step 5: Rank all scored content
-        scoring_step_ids = [100 + i for i in range(len(candidate_content))]
-        steps.append(Step(
-            step_id=200,
+        num_scoring_steps = len(candidate_content)
+        if self.batch_scoring:
+            num_scoring_steps = min(1, num_scoring_steps)
+        scoring_step_ids = range(self.SCORE_STEP_BASE, self.SCORE_STEP_BASE + num_scoring_steps)
+        yield Step(
+            step_id=self.RANK_STEP_ID,
             description="Rank scored content items",
             context={
                 "top_k": top_k,
+                **({"demoted": demoted} if demoted else {}),
             },
             dependencies=scoring_step_ids
-        ))
+        )
 
         # Steps 6.x: Generate explanations for top picks
         for i in range(min(top_k, len(candidate_content))):
-            steps.append(Step(
-                step_id=300 + i,
-                description=f"Generate explanation for recommendation {i+1}",
+            yield Step(
+                step_id=self.EXPLAIN_STEP_BASE + i,
+                description=StepDescription("Generate explanation for recommendation {}", i + 1),
                 context={
                     "user_input": user_input,
                 },
-                dependencies=[200, 100 + i]  # Needs ranking and individual score
-            ))
+                # Needs ranking and individual score (or the score block)
+                dependencies=(
+                    self.RANK_STEP_ID,
+                    self.SCORE_STEP_BASE + (0 if self.batch_scoring else i)
+                )
+            )
+
+    def decompose(self, task: dict[str, Any]) -> list[Step]:
+        """Decompose the task into its full list of steps."""
+        return list(self.iter_steps(task))
+
+    def _apply_prefilter(
+        self,
+        candidates: Any,
+        constraints: HardConstraints
+    ) -> tuple[Any, frozenset[str]]:
+        """
+        Drop or down-tier candidates failing the hard constraints.
 
-        return steps
+        Accepts a list of ContentItem or a ``CandidateBlock`` (filtered
+        with vectorized masks). Returns the candidates to score, viable
+        ones first, and the ids to rank last.
+        """
+        if hasattr(candidates, "admitted"):
+            admitted = candidates.admitted(constraints)
+            if self.prefilter == "drop":
+                return candidates.take(admitted.nonzero()[0]), frozenset()
+            rest = candidates.content_ids[~admitted]
+            # Stable sort on the rejected flag puts viable rows first
+            return (
+                candidates.take((~admitted).argsort(kind="stable")),
+                frozenset(str(content_id) for content_id in rest)
+            )
+
+        viable, rest = [], []
+        for item in candidates:
+            (viable if constraints.admits(item) else rest).append(item)
+        if self.prefilter == "drop":
+            return viable, frozenset()
+        return viable + rest, frozenset(item.content_id for item in rest)
 
     def compose_result(self, steps: list[Step]) -> dict[str, Any]:
         """Compose final recommendation result from completed steps."""
@@ -572,17 +830,76 @@ class EntertainmentDiscoveryDecomposer(TaskDecomposer):
                 result["matched_genres"] = step.result
             elif step.step_id == 3:
                 result["duration_range"] = step.result
-            elif step.step_id == 200:
+            elif step.step_id == self.RANK_STEP_ID:
                 result["recommendations"] = step.result
-            elif step.step_id >= 300:
-                # Explanation step
-                idx = step.step_id - 300
+            elif self.is_explanation_step(step.step_id):
+                idx = step.step_id - self.EXPLAIN_STEP_BASE
                 if idx < len(result["recommendations"]):
                     content_id = result["recommendations"][idx]
                     result["explanations"][content_id] = step.result
 
         return result
 
+    @classmethod
+    def is_score_step(cls, step_id: int) -> bool:
+        """Whether ``step_id`` scores a candidate (or the candidate block)."""
+        return step_id >= cls.SCORE_STEP_BASE
+
+    @classmethod
+    def is_explanation_step(cls, step_id: int) -> bool:
+        """Whether ``step_id`` explains a top recommendation."""
+        return cls.EXPLAIN_STEP_BASE <= step_id < cls.SCORE_STEP_BASE
+
+    def retain_result(self, step: Step) -> bool:
+        """Per-candidate scores are only needed by the ranking step."""
+        return not self.is_score_step(step.step_id)
+
+    def result_consumers(self, task: dict[str, Any], step: Step) -> Optional[int]:
+        """Scores feed the ranking step, and the first top_k an explanation."""
+        if not self.is_score_step(step.step_id):
+            return None
+        if self.batch_scoring:
+            return 1 + min(task.get("top_k", 5), len(step.context["candidates"]))
+        return 2 if step.step_id - self.SCORE_STEP_BASE < task.get("top_k", 5) else 1
+
+    def compose_partial(self, partial: Any, step: Step) -> dict[str, Any]:
+        """
+        Fold a finished step into the streamed discovery result.
+
+        Returns a new dict when the step changes the result (mood, genres,
+        duration, ranking or an explanation) and ``partial`` itself
+        otherwise, so earlier snapshots are never mutated.
+        """
+        if partial is None:
+            partial = {
+                "mood": None,
+                "matched_genres": [],
+                "duration_range": None,
+                "recommendations": [],
+                "explanations": {},
+            }
+        if step.status != "completed" or self.is_score_step(step.step_id):
+            return partial
+
+        updated = dict(partial)
+        if step.step_id == 1:
+            updated["mood"] = step.result
+        elif step.step_id == 2:
+            updated["matched_genres"] = step.result
+        elif step.step_id == 3:
+            updated["duration_range"] = step.result
+        elif step.step_id == self.RANK_STEP_ID:
+            updated["recommendations"] = step.result
+        elif self.is_explanation_step(step.step_id):
+            idx = step.step_id - self.EXPLAIN_STEP_BASE
+            if idx >= len(partial["recommendations"]):
+                return partial
+            updated["explanations"] = {
+                **partial["explanations"],
+                partial["recommendations"][idx]: step.result,
+            }
+        return updated
+
 
 # Red-flag criteria specific to entertainment discovery
 ENTERTAINMENT_RED_FLAG_CRITERIA = RedFlagCriteria(
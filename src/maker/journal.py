@@ -0,0 +1,268 @@
+"""
+Durable Step Journal for MAKER
+
+Long-horizon tasks can run for hours; a crash halfway through
+``execute_task`` should not throw away every decided step. The journal
+appends each decided step's result and voting summary, and a later run
+of the same task (same ``task_id``, same deterministic decomposition)
+restores those steps instead of voting on them again, resuming from the
+last completed DAG frontier.
+
+Writes are buffered and flushed (with fsync) every ``batch_size`` records
+or ``fsync_interval_s`` seconds, whichever comes first, so journaling
+costs a small fraction of step time. The interval is enforced by a timer
+on the running event loop, so a quiet tail is flushed too. Records still
+buffered at a crash are lost and those steps are simply re-run.
+
+Results are stored with ``pickle``: only load journals you wrote.
+"""
+
+import asyncio
+import base64
+import json
+import os
+import pickle
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+
+@dataclass
+class StepRecord:
+    """A decided step as stored in the journal."""
+    task_id: str
+    step_id: int
+    status: str
+    result: Any
+    total_votes: int = 0
+    rounds_taken: int = 0
+    winning_margin: int = 0
+
+
+class StepJournal(ABC):
+    """
+    Append-only journal of decided steps with batched, fsynced writes.
+
+    Subclasses implement ``_write`` (persist and fsync a batch) and ``_load``.
+    """
+
+    def __init__(
+        self,
+        fsync_interval_s: float = 1.0,
+        batch_size: int = 256,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize journal.
+
+        Args:
+            fsync_interval_s: Max seconds a record waits in the buffer when
+                recorded from a running event loop; otherwise the interval
+                is only checked as records arrive and on ``flush``/``close``
+            batch_size: Records buffered before an immediate flush
+            clock: Monotonic time source
+        """
+        self.fsync_interval_s = fsync_interval_s
+        self.batch_size = batch_size
+        self._clock = clock
+        self._buffer: list[StepRecord] = []
+        self._last_flush = clock()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.records_written = 0
+        self.flushes = 0
+
+    def record(self, record: StepRecord) -> None:
+        """Buffer a decided step, flushing if the batch or interval is due."""
+        self._buffer.append(record)
+        if (
+            len(self._buffer) >= self.batch_size
+            or self._clock() - self._last_flush >= self.fsync_interval_s
+        ):
+            self.flush()
+        elif self._timer is None:
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        """Flush when the interval is due, if recording from an event loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        delay = max(0.0, self.fsync_interval_s - (self._clock() - self._last_flush))
+        self._timer = loop.call_later(delay, self.flush)
+
+    def flush(self) -> None:
+        """Persist and fsync all buffered records."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._buffer:
+            self._write(self._buffer)
+            self.records_written += len(self._buffer)
+            self.flushes += 1
+            self._buffer = []
+        self._last_flush = self._clock()
+
+    @abstractmethod
+    def _write(self, records: list[StepRecord]) -> None:
+        """Durably append a batch of records."""
+        pass
+
+    def load(self, task_id: str) -> dict[int, StepRecord]:
+        """Return the journaled steps of a task, by step_id."""
+        self.flush()
+        return self._load(task_id)
+
+    @abstractmethod
+    def _load(self, task_id: str) -> dict[int, StepRecord]:
+        """Read the persisted steps of a task."""
+        pass
+
+    def close(self) -> None:
+        """Flush pending records and release the backing store."""
+        self.flush()
+
+    def __enter__(self) -> "StepJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class FileStepJournal(StepJournal):
+    """Journal stored as JSON lines in a local file."""
+
+    def __init__(self, path: str, **kwargs):
+        """
+        Initialize file journal.
+
+        Args:
+            path: Journal file (created if missing, appended to otherwise)
+            **kwargs: Passed to StepJournal (fsync_interval_s, batch_size)
+        """
+        super().__init__(**kwargs)
+        self.path = path
+        self._file = open(path, "a+", encoding="utf-8")
+        # Terminate a torn final line so new records start on their own line
+        if self._file.tell() > 0:
+            self._file.seek(self._file.tell() - 1)
+            if self._file.read(1) != "\n":
+                self._file.write("\n")
+
+    def _write(self, records: list[StepRecord]) -> None:
+        lines = []
+        for record in records:
+            lines.append(json.dumps({
+                "task_id": record.task_id,
+                "step_id": record.step_id,
+                "status": record.status,
+                "total_votes": record.total_votes,
+                "rounds_taken": record.rounds_taken,
+                "winning_margin": record.winning_margin,
+                "result": base64.b64encode(pickle.dumps(record.result)).decode("ascii"),
+            }))
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _load(self, task_id: str) -> dict[int, StepRecord]:
+        records: dict[int, StepRecord] = {}
+        if not os.path.exists(self.path):
+            return records
+
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn final line from a crash mid-write
+                if data["task_id"] != task_id:
+                    continue
+                data["result"] = pickle.loads(base64.b64decode(data["result"]))
+                records[data["step_id"]] = StepRecord(**data)
+        return records
+
+    def close(self) -> None:
+        super().close()
+        self._file.close()
+
+
+class SQLiteStepJournal(StepJournal):
+    """Journal stored in a local SQLite database (WAL mode)."""
+
+    def __init__(self, path: str, **kwargs):
+        """
+        Initialize SQLite journal.
+
+        Args:
+            path: Database file (created if missing)
+            **kwargs: Passed to StepJournal (fsync_interval_s, batch_size)
+        """
+        super().__init__(**kwargs)
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS steps ("
+            " task_id TEXT NOT NULL,"
+            " step_id INTEGER NOT NULL,"
+            " status TEXT NOT NULL,"
+            " total_votes INTEGER NOT NULL,"
+            " rounds_taken INTEGER NOT NULL,"
+            " winning_margin INTEGER NOT NULL,"
+            " result BLOB NOT NULL,"
+            " PRIMARY KEY (task_id, step_id))"
+        )
+        self._conn.commit()
+
+    def _write(self, records: list[StepRecord]) -> None:
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO steps VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (r.task_id, r.step_id, r.status, r.total_votes,
+                     r.rounds_taken, r.winning_margin, pickle.dumps(r.result))
+                    for r in records
+                ]
+            )
+
+    def _load(self, task_id: str) -> dict[int, StepRecord]:
+        rows = self._conn.execute(
+            "SELECT step_id, status, total_votes, rounds_taken, winning_margin, result"
+            " FROM steps WHERE task_id = ?",
+            (task_id,)
+        )
+        return {
+            step_id: StepRecord(
+                task_id=task_id,
+                step_id=step_id,
+                status=status,
+                result=pickle.loads(result),
+                total_votes=total_votes,
+                rounds_taken=rounds_taken,
+                winning_margin=winning_margin
+            )
+            for step_id, status, total_votes, rounds_taken, winning_margin, result in rows
+        }
+
+    def close(self) -> None:
+        super().close()
+        self._conn.close()
+
+
+def create_step_journal(
+    path: str,
+    backend: str = "file",
+    **kwargs
+) -> StepJournal:
+    """Factory function to create a step journal ("file" or "sqlite")."""
+    journal_map = {
+        "file": FileStepJournal,
+        "sqlite": SQLiteStepJournal,
+    }
+    if backend not in journal_map:
+        raise ValueError(f"Unknown journal backend: {backend}")
+    return journal_map[backend](path, **kwargs)
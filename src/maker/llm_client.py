@@ -11,13 +11,15 @@ with built-in support for MAKER's requirements:
 
 import asyncio
 import json
+import sys
 import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional, Union
 import logging
 
 from .config import LLMConfig, LLMProvider
+from .core import Microagent, RedFlagCriteria, RedFlaggedResponse, StreamingRedFlagMonitor
 
 logger = logging.getLogger(__name__)
 
@@ -33,14 +35,32 @@ class LLMResponse:
     metadata: dict
 
 
+def _unlimited_criteria() -> RedFlagCriteria:
+    """
+    Criteria that never trip, for streams the caller did not ask to check.
+
+    The monitor then only collects text; an estimated token count must not
+    abort a valid response that is close to ``max_tokens``.
+    """
+    return RedFlagCriteria(
+        max_response_tokens=sys.maxsize, max_response_length=sys.maxsize
+    )
+
+
 class BaseLLMClient(ABC):
     """Abstract base class for LLM clients."""
 
     def __init__(self, config: LLMConfig):
         self.config = config
         self.call_count = 0
-        self.total_tokens = 0
+        self.total_tokens = 0  # Reported for completed calls (input + output)
         self.total_latency_ms = 0
+        self.aborted_calls = 0
+        # Aborted streams have no usage report: estimated output tokens
+        # received, and the output budget left unused, an upper bound on
+        # the output tokens the abort saved
+        self.aborted_output_tokens = 0
+        self.max_output_tokens_saved = 0
 
     @abstractmethod
     async def generate(
@@ -52,6 +72,49 @@ class BaseLLMClient(ABC):
         """Generate a response from the LLM."""
         pass
 
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        red_flag_criteria: Optional[RedFlagCriteria] = None,
+        **kwargs
+    ) -> LLMResponse:
+        """
+        Generate a response, aborting as soon as it is red-flagged.
+
+        Chunks are checked against ``red_flag_criteria`` as they stream in;
+        once a token, length or pattern limit is hit the request is closed
+        and the response is returned with ``finish_reason="red_flagged"``
+        and the flags in ``metadata["red_flags"]``. Clients without a
+        streaming API fall back to ``generate`` and check the full response.
+        """
+        response = await self.generate(prompt, system_prompt, **kwargs)
+        if red_flag_criteria is not None:
+            flags = red_flag_criteria.check(
+                response.content, {"token_count": response.token_count}
+            )
+            if flags:
+                response.finish_reason = "red_flagged"
+                response.metadata["red_flags"] = flags
+        return response
+
+    async def _consume_stream(
+        self,
+        chunks: AsyncIterator[str],
+        monitor: Optional[StreamingRedFlagMonitor]
+    ) -> bool:
+        """Feed streamed chunks to the monitor; return True if it tripped."""
+        async for chunk in chunks:
+            if monitor is not None and monitor.feed(chunk):
+                return True
+        return False
+
+    def _record_abort(self, monitor: StreamingRedFlagMonitor, max_tokens: int) -> None:
+        """Count an aborted call against the output budget it was given."""
+        self.aborted_calls += 1
+        self.aborted_output_tokens += monitor.token_count
+        self.max_output_tokens_saved += max(0, max_tokens - monitor.token_count)
+
     def get_stats(self) -> dict:
         """Get client statistics."""
         return {
@@ -59,7 +122,10 @@ class BaseLLMClient(ABC):
             "total_tokens": self.total_tokens,
             "total_latency_ms": self.total_latency_ms,
             "avg_latency_ms": self.total_latency_ms / max(1, self.call_count),
-            "avg_tokens_per_call": self.total_tokens / max(1, self.call_count),
+            "avg_tokens_per_call": self.total_tokens / max(1, self.call_count - self.aborted_calls),
+            "aborted_calls": self.aborted_calls,
+            "aborted_output_tokens": self.aborted_output_tokens,
+            "max_output_tokens_saved": self.max_output_tokens_saved,
         }
 
 
@@ -106,6 +172,38 @@ class MockLLMClient(BaseLLMClient):
             metadata={}
         )
 
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        red_flag_criteria: Optional[RedFlagCriteria] = None,
+        **kwargs
+    ) -> LLMResponse:
+        """Stream the mock response word by word through the red-flag monitor."""
+        full = await self.generate(prompt, system_prompt, **kwargs)
+        if red_flag_criteria is None:
+            return full
+
+        async def chunks():
+            for word in full.content.split(" "):
+                yield word + " "
+
+        monitor = StreamingRedFlagMonitor(red_flag_criteria)
+        if not await self._consume_stream(chunks(), monitor):
+            return full
+
+        max_tokens = kwargs.get("max_tokens", self.config.max_tokens)
+        self.total_tokens -= full.token_count  # The simulated call did not complete
+        self._record_abort(monitor, max_tokens)
+        return LLMResponse(
+            content=monitor.text,
+            token_count=monitor.token_count,
+            finish_reason="red_flagged",
+            latency_ms=full.latency_ms,
+            model="mock",
+            metadata={"red_flags": monitor.flags}
+        )
+
 
 class OpenAIClient(BaseLLMClient):
     """OpenAI API client."""
@@ -170,6 +268,83 @@ class OpenAIClient(BaseLLMClient):
             metadata={"provider": "openai"}
         )
 
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        red_flag_criteria: Optional[RedFlagCriteria] = None,
+        **kwargs
+    ) -> LLMResponse:
+        """Stream a response from OpenAI, closing the request on a red flag."""
+        start_time = time.time()
+        self.call_count += 1
+
+        client = self._get_client()
+        max_tokens = kwargs.get("max_tokens", self.config.max_tokens)
+        monitor = StreamingRedFlagMonitor(red_flag_criteria or _unlimited_criteria())
+
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        finish_reason = "unknown"
+        usage = None
+
+        async def chunks(stream):
+            nonlocal finish_reason, usage
+            async for chunk in stream:
+                if chunk.usage:
+                    usage = chunk.usage
+                if chunk.choices:
+                    finish_reason = chunk.choices[0].finish_reason or finish_reason
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        yield delta
+
+        try:
+            stream = await client.chat.completions.create(
+                model=kwargs.get("model", self.config.model),
+                messages=messages,
+                temperature=kwargs.get("temperature", self.config.temperature),
+                max_tokens=max_tokens,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            try:
+                aborted = await self._consume_stream(chunks(stream), monitor)
+            finally:
+                # Closing the stream drops the connection and stops generation
+                await stream.close()
+
+        except Exception as e:
+            logger.error(f"OpenAI API error: {e}")
+            raise
+
+        if aborted:
+            self._record_abort(monitor, max_tokens)
+            finish_reason = "red_flagged"
+            token_count = monitor.token_count  # Estimated output tokens
+        else:
+            token_count = usage.total_tokens if usage else monitor.token_count
+            self.total_tokens += token_count
+
+        latency_ms = (time.time() - start_time) * 1000
+        self.total_latency_ms += latency_ms
+
+        metadata = {"provider": "openai"}
+        if aborted:
+            metadata["red_flags"] = monitor.flags
+
+        return LLMResponse(
+            content=monitor.text,
+            token_count=token_count,
+            finish_reason=finish_reason,
+            latency_ms=latency_ms,
+            model=self.config.model,
+            metadata=metadata
+        )
+
 
 class AnthropicClient(BaseLLMClient):
     """Anthropic API client."""
@@ -229,6 +404,61 @@ class AnthropicClient(BaseLLMClient):
             metadata={"provider": "anthropic"}
         )
 
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        red_flag_criteria: Optional[RedFlagCriteria] = None,
+        **kwargs
+    ) -> LLMResponse:
+        """Stream a response from Anthropic, closing the request on a red flag."""
+        start_time = time.time()
+        self.call_count += 1
+
+        client = self._get_client()
+        max_tokens = kwargs.get("max_tokens", self.config.max_tokens)
+        monitor = StreamingRedFlagMonitor(red_flag_criteria or _unlimited_criteria())
+
+        try:
+            # Leaving the context manager closes the HTTP stream
+            async with client.messages.stream(
+                model=kwargs.get("model", self.config.model),
+                max_tokens=max_tokens,
+                system=system_prompt or "",
+                messages=[{"role": "user", "content": prompt}],
+            ) as stream:
+                aborted = await self._consume_stream(stream.text_stream, monitor)
+                final = None if aborted else await stream.get_final_message()
+
+        except Exception as e:
+            logger.error(f"Anthropic API error: {e}")
+            raise
+
+        if aborted:
+            self._record_abort(monitor, max_tokens)
+            finish_reason = "red_flagged"
+            token_count = monitor.token_count  # Estimated output tokens
+        else:
+            finish_reason = final.stop_reason or "unknown"
+            token_count = final.usage.input_tokens + final.usage.output_tokens
+            self.total_tokens += token_count
+
+        latency_ms = (time.time() - start_time) * 1000
+        self.total_latency_ms += latency_ms
+
+        metadata = {"provider": "anthropic"}
+        if aborted:
+            metadata["red_flags"] = monitor.flags
+
+        return LLMResponse(
+            content=monitor.text,
+            token_count=token_count,
+            finish_reason=finish_reason,
+            latency_ms=latency_ms,
+            model=self.config.model,
+            metadata=metadata
+        )
+
 
 class GoogleClient(BaseLLMClient):
     """Google Gemini API client."""
@@ -294,6 +524,54 @@ class GoogleClient(BaseLLMClient):
         )
 
 
+class LLMMicroagent(Microagent[str]):
+    """
+    Voting microagent that answers a prompt with a streamed LLM call.
+
+    The prompt is ``prompt_template`` formatted with the step context. The
+    response streams through ``red_flag_criteria``; one aborted
+    mid-generation is returned as a ``RedFlaggedResponse``, which voting
+    discards, so a rambling vote costs only the tokens streamed before it
+    tripped.
+    """
+
+    def __init__(
+        self,
+        agent_id: str,
+        llm_client: BaseLLMClient,
+        prompt_template: str,
+        system_prompt: Optional[str] = None,
+        red_flag_criteria: Optional[RedFlagCriteria] = None,
+        temperature: float = 0.1,
+        max_tokens: int = 750
+    ):
+        super().__init__(agent_id=agent_id, temperature=temperature, max_tokens=max_tokens)
+        self.llm_client = llm_client
+        self.prompt_template = prompt_template
+        self.system_prompt = system_prompt
+        self.red_flag_criteria = red_flag_criteria or RedFlagCriteria(
+            max_response_tokens=max_tokens
+        )
+
+    async def execute(self, context: dict[str, Any]) -> Union[str, RedFlaggedResponse]:
+        """Stream one answer, or return the red flags of an aborted one."""
+        self.call_count += 1
+        response = await self.llm_client.generate_stream(
+            self.prompt_template.format(**context),
+            self.system_prompt,
+            red_flag_criteria=self.red_flag_criteria,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens
+        )
+        if response.finish_reason == "red_flagged":
+            self.error_count += 1
+            return RedFlaggedResponse(response.content, response.metadata["red_flags"])
+        return response.content
+
+    def validate_output(self, output: str) -> bool:
+        return isinstance(output, str) and bool(output.strip())
+
+
 def create_llm_client(config: LLMConfig) -> BaseLLMClient:
     """Factory function to create appropriate LLM client."""
     client_map = {
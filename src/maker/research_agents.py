@@ -13,11 +13,11 @@ apply to research: decompose → vote → filter → synthesize.
 
 import asyncio
 from dataclasses import dataclass, field
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 from enum import Enum
 from datetime import datetime
 
-from .core import Microagent, Step, TaskDecomposer, RedFlagCriteria
+from .core import Microagent, Step, StepDescription, TaskDecomposer, RedFlagCriteria
 
 
 class ResearchType(Enum):
@@ -429,17 +429,15 @@ class ResearchDecomposer(TaskDecomposer):
     7. Generate follow-up questions
     """
 
-    def decompose(self, task: dict[str, Any]) -> list[Step]:
-        """Decompose research task into atomic steps."""
+    def iter_steps(self, task: dict[str, Any]) -> Iterator[Step]:
+        """Lazily decompose a research task into steps, in dependency order."""
         query = task.get("query", ResearchQuery(
             query_id="default",
             question=task.get("question", ""),
         ))
 
-        steps = []
-
         # Step 1: Query decomposition
-        steps.append(Step(
+        yield Step(
             step_id=1,
             description="Decompose research question",
             context={
@@ -447,69 +445,83 @@ class ResearchDecomposer(TaskDecomposer):
                 "research_type": query.research_type,
                 "depth": query.depth,
             },
-            dependencies=[]
-        ))
+            dependencies=()
+        )
 
         # Steps 2.x: Source discovery for each sub-query
         # (These will be created dynamically based on step 1 results)
         # For now, assume 5 sub-queries
         for i in range(5):
-            steps.append(Step(
+            yield Step(
                 step_id=100 + i,
-                description=f"Discover sources for sub-query {i+1}",
+                description=StepDescription("Discover sources for sub-query {}", i + 1),
                 context={
                     "source_types": query.source_types,
                     "max_sources": query.required_sources,
                 },
-                dependencies=[1]
-            ))
+                dependencies=(1,)
+            )
 
         # Steps 3.x: Information extraction from sources
         # Assume 3 sources per sub-query = 15 extraction steps
         for i in range(15):
             sub_query_idx = i // 3
-            steps.append(Step(
+            yield Step(
                 step_id=200 + i,
-                description=f"Extract findings from source {i+1}",
+                description=StepDescription("Extract findings from source {}", i + 1),
                 context={},
-                dependencies=[100 + sub_query_idx]
-            ))
+                dependencies=(100 + sub_query_idx,)
+            )
 
         # Steps 4.x: Fact verification for each finding
         for i in range(15):
-            steps.append(Step(
+            yield Step(
                 step_id=300 + i,
-                description=f"Verify finding {i+1}",
+                description=StepDescription("Verify finding {}", i + 1),
                 context={},
-                dependencies=[200 + i]
-            ))
+                dependencies=(200 + i,)
+            )
 
         # Step 5: Synthesis
-        verification_deps = list(range(300, 315))
-        steps.append(Step(
+        verification_deps = range(300, 315)
+        yield Step(
             step_id=400,
             description="Synthesize verified findings",
             context={"original_query": query.question},
             dependencies=verification_deps
-        ))
+        )
 
         # Step 6: Gap identification
-        steps.append(Step(
+        yield Step(
             step_id=500,
             description="Identify research gaps",
             context={},
-            dependencies=[1, 400]
-        ))
+            dependencies=(1, 400)
+        )
 
         # Step 7: Follow-up generation
-        steps.append(Step(
+        yield Step(
             step_id=600,
             description="Generate follow-up questions",
             context={"original_query": query.question},
-            dependencies=[400, 500]
-        ))
+            dependencies=(400, 500)
+        )
 
-        return steps
+    def decompose(self, task: dict[str, Any]) -> list[Step]:
+        """Decompose the task into its full list of steps."""
+        return list(self.iter_steps(task))
+
+    def retain_result(self, step: Step) -> bool:
+        """The decomposition and verification steps only feed later steps."""
+        return not (step.step_id == 1 or 300 <= step.step_id < 400)
+
+    def result_consumers(self, task: dict[str, Any], step: Step) -> Optional[int]:
+        """Step 1 feeds discovery and gaps; each verification feeds synthesis."""
+        if step.step_id == 1:
+            return 6
+        if 300 <= step.step_id < 400:
+            return 1
+        return None
 
     def compose_result(self, steps: list[Step]) -> ResearchResult:
         """Compose research result from completed steps."""
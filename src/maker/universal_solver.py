@@ -38,6 +38,8 @@ from enum import Enum
 import logging
 import math
 
+from .core import VoteTally
+
 logger = logging.getLogger(__name__)
 
 # ============================================================================
@@ -577,8 +579,7 @@ class UniversalVoting:
         Returns: (winner, confidence, metadata)
         """
         votes: list[VoteWithProof] = []
-        value_scores: dict[str, float] = {}
-        value_counts: dict[str, int] = {}
+        value_scores: VoteTally[str] = VoteTally()
         value_map: dict[str, Any] = {}
 
         proven_count = 0
@@ -599,27 +600,22 @@ class UniversalVoting:
                 weight *= 2.0  # Proofs count double
                 proven_count += 1
 
-            value_scores[v_hash] = value_scores.get(v_hash, 0) + weight
-            value_counts[v_hash] = value_counts.get(v_hash, 0) + 1
+            value_scores.add(v_hash, weight)
 
-            # Check for winner
+            # Check for winner (leader/runner-up tracked incrementally)
             if value_scores:
-                sorted_scores = sorted(
-                    value_scores.items(),
-                    key=lambda x: x[1],
-                    reverse=True
-                )
+                leader_hash = value_scores.leader
+                leader_score = value_scores.leader_count
 
-                if len(sorted_scores) >= 2:
-                    leader_hash, leader_score = sorted_scores[0]
-                    _, second_score = sorted_scores[1]
+                if len(value_scores) >= 2:
+                    second_score = value_scores.runner_up_count
 
                     if leader_score - second_score >= self.k:
                         # Winner!
                         winner = value_map[leader_hash]
                         confidence = self._calculate_confidence(
                             leader_score,
-                            sum(value_scores.values()),
+                            value_scores.total,
                             proven_count,
                             len(votes)
                         )
@@ -630,8 +626,7 @@ class UniversalVoting:
                             "margin": leader_score - second_score,
                         }
 
-                elif len(sorted_scores) == 1:
-                    leader_hash, leader_score = sorted_scores[0]
+                elif len(value_scores) == 1:
                     if leader_score >= self.k:
                         winner = value_map[leader_hash]
                         confidence = self._calculate_confidence(
@@ -644,7 +639,7 @@ class UniversalVoting:
 
         # No clear winner - return best guess
         if value_scores:
-            best_hash = max(value_scores, key=value_scores.get)
+            best_hash = value_scores.leader
             return value_map[best_hash], 0.5, {
                 "votes": len(votes),
                 "status": "no_consensus"
@@ -5,6 +5,7 @@ Tests the core functionality, voting algorithm, and entertainment agents.
 """
 
 import asyncio
+import random
 import pytest
 from typing import Any
 
@@ -14,16 +15,24 @@ sys.path.insert(0, '/home/user/vibecast/src')
 from maker.core import (
     Vote,
     VoteStatus,
+    VoteRetention,
     VotingResult,
+    VoteTally,
+    VoteCanonicalizer,
     RedFlagCriteria,
+    StreamingRedFlagMonitor,
     FirstToAheadByKVoting,
+    SequentialVoting,
+    Microagent,
     Step,
+    TaskDecomposer,
 )
 from maker.entertainment_agents import (
     ContentType,
     MoodCategory,
     UserPreferences,
     ContentItem,
+    RecommendationResult,
     MoodAnalyzerAgent,
     GenreMatcherAgent,
     DurationFilterAgent,
@@ -77,6 +86,152 @@ class TestRedFlagCriteria:
 
         assert any("forbidden_pattern" in f for f in flags)
 
+    def test_overlapping_patterns_all_reported(self):
+        """Test that every matching pattern is reported, case-insensitively."""
+        criteria = RedFlagCriteria(forbidden_patterns=["error", "ERROR:", "exception"])
+
+        flags = criteria.check("Error: timed out")
+
+        assert flags == ["forbidden_pattern:error", "forbidden_pattern:ERROR:"]
+
+        criteria.forbidden_patterns.append("timed")
+        assert "forbidden_pattern:timed" in criteria.check("Error: timed out")
+
+    def test_typed_response_checked_by_field(self):
+        """Test that dataclass lists are scanned field by field."""
+        criteria = RedFlagCriteria(max_response_length=60, forbidden_patterns=["i cannot"])
+
+        clean = [RecommendationResult("c1", 0.7, "Strong on: rating", 0.5, {"rating": 0.8})]
+        flagged = [RecommendationResult("c2", 0.1, "I cannot rank this", 0.5, {})]
+
+        assert criteria.check(clean) == []
+        assert criteria.check(flagged) == ["forbidden_pattern:i cannot"]
+        assert any("response_too_long" in f for f in criteria.check(clean * 5))
+
+    def test_self_referencing_response_terminates(self):
+        """Test that cyclic responses are walked once and long walks stop early."""
+        criteria = RedFlagCriteria(max_response_length=20)
+
+        cyclic = ["ok"]
+        cyclic.append(cyclic)
+        assert criteria.check(cyclic) == []
+
+        class Loud:
+            calls = 0
+
+            def __str__(self):
+                Loud.calls += 1
+                return "x" * 50
+
+        flags = criteria.check([Loud() for _ in range(100)])
+        assert flags == ["response_too_long:50"]
+        assert Loud.calls == 1
+
+
+class TestStreamingRedFlags:
+    """Tests for red-flag checks on streamed responses."""
+
+    def test_pattern_split_across_chunks(self):
+        """Test that a pattern spanning two chunks trips the monitor."""
+        monitor = StreamingRedFlagMonitor(RedFlagCriteria(forbidden_patterns=["i don't know"]))
+
+        assert monitor.feed("Honestly, I do") == []
+        assert monitor.feed("n't know which") == ["forbidden_pattern:i don't know"]
+        assert monitor.tripped
+
+    def test_token_limit(self):
+        """Test that the token estimate trips the monitor mid-stream."""
+        monitor = StreamingRedFlagMonitor(RedFlagCriteria(max_response_tokens=10))
+
+        assert monitor.feed("x" * 40) == []
+        assert monitor.feed("y") == ["too_many_tokens:11"]
+
+    @pytest.mark.asyncio
+    async def test_mock_client_aborts_and_reports_savings(self):
+        """Test that a rambling response is cut short and savings recorded."""
+        from maker.config import LLMConfig, LLMProvider
+        from maker.llm_client import MockLLMClient
+
+        client = MockLLMClient(
+            LLMConfig(provider=LLMProvider.LOCAL, max_tokens=750),
+            responses={"ramble": "word " * 1000}
+        )
+        criteria = RedFlagCriteria(max_response_tokens=100)
+
+        response = await client.generate_stream("please ramble", red_flag_criteria=criteria)
+
+        assert response.finish_reason == "red_flagged"
+        assert response.token_count <= 102
+        stats = client.get_stats()
+        assert stats["aborted_calls"] == 1
+        assert stats["aborted_output_tokens"] == response.token_count
+        assert stats["max_output_tokens_saved"] == 750 - response.token_count
+        assert stats["total_tokens"] == 0  # Only completed calls report usage
+
+    @pytest.mark.asyncio
+    async def test_llm_agent_votes_drop_aborted_streams(self):
+        """Test that votes aborted mid-stream are red-flagged, not counted."""
+        from maker.config import LLMConfig, LLMProvider
+        from maker.llm_client import LLMMicroagent, MockLLMClient
+
+        class AlternatingClient(MockLLMClient):
+            async def generate(self, prompt, system_prompt=None, **kwargs):
+                ramble = self.call_count % 2 == 0  # Every other call rambles
+                self.default_response = "word " * 1000 if ramble else "Paris"
+                return await super().generate(prompt, system_prompt, **kwargs)
+
+        client = AlternatingClient(LLMConfig(provider=LLMProvider.LOCAL))
+        agent = LLMMicroagent("qa", client, "Capital of {country}?", max_tokens=100)
+        voting = FirstToAheadByKVoting(k=2, parallel_votes=1)
+
+        async def vote():
+            return await agent.execute({"country": "France"})
+
+        result = await voting.run_voting(vote)
+
+        assert result.status == VoteStatus.DECIDED
+        assert result.winner == "Paris"
+        assert result.total_votes == 2
+        assert client.aborted_calls == agent.error_count == 2
+        assert client.get_stats()["total_tokens"] == 2  # The two "Paris" answers
+
+    @pytest.mark.asyncio
+    async def test_unchecked_stream_is_never_aborted(self):
+        """Test that a stream without criteria is not cut on estimated tokens."""
+        from types import SimpleNamespace
+        from maker.config import LLMConfig, LLMProvider
+        from maker.llm_client import AnthropicClient
+
+        text = "x" * 500  # Estimates to 125 tokens, over max_tokens
+
+        class FakeStream:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            @property
+            async def text_stream(self):
+                for i in range(0, len(text), 50):
+                    yield text[i:i + 50]
+
+            async def get_final_message(self):
+                return SimpleNamespace(
+                    stop_reason="end_turn",
+                    usage=SimpleNamespace(input_tokens=5, output_tokens=100)
+                )
+
+        client = AnthropicClient(LLMConfig(provider=LLMProvider.ANTHROPIC, max_tokens=100))
+        client._client = SimpleNamespace(messages=SimpleNamespace(stream=lambda **kwargs: FakeStream()))
+
+        response = await client.generate_stream("describe")
+
+        assert response.finish_reason == "end_turn"
+        assert response.content == text
+        assert response.token_count == 105
+        assert client.get_stats()["aborted_calls"] == 0
+
 
 class TestFirstToAheadByKVoting:
     """Tests for voting algorithm."""
@@ -133,6 +288,365 @@ class TestFirstToAheadByKVoting:
         # Should still converge on valid responses
         assert result.winner == "valid"
 
+    @pytest.mark.asyncio
+    async def test_parallel_votes_dispatched_concurrently(self):
+        """Test that a batch of votes is in flight at the same time."""
+        voting = FirstToAheadByKVoting(k=3, parallel_votes=3)
+
+        state = {"in_flight": 0, "peak": 0}
+
+        async def vote_fn():
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            await asyncio.sleep(0.01)
+            state["in_flight"] -= 1
+            return "movie_a"
+
+        result = await voting.run_voting(vote_fn)
+
+        assert result.status == VoteStatus.DECIDED
+        assert result.winner == "movie_a"
+        assert state["peak"] == 3
+
+    @pytest.mark.asyncio
+    async def test_parallel_in_flight_votes_cancelled(self):
+        """Test that slow votes are cancelled once a winner is decided."""
+        voting = FirstToAheadByKVoting(k=2, parallel_votes=4, adaptive_batching=False)
+
+        counter = {"count": 0, "cancelled": 0}
+
+        async def vote_fn():
+            counter["count"] += 1
+            if counter["count"] > 2:
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    counter["cancelled"] += 1
+                    raise
+            return "fast"
+
+        result = await voting.run_voting(vote_fn)
+
+        assert result.winner == "fast"
+        assert result.total_votes == 2
+        assert counter["cancelled"] == 2
+        assert result.wasted_votes == 2
+
+    def test_adaptive_batch_sizing(self):
+        """Test that batch size follows the leader/runner-up gap."""
+        voting = FirstToAheadByKVoting(k=3, parallel_votes=8, vote_accuracy=0.9)
+
+        # Leader already k-1 ahead: one agreeing vote decides the step
+        assert voting._next_batch_size(VoteTally.from_counts({"A": 2}), remaining=100) == 1
+
+        # Split vote: use the full parallel budget
+        assert voting._next_batch_size(VoteTally.from_counts({"A": 4, "B": 4}), remaining=100) == 8
+
+        # Never dispatch more than the remaining rounds
+        assert voting._next_batch_size(VoteTally.from_counts({"A": 4, "B": 4}), remaining=2) == 2
+
+    @pytest.mark.asyncio
+    async def test_hung_votes_dropped_by_vote_timeout(self):
+        """Test that a hung vote call is dropped instead of blocking."""
+        voting = FirstToAheadByKVoting(k=2, parallel_votes=1, vote_timeout_ms=20)
+
+        counter = {"count": 0}
+
+        async def vote_fn():
+            counter["count"] += 1
+            if counter["count"] == 1:
+                await asyncio.sleep(10)  # Stuck provider call
+            return "A"
+
+        result = await voting.run_voting(vote_fn)
+
+        assert result.status == VoteStatus.DECIDED
+        assert result.winner == "A"
+        assert result.timed_out_votes == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("parallel_votes", [1, 4])
+    async def test_step_timeout_returns_best_so_far(self, parallel_votes):
+        """Test that the step budget ends voting with the plurality."""
+        voting = FirstToAheadByKVoting(
+            k=3, parallel_votes=parallel_votes, adaptive_batching=False,
+            step_timeout_ms=100
+        )
+
+        counter = {"count": 0}
+
+        async def vote_fn():
+            counter["count"] += 1
+            if counter["count"] == 1:
+                return "A"
+            await asyncio.sleep(10)
+            return "B"
+
+        result = await asyncio.wait_for(voting.run_voting(vote_fn), timeout=2)
+
+        assert result.status == VoteStatus.TIMEOUT
+        assert result.winner == "A"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("retention,kept", [
+        (VoteRetention.FULL, 5),
+        (VoteRetention.SAMPLED, 2),
+        (VoteRetention.COUNTS_ONLY, 0),
+    ])
+    async def test_vote_retention(self, retention, kept):
+        """Test that retention bounds the stored Vote records."""
+        voting = FirstToAheadByKVoting(
+            k=5, parallel_votes=1, retention=retention, vote_sample_size=2
+        )
+
+        async def vote_fn():
+            return "A"
+
+        result = await voting.run_voting(vote_fn)
+
+        assert result.winner == "A"
+        assert result.total_votes == 5
+        assert result.vote_counts == {"A": 5}
+        assert len(result.all_votes) == kept
+
+    def test_vote_uses_slots(self):
+        """Test that Vote records have no per-instance __dict__."""
+        vote = Vote(value="A", agent_id="agent")
+
+        assert not hasattr(vote, "__dict__")
+        assert vote.is_valid
+        # No per-vote metadata dict or red-flag list unless populated
+        assert vote.metadata is None
+        assert vote.red_flags is Vote(value="B", agent_id="agent").red_flags
+        assert not Vote(value="A", agent_id="agent", red_flags=("too_long",)).is_valid
+
+    @pytest.mark.asyncio
+    async def test_retained_votes_allocate_only_the_record(self):
+        """Test that a fully retained vote costs its slotted record, not more."""
+        import tracemalloc
+
+        voting = FirstToAheadByKVoting(k=2000, max_rounds=2000, parallel_votes=1)
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            result = await voting.run_voting(lambda: "A")
+            used = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+
+        assert len(result.all_votes) == 2000
+        # A slotted Vote is ~80 bytes; a dict and a list would add ~120 more
+        assert used / 2000 < 140
+
+
+class TestVoteTally:
+    """Tests for incremental leader/runner-up tracking."""
+
+    def test_matches_full_sort(self):
+        """Test that the tracked top two match a full sort after every vote."""
+        rng = random.Random(7)
+        tally = VoteTally()
+
+        for _ in range(500):
+            tally.add(rng.randrange(20))
+            ranked = sorted(tally.counts.values(), reverse=True)
+            assert tally.leader_count == ranked[0]
+            assert tally.runner_up_count == (ranked[1] if len(ranked) > 1 else 0)
+            assert tally.counts[tally.leader] == ranked[0]
+
+    def test_single_candidate_margin(self):
+        """Test that a lone candidate's margin is its own count."""
+        tally = VoteTally.from_counts({"A": 3})
+
+        assert tally.leader == "A"
+        assert tally.margin == 3
+
+    def test_winner_check_microbenchmark(self):
+        """Test that the winner-check microbenchmark reports both engines."""
+        from maker.benchmark import benchmark_winner_check
+
+        stats = benchmark_winner_check(num_candidates=200, num_votes=50)
+
+        assert stats["num_candidates"] == 200
+        assert stats["vote_tally_ms"] >= 0
+        assert stats["counter_most_common_ms"] >= 0
+
+
+class TestVoteCanonicalizer:
+    """Tests for canonical vote keys."""
+
+    def test_equivalent_values_share_key(self):
+        """Test that order-insensitive and float-noise variants collapse."""
+        canon = VoteCanonicalizer(float_precision=6)
+
+        assert canon.key({"b", "a"}) == canon.key({"a", "b"})
+        assert canon.key({"x": 1, "y": 2}) == canon.key({"y": 2, "x": 1})
+        assert canon.key(0.1 + 0.2) == canon.key(0.3)
+        # Ranked lists stay order-sensitive
+        assert canon.key(["a", "b"]) != canon.key(["b", "a"])
+
+    def test_mutable_dataclass_is_hashable(self):
+        """Test that mutable dataclass votes get a stable hashable key."""
+        canon = VoteCanonicalizer()
+
+        r1 = RecommendationResult("c1", 0.7000000001, "Strong on: rating", 0.5, {"rating": 0.8})
+        r2 = RecommendationResult("c1", 0.7, "Strong on: rating", 0.5, {"rating": 0.8})
+
+        key = canon.key(r1)
+        hash(key)
+        assert key == canon.key(r2)
+
+    def test_custom_handler(self):
+        """Test that custom handlers can be plugged in."""
+        canon = VoteCanonicalizer()
+        canon.register(str, lambda s: s.strip().lower())
+
+        assert canon.key("  Comedy") == canon.key("comedy")
+
+    @pytest.mark.asyncio
+    async def test_list_votes_reach_consensus(self):
+        """Test that unhashable list votes are counted and returned intact."""
+        voting = FirstToAheadByKVoting(k=2)
+
+        async def vote_fn():
+            return ["comedy", "romance"]
+
+        result = await voting.run_voting(vote_fn)
+
+        assert result.status == VoteStatus.DECIDED
+        assert result.winner == ["comedy", "romance"]
+
+
+class TestSequentialVoting:
+    """Tests for SPRT-based sequential voting."""
+
+    def test_reduces_to_ahead_by_k(self):
+        """Test that a single wrong answer gives the ahead-by-k margin."""
+        voting = SequentialVoting(error_rate=1e-3, vote_accuracy=0.8)
+
+        assert voting.k == 5
+        assert voting._check_winner(VoteTally.from_counts({"A": 6, "B": 2})) == (None, 0)
+        assert voting._check_winner(VoteTally.from_counts({"A": 7, "B": 2})) == ("A", 5)
+
+    def test_rejects_uninformative_votes(self):
+        """Test that votes weaker than chance are rejected."""
+        with pytest.raises(ValueError):
+            SequentialVoting(vote_accuracy=0.4, wrong_answer_spread=1.0)
+
+    @pytest.mark.asyncio
+    async def test_scattered_errors_decide_sooner(self):
+        """Test that spread-out wrong answers need a smaller margin."""
+        voting = SequentialVoting(
+            error_rate=1e-3, vote_accuracy=0.8, wrong_answer_spread=4
+        )
+        votes = iter(["A", "B", "A", "C", "A", "A", "A", "A", "A"])
+
+        result = await voting.run_voting(lambda: next(votes))
+
+        assert result.status == VoteStatus.DECIDED
+        assert result.winner == "A"
+        assert result.total_votes < 9
+
+    def test_votes_per_step_benchmark(self):
+        """Test that both engines are compared at a calibrated equal error."""
+        from maker.benchmark import benchmark_sequential_voting
+
+        stats = benchmark_sequential_voting(
+            error_rate=0.02, num_steps=2_000, wrong_answer_spread=4
+        )
+
+        for engine in ("ahead_by_k", "sprt"):
+            assert stats[engine]["empirical_error_rate"] <= 0.02
+            # The next-cheaper setting misses the target
+            assert stats[engine]["sweep"][-2]["empirical_error_rate"] > 0.02
+        # Both stop on a vote margin, so at equal error they cost the same
+        assert stats["sprt"]["equivalent_k"] == stats["ahead_by_k"]["k"]
+        assert stats["vote_savings"] == 0
+        # The analytic SPRT setting for 2% needs a smaller margin than a k
+        # sized for agreeing errors
+        assert SequentialVoting(
+            error_rate=0.02, vote_accuracy=0.8, wrong_answer_spread=4
+        ).k < SequentialVoting(error_rate=0.02, vote_accuracy=0.8).k
+
+
+class TestDecidedResultCache:
+    """Tests for the cross-request decided-result cache."""
+
+    @staticmethod
+    def _decided(winner):
+        return VotingResult(
+            winner=winner, status=VoteStatus.DECIDED, vote_counts={winner: 3},
+            total_votes=3, rounds_taken=3, winning_margin=3, all_votes=[],
+            duration_ms=1.0
+        )
+
+    def test_context_fingerprint_is_order_insensitive(self):
+        """Test that equal contexts share a key and agents do not."""
+        from maker.cache import DecidedResultCache
+
+        cache = DecidedResultCache()
+
+        key = cache.key("genre_matcher", {"mood": "happy", "genres": {"comedy"}})
+        assert key == cache.key("genre_matcher", {"genres": {"comedy"}, "mood": "happy"})
+        assert key != cache.key("mood_analyzer", {"mood": "happy", "genres": {"comedy"}})
+
+    def test_lru_and_ttl_eviction(self):
+        """Test size-bounded LRU eviction and TTL expiry."""
+        from maker.cache import DecidedResultCache
+
+        now = [0.0]
+        cache = DecidedResultCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+        cache.put(("a", "1"), self._decided("A"))
+        cache.put(("a", "2"), self._decided("B"))
+        assert cache.get(("a", "1")).winner == "A"  # 1 is now most recent
+        cache.put(("a", "3"), self._decided("C"))
+
+        assert cache.get(("a", "2")) is None
+        assert cache.evictions == 1
+
+        now[0] = 11.0
+        assert cache.get(("a", "1")) is None
+        assert cache.get_stats()["expirations"] == 1
+
+    def test_only_decided_results_cached(self):
+        """Test that timeouts are never replayed."""
+        from maker.cache import DecidedResultCache
+
+        cache = DecidedResultCache()
+        result = self._decided("A")
+        result.status = VoteStatus.TIMEOUT
+        cache.put(("a", "1"), result)
+
+        assert len(cache) == 0
+
+    def test_cached_winners_are_not_shared(self):
+        """Test that mutating a stored or returned winner never leaks."""
+        from maker.cache import DecidedResultCache
+
+        cache = DecidedResultCache()
+        result = self._decided("comedy")
+        result.winner = ["comedy"]
+        cache.put(("a", "1"), result)
+        result.winner.append("stored")
+        cache.get(("a", "1")).winner.append("returned")
+
+        assert cache.get(("a", "1")).winner == ["comedy"]
+
+    @pytest.mark.asyncio
+    async def test_discovery_results_independent_across_requests(self):
+        """Test that a replayed request does not see an earlier caller's edits."""
+        from maker.api import VibecastMAKER, DiscoveryRequest
+
+        maker = VibecastMAKER(config=DEVELOPMENT_CONFIG)
+        request = DiscoveryRequest(user_input="something funny", candidates=_random_catalog(5))
+
+        first = await maker.discover(request)
+        first.matched_genres.append("HACKED")
+        second = await maker.discover(request)
+
+        assert maker.orchestrator.result_cache.hits > 0
+        assert "HACKED" not in second.matched_genres
+
 
 class TestMoodAnalyzer:
     """Tests for mood analysis agent."""
@@ -287,117 +801,1431 @@ class TestContentScorer:
         assert result1.factors["genre_match"] > result2.factors["genre_match"]
 
 
-class TestTaskDecomposition:
-    """Tests for task decomposition."""
-
-    def test_decomposition_creates_steps(self):
-        """Test that decomposition creates proper steps."""
-        decomposer = EntertainmentDiscoveryDecomposer()
+def _random_catalog(count: int, seed: int = 7) -> list[ContentItem]:
+    """Varied candidates: duplicate genres, tied ratings, out-of-range durations."""
+    rng = random.Random(seed)
+    genres = ["action", "comedy", "drama", "horror", "romance", "sci-fi", "documentary"]
+    return [
+        ContentItem(
+            content_id=f"c{i}",
+            title=f"Content {i}",
+            content_type=ContentType.MOVIE,
+            genres=[rng.choice(genres) for _ in range(rng.randint(0, 3))],
+            duration_minutes=rng.randint(0, 240),
+            release_year=rng.randint(1960, 2025),
+            rating=rng.choice([5.0, 6.5, 7.0, 7.3, 8.1, 9.9]),
+            platform=rng.choice(["netflix", "hulu", "max"])
+        )
+        for i in range(count)
+    ]
 
-        candidates = [
-            ContentItem(
-                content_id=f"c{i}",
-                title=f"Content {i}",
-                content_type=ContentType.MOVIE,
-                genres=["drama"],
-                duration_minutes=100,
-                release_year=2024,
-                rating=7.0,
-                platform="netflix"
-            )
-            for i in range(3)
-        ]
 
-        task = {
-            "user_input": "something fun",
-            "candidates": candidates,
-            "top_k": 2
-        }
+class TestBatchScoring:
+    """Tests for numpy block scoring against the per-item scorer."""
 
-        steps = decomposer.decompose(task)
+    CONTEXT = {
+        "preferences": UserPreferences(
+            available_platforms=["netflix", "max"], watch_history=["c3", "c10"]
+        ),
+        "matched_genres": ["comedy", "romance", "comedy", "musical"],
+        "duration_range": (80, 150),
+    }
 
-        # Should have: mood, genres, duration, 3 scorings, 1 ranking, 2 explanations
-        assert len(steps) >= 8
+    @pytest.mark.asyncio
+    async def test_scores_match_per_item_exactly(self):
+        """Test that every factor, score, confidence and reasoning is identical."""
+        pytest.importorskip("numpy")
+        from maker.batch_scoring import BatchContentScorerAgent
 
-        # Check step IDs are unique
-        step_ids = [s.step_id for s in steps]
-        assert len(step_ids) == len(set(step_ids))
+        catalog = _random_catalog(300)
+        scorer = ContentScorerAgent()
+        expected = [await scorer.execute({**self.CONTEXT, "content": item}) for item in catalog]
 
-    def test_step_dependencies_valid(self):
-        """Test that step dependencies reference valid steps."""
-        decomposer = EntertainmentDiscoveryDecomposer()
+        block = await BatchContentScorerAgent().execute({**self.CONTEXT, "candidates": catalog})
 
-        task = {
-            "user_input": "test",
-            "candidates": [],
-            "top_k": 3
-        }
+        assert block.to_results() == expected
 
-        steps = decomposer.decompose(task)
-        step_ids = {s.step_id for s in steps}
+    @pytest.mark.asyncio
+    async def test_ranking_matches_per_item(self):
+        """Test that block ranking keeps the stable order of tied scores."""
+        pytest.importorskip("numpy")
+        from maker.batch_scoring import BatchContentScorerAgent
+        from maker.entertainment_agents import ContentRankerAgent
 
-        for step in steps:
-            for dep in step.dependencies:
-                assert dep in step_ids, f"Step {step.step_id} has invalid dependency {dep}"
+        catalog = _random_catalog(300) * 2  # Every score tied at least twice
+        scorer = ContentScorerAgent()
+        scored = [await scorer.execute({**self.CONTEXT, "content": item}) for item in catalog]
+        block = await BatchContentScorerAgent().execute({**self.CONTEXT, "candidates": catalog})
+        ranker = ContentRankerAgent(top_k=50)
 
+        expected = await ranker.execute({"scored_items": scored})
 
-class TestVotingOptimizer:
-    """Tests for voting optimization."""
+        assert await ranker.execute({"step_100_result": block}) == expected
+        assert block.ranked_ids(50) == expected
 
-    def test_optimal_k_calculation(self):
-        """Test optimal k calculation."""
-        optimizer = VotingOptimizer(target_success_rate=0.99)
+    @pytest.mark.asyncio
+    async def test_discovery_with_score_block(self):
+        """Test that a single score block step gives the per-item recommendations."""
+        pytest.importorskip("numpy")
+        from dataclasses import replace
+        from maker.api import VibecastMAKER, DiscoveryRequest
 
-        # High accuracy needs lower k
-        k_high = optimizer.calculate_optimal_k(0.95, 100)
+        request = DiscoveryRequest(user_input="something funny", candidates=_random_catalog(40))
 
-        # Low accuracy needs higher k
-        k_low = optimizer.calculate_optimal_k(0.7, 100)
+        per_item = await VibecastMAKER(config=DEVELOPMENT_CONFIG).discover(request)
+        batched = await VibecastMAKER(
+            config=replace(DEVELOPMENT_CONFIG, batch_scoring=True)
+        ).discover(request)
 
-        assert k_low > k_high
+        assert batched.success
+        assert batched.recommendations == per_item.recommendations
+        assert batched.explanations == per_item.explanations
+        assert batched.stats["total_steps"] == per_item.stats["total_steps"] - 39
 
-    def test_cost_estimation(self):
-        """Test cost estimation."""
-        optimizer = VotingOptimizer()
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("count", [100, 500])
+    async def test_score_block_passes_red_flags_at_scale(self, count):
+        """Test that a block's size does not red-flag it or coalesce explanations."""
+        pytest.importorskip("numpy")
+        from dataclasses import replace
+        from maker.api import VibecastMAKER, DiscoveryRequest
+        from maker.batch_scoring import BatchContentScorerAgent
+        from maker.entertainment_agents import ENTERTAINMENT_RED_FLAG_CRITERIA
+
+        request = DiscoveryRequest(user_input="something funny", candidates=_random_catalog(count))
+
+        per_item = await VibecastMAKER(config=DEVELOPMENT_CONFIG).discover(request)
+        maker = VibecastMAKER(config=replace(DEVELOPMENT_CONFIG, batch_scoring=True))
+        batched = await maker.discover(request)
+
+        assert batched.recommendations and batched.recommendations == per_item.recommendations
+        assert len(batched.explanations) == request.top_k
+        assert batched.stats["red_flagged_votes"] == 0
+        assert batched.stats["coalesced_steps"] == 0
+
+        block = await BatchContentScorerAgent().execute({**self.CONTEXT, "candidates": request.candidates})
+        assert ENTERTAINMENT_RED_FLAG_CRITERIA.check(block) == []
+        canonicalizer = VoteCanonicalizer()
+        rescored = await BatchContentScorerAgent().execute({**self.CONTEXT, "candidates": request.candidates})
+        assert canonicalizer.key(block) == canonicalizer.key(rescored)
+        rescored.scores[-1] += 0.5
+        assert canonicalizer.key(block) != canonicalizer.key(rescored)
+
+
+class TestTopKRanking:
+    """Tests for partial-selection ranking against a full stable sort."""
+
+    @staticmethod
+    def _full_sort(results, top_k, demoted=frozenset()):
+        ranked = sorted(results, key=lambda r: (r.score, r.confidence), reverse=True)
+        ranked = [r for r in ranked if r.content_id not in demoted] + \
+            [r for r in ranked if r.content_id in demoted]
+        return [r.content_id for r in ranked[:top_k]]
+
+    @staticmethod
+    def _tied_results(count: int) -> list[RecommendationResult]:
+        rng = random.Random(3)
+        return [
+            RecommendationResult(
+                content_id=f"c{i}",
+                score=rng.choice([0.2, 0.5, 0.5, 0.8]),
+                reasoning="",
+                confidence=rng.choice([0.3, 0.3, 0.9])
+            )
+            for i in range(count)
+        ]
 
-        cost = optimizer.estimate_cost(
-            k=3,
-            per_step_accuracy=0.9,
-            total_steps=100,
-            cost_per_vote=0.001
+    @pytest.mark.parametrize("top_k", [0, 1, 5, 50, 500])
+    def test_accumulator_matches_stable_sort(self, top_k):
+        """Test that incremental top-k keeps the full sort's tie order."""
+        from maker.entertainment_agents import TopKAccumulator
+
+        results = self._tied_results(300)
+        demoted = frozenset(f"c{i}" for i in range(0, 300, 7))
+
+        for ids in (frozenset(), demoted):
+            accumulator = TopKAccumulator(top_k, ids)
+            for result in results:
+                accumulator.add(result)
+            assert accumulator.ranked_ids() == self._full_sort(results, top_k, ids)
+
+            batched = TopKAccumulator(top_k, ids)
+            batched.extend(results[:100])
+            batched.add(results[100])
+            batched.extend(results[101:])
+            assert batched.ranked_ids() == accumulator.ranked_ids()
+
+    @pytest.mark.parametrize("top_k", [0, 1, 5, 50, 500])
+    def test_block_argpartition_matches_stable_sort(self, top_k):
+        """Test that score-block selection keeps the full sort's tie order."""
+        np = pytest.importorskip("numpy")
+        from maker.batch_scoring import ScoreBlock
+        from maker.entertainment_agents import TopKAccumulator
+
+        results = self._tied_results(300)
+        block = ScoreBlock(
+            content_ids=np.array([r.content_id for r in results]),
+            scores=np.array([r.score for r in results]),
+            confidences=np.array([r.confidence for r in results]),
+            factors={}
         )
+        demoted = frozenset(f"c{i}" for i in range(0, 300, 7))
 
-        assert "expected_cost" in cost
-        assert cost["expected_cost"] > 0
-        assert cost["best_case_cost"] <= cost["expected_cost"]
+        for ids in (frozenset(), demoted):
+            assert block.ranked_ids(top_k, ids) == self._full_sort(results, top_k, ids)
+            accumulator = TopKAccumulator(top_k, ids)
+            accumulator.add(results[0])  # Mixed with a streamed result
+            accumulator.add_block(block)
+            assert accumulator.ranked_ids() == self._full_sort([results[0]] + results, top_k, ids)
 
-    def test_model_recommendation(self):
-        """Test model recommendation."""
-        optimizer = VotingOptimizer()
+    @pytest.mark.asyncio
+    async def test_ranker_uses_dependency_results(self):
+        """Test that the ranker selects from per-step scores in dependency order."""
+        from maker.entertainment_agents import ContentRankerAgent
 
-        accuracy = {"gpt-4": 0.98, "gpt-4o-mini": 0.92, "gpt-3.5": 0.85}
-        costs = {"gpt-4": 0.03, "gpt-4o-mini": 0.001, "gpt-3.5": 0.0005}
+        results = self._tied_results(40)
+        context = {f"step_{100 + i}_result": r for i, r in enumerate(results)}
+        context["top_k"] = 5
 
-        rec = optimizer.recommend_model(accuracy, costs, total_steps=100)
+        ranked = await ContentRankerAgent(top_k=5).execute(context)
 
-        assert rec["recommended_model"] is not None
-        # Cheaper models often win on reliability-per-dollar
-        assert rec["recommended_model"] in ["gpt-4o-mini", "gpt-3.5"]
+        assert ranked == self._full_sort(results, 5)
 
 
-class TestIntegration:
-    """Integration tests."""
+    @pytest.mark.parametrize("top_k", [1, 5, 50])
+    def test_completion_order_does_not_change_ranking(self, top_k):
+        """Test that folding scores in any order keeps the dependency tie order."""
+        from maker.entertainment_agents import ContentRankerAgent
 
-    @pytest.mark.asyncio
-    async def test_full_pipeline_mock(self):
-        """Test full recommendation pipeline with mock data."""
-        from maker.api import VibecastMAKER, DiscoveryRequest
+        results = self._tied_results(300)
+        ranker = ContentRankerAgent(top_k=top_k)
+        rank_step = Step(200, "rank", {}, range(10_000, 10_300))
+        finished = [Step(10_000 + i, "score", {}, result=r) for i, r in enumerate(results)]
+        random.Random(5).shuffle(finished)
 
-        # Use development config for testing
-        engine = VibecastMAKER(config=DEVELOPMENT_CONFIG)
+        state = None
+        for dependency in finished:
+            state = ranker.fold_result(rank_step, state, dependency)
 
-        candidates = [
-            ContentItem(
+        assert state.ranked_ids() == self._full_sort(results, top_k)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("lookahead", [None, 8])
+    async def test_ranker_folds_scores_as_steps_finish(self, lookahead):
+        """Test that the orchestrator feeds scores to the ranker before it runs."""
+        from maker.core import MAKEROrchestrator
+        from maker.entertainment_agents import (
+            ContentRankerAgent, ContentScorerAgent, GenreMatcherAgent,
+            MoodAnalyzerAgent, DurationFilterAgent,
+        )
+
+        decomposer = EntertainmentDiscoveryDecomposer()
+        candidates = _random_catalog(60)
+
+        class RecordingRanker(ContentRankerAgent):
+            def __init__(self):
+                super().__init__(top_k=5)
+                self.folded_before_run = 0
+                self.contexts = []
+
+            def fold_result(self, step, state, dependency):
+                self.folded_before_run += 1
+                return super().fold_result(step, state, dependency)
+
+            async def execute(self, context):
+                self.contexts.append(context)
+                return await super().execute(context)
+
+        def select(step):
+            if step.step_id == decomposer.RANK_STEP_ID:
+                return "content_ranker"
+            if decomposer.is_score_step(step.step_id):
+                return "content_scorer"
+            return {1: "mood_analyzer", 2: "genre_matcher", 3: "duration_filter"}.get(
+                step.step_id, "content_scorer"
+            )
+
+        class OnePassRanker(RecordingRanker):
+            incremental = False
+
+        async def recommend(ranker):
+            orchestrator = MAKEROrchestrator(
+                decomposer, max_concurrent_steps=4, decomposition_lookahead=lookahead
+            )
+            for agent in (MoodAnalyzerAgent(), GenreMatcherAgent(), DurationFilterAgent(),
+                          ContentScorerAgent(), ranker):
+                orchestrator.register_agent(agent)
+            task = {"user_input": "something funny", "candidates": candidates, "top_k": 0}
+            result = await orchestrator.execute_task(task, select)
+            return result["result"]["recommendations"]
+
+        ranker = RecordingRanker()
+        folded = await recommend(ranker)
+
+        assert ranker.folded_before_run == 60
+        assert not any(key.startswith("step_") for key in ranker.contexts[0])
+        assert len(folded) == 5
+        assert folded == await recommend(OnePassRanker())
+
+class TestContentCatalog:
+    """Tests for the columnar, memory-mapped content catalog."""
+
+    @staticmethod
+    def _catalog_items(count: int) -> list[ContentItem]:
+        items = _random_catalog(count)
+        for i, item in enumerate(items):
+            item.mood_tags = [list(MoodCategory)[i % 8], list(MoodCategory)[(i * 3) % 8]]
+            item.content_type = list(ContentType)[i % 3]
+        return items
+
+    def test_save_and_mmap_load_round_trip(self, tmp_path):
+        """Test that a saved catalog loads memory-mapped with identical rows."""
+        np = pytest.importorskip("numpy")
+        from maker.catalog import ContentCatalog
+
+        items = self._catalog_items(50)
+        ContentCatalog.from_items(items).save(str(tmp_path / "catalog"))
+        catalog = ContentCatalog.load(str(tmp_path / "catalog"))
+
+        assert len(catalog) == 50
+        assert isinstance(catalog.genre_bits, np.memmap)
+        for item, loaded in zip(items, catalog.items()):
+            assert loaded.content_id == item.content_id
+            assert loaded.content_type == item.content_type
+            assert set(loaded.genres) == set(item.genres)
+            assert set(loaded.mood_tags) == set(item.mood_tags)
+            assert (loaded.duration_minutes, loaded.release_year) == (item.duration_minutes, item.release_year)
+            assert (loaded.rating, loaded.platform) == (item.rating, item.platform)
+        assert catalog.row_of("c17") == 17
+
+    def test_select_matches_item_filters(self):
+        """Test that column filters select the same rows as item checks."""
+        pytest.importorskip("numpy")
+        from maker.catalog import ContentCatalog
+
+        items = self._catalog_items(200)
+        catalog = ContentCatalog.from_items(items)
+
+        rows = catalog.select(
+            content_types=[ContentType.MOVIE, ContentType.DOCUMENTARY],
+            platforms=["netflix", "max"],
+            genres=["comedy", "drama"],
+            moods=[MoodCategory.RELAXED],
+            max_duration=150,
+            min_rating=7.0
+        )
+
+        expected = [
+            i for i, item in enumerate(items)
+            if item.content_type in (ContentType.MOVIE, ContentType.DOCUMENTARY)
+            and item.platform in ("netflix", "max")
+            and {"comedy", "drama"} & set(item.genres)
+            and MoodCategory.RELAXED in item.mood_tags
+            and item.duration_minutes <= 150
+            and item.rating >= 7.0
+        ]
+        assert rows.tolist() == expected
+
+    def test_index_bitmaps_combine_posting_lists(self):
+        """Test bitmap union, intersection and complement against item checks."""
+        pytest.importorskip("numpy")
+        from maker.catalog import ContentCatalog
+
+        items = self._catalog_items(130)  # Not a multiple of 64
+        index = ContentCatalog.from_items(items).index
+
+        def rows_where(predicate):
+            return [i for i, item in enumerate(items) if predicate(item)]
+
+        streaming = index.union([index.bitmap("platform", "netflix"), index.bitmap("platform", "hulu")])
+        relaxed = index.bitmap("mood", MoodCategory.RELAXED.value)
+        short = index.duration_bitmap(100)
+
+        assert index.rows(streaming).tolist() == rows_where(lambda item: item.platform in ("netflix", "hulu"))
+        assert index.rows(index.intersection([relaxed, streaming, short])).tolist() == rows_where(
+            lambda item: MoodCategory.RELAXED in item.mood_tags
+            and item.platform in ("netflix", "hulu")
+            and item.duration_minutes <= 100
+        )
+        assert index.rows(index.complement(index.bitmap("genre", "drama"))).tolist() == rows_where(
+            lambda item: "drama" not in item.genres
+        )
+        assert index.rows(index.intersection([])).tolist() == list(range(130))
+        assert index.rows(index.bitmap("platform", "unknown")).tolist() == []
+        assert index.rows(index.to_bitmap([129, 0, 64, 63])).tolist() == [0, 63, 64, 129]
+        assert index.bitmap("mood", MoodCategory.RELAXED.value) is relaxed  # Cached
+
+    @pytest.mark.asyncio
+    async def test_block_scores_match_items(self, tmp_path):
+        """Test that scoring catalog rows equals scoring the items themselves."""
+        pytest.importorskip("numpy")
+        from maker.batch_scoring import BatchContentScorerAgent
+        from maker.catalog import ContentCatalog
+
+        items = self._catalog_items(120)
+        ContentCatalog.from_items(items).save(str(tmp_path / "catalog"))
+        catalog = ContentCatalog.load(str(tmp_path / "catalog"))
+        scorer = BatchContentScorerAgent()
+        context = dict(TestBatchScoring.CONTEXT)
+
+        for rows in (range(10, 90), catalog.select(genres=["horror"])):
+            expected = await scorer.execute({**context, "candidates": [items[i] for i in rows]})
+            block = await scorer.execute({**context, "candidates": catalog.block(rows)})
+            assert block.to_results() == expected.to_results()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("batch_scoring", [False, True])
+    async def test_discovery_from_catalog_rows(self, batch_scoring):
+        """Test that requests can reference catalog rows instead of items."""
+        pytest.importorskip("numpy")
+        from dataclasses import replace
+        from maker.api import VibecastMAKER, DiscoveryRequest
+        from maker.catalog import ContentCatalog
+
+        items = self._catalog_items(60)
+        catalog = ContentCatalog.from_items(items)
+        maker = VibecastMAKER(config=replace(DEVELOPMENT_CONFIG, batch_scoring=batch_scoring))
+
+        from_items = await maker.discover(
+            DiscoveryRequest(user_input="something funny", candidates=items[20:50])
+        )
+        from_rows = await maker.discover(
+            DiscoveryRequest(user_input="something funny", catalog=catalog, catalog_rows=range(20, 50))
+        )
+
+        assert from_rows.success
+        assert from_rows.recommendations == from_items.recommendations
+
+
+class TestPrefilter:
+    """Tests for the hard-constraint prefilter before scoring."""
+
+    CONSTRAINED = UserPreferences(
+        available_platforms=["netflix", "max"],
+        max_duration_minutes=150,
+        disliked_genres=["horror"]
+    )
+
+    def test_drop_creates_steps_for_viable_items_only(self):
+        """Test that unviable candidates get no scoring step."""
+        from maker.entertainment_agents import HardConstraints
+
+        items = _random_catalog(100)
+        constraints = HardConstraints.from_preferences(self.CONSTRAINED)
+        viable = [item for item in items if constraints.admits(item)]
+        task = {"user_input": "x", "preferences": self.CONSTRAINED, "candidates": items}
+
+        steps = EntertainmentDiscoveryDecomposer(prefilter="drop").decompose(task)
+        scored = [step.context["content"] for step in steps if EntertainmentDiscoveryDecomposer.is_score_step(step.step_id)]
+
+        assert 0 < len(viable) < len(items)
+        assert scored == viable
+        assert len(EntertainmentDiscoveryDecomposer().decompose(task)) == len(steps) + len(items) - len(viable)
+
+    @pytest.mark.asyncio
+    async def test_downtier_ranks_unviable_items_last(self):
+        """Test that down-tiered candidates are scored but ranked after viable ones."""
+        from maker.entertainment_agents import ContentRankerAgent, HardConstraints
+
+        items = _random_catalog(60)
+        constraints = HardConstraints.from_preferences(self.CONSTRAINED)
+        task = {"user_input": "x", "preferences": self.CONSTRAINED, "candidates": items}
+
+        steps = EntertainmentDiscoveryDecomposer(prefilter="downtier").decompose(task)
+        ranking = next(step for step in steps if step.step_id == 200)
+        demoted = ranking.context["demoted"]
+        assert demoted == {item.content_id for item in items if not constraints.admits(item)}
+
+        scorer = ContentScorerAgent()
+        scored = [await scorer.execute({"content": item, "preferences": self.CONSTRAINED}) for item in items]
+        ranked = await ContentRankerAgent(top_k=60).execute({"scored_items": scored, "demoted": demoted})
+
+        viable_count = len(items) - len(demoted)
+        assert set(ranked[:viable_count]).isdisjoint(demoted)
+        assert set(ranked[viable_count:]) == demoted
+
+    @pytest.mark.asyncio
+    async def test_block_downtier_matches_items(self):
+        """Test that the block path filters and ranks like the item path."""
+        pytest.importorskip("numpy")
+        from maker.batch_scoring import CandidateBlock, BatchContentScorerAgent
+        from maker.entertainment_agents import ContentRankerAgent
+
+        items = _random_catalog(80)
+        task = {"user_input": "x", "preferences": self.CONSTRAINED}
+        for mode in ("drop", "downtier"):
+            per_item = EntertainmentDiscoveryDecomposer(prefilter=mode).decompose({**task, "candidates": items})
+            block_steps = EntertainmentDiscoveryDecomposer(batch_scoring=True, prefilter=mode).decompose(
+                {**task, "candidates": CandidateBlock.from_items(items)}
+            )
+            block = next(
+                step for step in block_steps if step.step_id == EntertainmentDiscoveryDecomposer.SCORE_STEP_BASE
+            ).context["candidates"]
+            expected_ids = [
+                step.context["content"].content_id for step in per_item
+                if EntertainmentDiscoveryDecomposer.is_score_step(step.step_id)
+            ]
+            assert block.content_ids.tolist() == expected_ids
+
+            demoted = next(step for step in block_steps if step.step_id == 200).context.get("demoted")
+            scores = await BatchContentScorerAgent().execute({"candidates": block, "preferences": self.CONSTRAINED})
+            ranker = ContentRankerAgent(top_k=80)
+            assert await ranker.execute({"step_100_result": scores, "demoted": demoted}) == \
+                await ranker.execute({"scored_items": scores.to_results(), "demoted": demoted})
+
+    def test_catalog_prefilter_uses_indexes(self):
+        """Test that index-based catalog prefiltering matches item checks."""
+        pytest.importorskip("numpy")
+        from maker.catalog import ContentCatalog
+        from maker.entertainment_agents import HardConstraints
+
+        items = _random_catalog(500)
+        catalog = ContentCatalog.from_items(items)
+        constraints = HardConstraints.from_preferences(self.CONSTRAINED)
+
+        assert catalog.prefilter(constraints).tolist() == [
+            i for i, item in enumerate(items) if constraints.admits(item)
+        ]
+        assert catalog.prefilter(constraints, range(100, 300)).tolist() == [
+            i for i, item in enumerate(items) if 100 <= i < 300 and constraints.admits(item)
+        ]
+        assert catalog.prefilter(HardConstraints(), [5, 3, 3]).tolist() == [3, 5]
+
+    @pytest.mark.asyncio
+    async def test_discovery_skips_unviable_catalog_rows(self):
+        """Test that catalog requests only score viable rows."""
+        pytest.importorskip("numpy")
+        from dataclasses import replace
+        from maker.api import VibecastMAKER, DiscoveryRequest
+        from maker.catalog import ContentCatalog
+        from maker.entertainment_agents import HardConstraints
+
+        items = _random_catalog(200)
+        catalog = ContentCatalog.from_items(items)
+        maker = VibecastMAKER(config=replace(DEVELOPMENT_CONFIG, prefilter_mode="drop"))
+        request = DiscoveryRequest(
+            user_input="something funny", preferences=self.CONSTRAINED, catalog=catalog
+        )
+
+        response = await maker.discover(request)
+
+        rows = catalog.prefilter(HardConstraints.from_preferences(self.CONSTRAINED))
+        viable = set(catalog.content_ids[rows].tolist())
+        assert response.success
+        assert set(response.recommendations) <= viable
+        assert response.stats["total_steps"] < 200
+
+        # Prefiltering is opt-in: the default scores every row
+        unfiltered = await VibecastMAKER(config=DEVELOPMENT_CONFIG).discover(request)
+        assert unfiltered.stats["total_steps"] > 200
+
+
+class TestTaskDecomposition:
+    """Tests for task decomposition."""
+
+    def test_decomposition_creates_steps(self):
+        """Test that decomposition creates proper steps."""
+        decomposer = EntertainmentDiscoveryDecomposer()
+
+        candidates = [
+            ContentItem(
+                content_id=f"c{i}",
+                title=f"Content {i}",
+                content_type=ContentType.MOVIE,
+                genres=["drama"],
+                duration_minutes=100,
+                release_year=2024,
+                rating=7.0,
+                platform="netflix"
+            )
+            for i in range(3)
+        ]
+
+        task = {
+            "user_input": "something fun",
+            "candidates": candidates,
+            "top_k": 2
+        }
+
+        steps = decomposer.decompose(task)
+
+        # Should have: mood, genres, duration, 3 scorings, 1 ranking, 2 explanations
+        assert len(steps) >= 8
+
+        # Check step IDs are unique
+        step_ids = [s.step_id for s in steps]
+        assert len(step_ids) == len(set(step_ids))
+
+    def test_step_dependencies_valid(self):
+        """Test that step dependencies reference valid steps."""
+        decomposer = EntertainmentDiscoveryDecomposer()
+
+        task = {
+            "user_input": "test",
+            "candidates": [],
+            "top_k": 3
+        }
+
+        steps = decomposer.decompose(task)
+        step_ids = {s.step_id for s in steps}
+
+        for step in steps:
+            for dep in step.dependencies:
+                assert dep in step_ids, f"Step {step.step_id} has invalid dependency {dep}"
+
+    def test_step_ids_unique_for_large_candidate_sets(self):
+        """Test that scoring ids never collide with ranking or explanation ids."""
+        candidates = _random_catalog(450)
+
+        for batch_scoring in (False, True):
+            decomposer = EntertainmentDiscoveryDecomposer(batch_scoring=batch_scoring)
+            step_ids = [s.step_id for s in decomposer.decompose({"candidates": candidates, "top_k": 250})]
+            assert len(step_ids) == len(set(step_ids))
+
+        with pytest.raises(ValueError):
+            EntertainmentDiscoveryDecomposer().decompose({"candidates": candidates, "top_k": 20_000})
+
+    def test_compact_step_layout(self):
+        """Test slotted steps, lazy descriptions and range dependencies."""
+        decomposer = EntertainmentDiscoveryDecomposer()
+        candidates = [
+            ContentItem(f"c{i}", f"Title {i}", ContentType.MOVIE, ["drama"], 100, 2024, 7.0, "netflix")
+            for i in range(50)
+        ]
+
+        steps = {s.step_id: s for s in decomposer.decompose({"candidates": candidates, "top_k": 2})}
+
+        assert not hasattr(steps[10_000], "__dict__")
+        assert steps[10_000].description == "Score content: Title 0"
+        assert str(steps[301].description) == "Generate explanation for recommendation 2"
+        assert steps[200].dependencies == range(10_000, 10_050)
+
+    def test_compact_dependencies(self):
+        """Test that dependency ids get the smallest fitting container."""
+        from array import array
+        from maker.core import compact_dependencies
+
+        assert compact_dependencies([5, 6, 7, 8]) == range(5, 9)
+        assert compact_dependencies([1, 400]) == (1, 400)
+        sparse = compact_dependencies(list(range(0, 40, 2)))
+        assert isinstance(sparse, array) and list(sparse) == list(range(0, 40, 2))
+
+    def test_step_memory_benchmark(self):
+        """Test that the compact layout uses less memory per step."""
+        from maker.benchmark import benchmark_step_memory
+
+        stats = benchmark_step_memory((2_000,))[2_000]
+
+        assert stats["compact_bytes_per_step"] < stats["dict_bytes_per_step"]
+
+    def test_step_memory_benchmark_uses_decomposer_ids(self):
+        """Test that the benchmark DAG has the decomposer's id layout."""
+        from maker.benchmark import _build_scoring_dag
+
+        candidates = _random_catalog(500)
+        real = {s.step_id: s for s in EntertainmentDiscoveryDecomposer().decompose({"candidates": candidates})}
+        rank_id = EntertainmentDiscoveryDecomposer.RANK_STEP_ID
+
+        for compact in (False, True):
+            steps = _build_scoring_dag(500, compact)
+            ids = [s.step_id for s in steps]
+            assert len(ids) == len(set(ids)) == 501
+            assert set(ids) <= set(real)
+            assert list(steps[-1].dependencies) == list(real[rank_id].dependencies)
+
+
+class TestVotingOptimizer:
+    """Tests for voting optimization."""
+
+    def test_optimal_k_calculation(self):
+        """Test optimal k calculation."""
+        optimizer = VotingOptimizer(target_success_rate=0.99)
+
+        # High accuracy needs lower k
+        k_high = optimizer.calculate_optimal_k(0.95, 100)
+
+        # Low accuracy needs higher k
+        k_low = optimizer.calculate_optimal_k(0.7, 100)
+
+        assert k_low > k_high
+
+    def test_cost_estimation(self):
+        """Test cost estimation."""
+        optimizer = VotingOptimizer()
+
+        cost = optimizer.estimate_cost(
+            k=3,
+            per_step_accuracy=0.9,
+            total_steps=100,
+            cost_per_vote=0.001
+        )
+
+        assert "expected_cost" in cost
+        assert cost["expected_cost"] > 0
+        assert cost["best_case_cost"] <= cost["expected_cost"]
+
+    def test_model_recommendation(self):
+        """Test model recommendation."""
+        optimizer = VotingOptimizer()
+
+        accuracy = {"gpt-4": 0.98, "gpt-4o-mini": 0.92, "gpt-3.5": 0.85}
+        costs = {"gpt-4": 0.03, "gpt-4o-mini": 0.001, "gpt-3.5": 0.0005}
+
+        rec = optimizer.recommend_model(accuracy, costs, total_steps=100)
+
+        assert rec["recommended_model"] is not None
+        # Cheaper models often win on reliability-per-dollar
+        assert rec["recommended_model"] in ["gpt-4o-mini", "gpt-3.5"]
+
+
+class _FanOutDecomposer(TaskDecomposer):
+    """Root step, ``width`` independent steps, then a join step."""
+
+    def __init__(self, width: int):
+        self.width = width
+
+    def decompose(self, task):
+        join_id = self.width + 1
+        return (
+            [Step(join_id, "join", {}, list(range(1, join_id)))]  # Listed first on purpose
+            + [Step(0, "root", {})]
+            + [Step(i, f"leaf {i}", {}, [0]) for i in range(1, join_id)]
+        )
+
+    def compose_result(self, steps):
+        return {step.step_id: step.result for step in steps}
+
+
+class _ConcurrencyProbeAgent(Microagent[int]):
+    """Deterministic agent recording peak concurrency; returns its dep count."""
+
+    deterministic = True
+
+    def __init__(self):
+        super().__init__(agent_id="probe")
+        self.active = 0
+        self.peak = 0
+
+    async def execute(self, context):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return sum(1 for key in context if key.startswith("step_"))
+
+    def validate_output(self, output):
+        return True
+
+
+class _EchoAgent(Microagent[str]):
+    """Voted (non-deterministic) agent echoing the task's ``key`` context."""
+
+    def __init__(self):
+        super().__init__(agent_id="echo")
+
+    async def execute(self, context):
+        self.call_count += 1
+        await asyncio.sleep(0.01)
+        return context["key"]
+
+    def validate_output(self, output):
+        return True
+
+
+class _KeyDecomposer(TaskDecomposer):
+    """Single step whose context is the task's ``key``."""
+
+    def decompose(self, task):
+        return [Step(1, "echo", {"key": task["key"]})]
+
+    def compose_result(self, steps):
+        return steps[0].result
+
+
+class TestDAGScheduling:
+    """Tests for dependency-aware concurrent step execution."""
+
+    @staticmethod
+    def _orchestrator(width: int, max_concurrent_steps: int):
+        from maker.core import MAKEROrchestrator
+
+        orchestrator = MAKEROrchestrator(
+            _FanOutDecomposer(width), max_concurrent_steps=max_concurrent_steps
+        )
+        agent = _ConcurrencyProbeAgent()
+        orchestrator.register_agent(agent)
+        return orchestrator, agent
+
+    @pytest.mark.asyncio
+    async def test_independent_steps_run_concurrently(self):
+        """Test that ready steps overlap up to the concurrency limit."""
+        orchestrator, agent = self._orchestrator(width=12, max_concurrent_steps=4)
+
+        result = await orchestrator.execute_task({})
+
+        assert agent.peak == 4
+        # Join ran after every leaf despite being listed first
+        assert result["result"][13] == 12
+        assert all(result["result"][i] == 1 for i in range(1, 13))
+
+    @pytest.mark.asyncio
+    async def test_serial_limit(self):
+        """Test that a limit of one runs steps one at a time."""
+        orchestrator, agent = self._orchestrator(width=3, max_concurrent_steps=1)
+
+        await orchestrator.execute_task({})
+
+        assert agent.peak == 1
+
+    @pytest.mark.asyncio
+    async def test_dependency_cycle_still_completes(self):
+        """Test that steps in a dependency cycle each run once."""
+        from maker.core import MAKEROrchestrator
+
+        class CycleDecomposer(TaskDecomposer):
+            def decompose(self, task):
+                # 1 -> 2 -> 3 -> 1, with 4 waiting on the cycle
+                return [
+                    Step(1, "a", {}, [3]),
+                    Step(2, "b", {}, [1]),
+                    Step(3, "c", {}, [2]),
+                    Step(4, "tail", {}, [1, 3]),
+                ]
+
+            def compose_result(self, steps):
+                return {step.step_id: step.status for step in steps}
+
+        class CountingAgent(_ConcurrencyProbeAgent):
+            async def execute(self, context):
+                self.call_count += 1
+                return await super().execute(context)
+
+        orchestrator = MAKEROrchestrator(CycleDecomposer())
+        agent = CountingAgent()
+        orchestrator.register_agent(agent)
+
+        result = await orchestrator.execute_task({})
+
+        assert result["result"] == {1: "completed", 2: "completed", 3: "completed", 4: "completed"}
+        assert agent.call_count == 4
+
+    @pytest.mark.asyncio
+    async def test_duplicate_step_ids_rejected(self):
+        """Test that a decomposition reusing a step id fails clearly."""
+        from maker.core import MAKEROrchestrator
+
+        class DuplicateDecomposer(TaskDecomposer):
+            def decompose(self, task):
+                return [Step(1, "a", {}), Step(1, "b", {})]
+
+            def compose_result(self, steps):
+                return None
+
+        orchestrator = MAKEROrchestrator(DuplicateDecomposer())
+        orchestrator.register_agent(_ConcurrencyProbeAgent())
+
+        with pytest.raises(ValueError, match="Duplicate step id"):
+            await orchestrator.execute_task({})
+
+    @pytest.mark.asyncio
+    async def test_failed_step_cancels_and_awaits_siblings(self):
+        """Test that no step outlives execute_task once a step fails."""
+        from maker.core import MAKEROrchestrator
+
+        class FailFastAgent(_ConcurrencyProbeAgent):
+            completed = 0
+
+            async def execute(self, context):
+                self.call_count += 1
+                if self.call_count == 2:
+                    raise RuntimeError("leaf failed")  # First leaf
+                await asyncio.sleep(0.02)
+                self.completed += 1
+                return 0
+
+        orchestrator = MAKEROrchestrator(_FanOutDecomposer(6))
+        agent = FailFastAgent()
+        orchestrator.register_agent(agent)
+
+        with pytest.raises(RuntimeError):
+            await orchestrator.execute_task({})
+
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+        completed = agent.completed
+        await asyncio.sleep(0.05)
+        assert agent.completed == completed == 1  # Only the root
+
+    @pytest.mark.asyncio
+    async def test_execute_many_coalesces_identical_steps(self):
+        """Test that identical steps across tasks are voted on once."""
+        from maker.core import MAKEROrchestrator
+
+        single = MAKEROrchestrator(_KeyDecomposer())
+        single.register_agent(_EchoAgent())
+        await single.execute_task({"key": "same"})
+
+        orchestrator = MAKEROrchestrator(_KeyDecomposer())
+        agent = _EchoAgent()
+        orchestrator.register_agent(agent)
+
+        results = await orchestrator.execute_many([{"key": "same"}] * 20, concurrency=8)
+
+        assert [r["result"] for r in results] == ["same"] * 20
+        assert agent.call_count == single.agents["echo"].call_count
+        assert sum(r["stats"]["coalesced_steps"] for r in results) == 19
+        aggregate = orchestrator.execution_stats
+        assert aggregate["total_votes"] + aggregate["wasted_votes"] == agent.call_count
+
+    @pytest.mark.asyncio
+    async def test_steps_of_one_task_are_not_coalesced(self):
+        """Test that distinct steps with equal contexts each get their own vote."""
+        from maker.core import MAKEROrchestrator
+
+        class TwinDecomposer(_KeyDecomposer):
+            def decompose(self, task):
+                return [Step(1, "echo", {"key": task["key"]}), Step(2, "echo", {"key": task["key"]})]
+
+        single = MAKEROrchestrator(_KeyDecomposer())
+        single.register_agent(_EchoAgent())
+        await single.execute_task({"key": "same"})
+        votes_per_step = single.agents["echo"].call_count
+
+        orchestrator = MAKEROrchestrator(TwinDecomposer())
+        agent = _EchoAgent()
+        orchestrator.register_agent(agent)
+
+        result = await orchestrator.execute_task({"key": "same"})
+        assert result["stats"]["coalesced_steps"] == 0
+        assert agent.call_count == 2 * votes_per_step
+
+        agent.call_count = 0
+        results = await orchestrator.execute_many([{"key": "same"}] * 3)
+        # Across tasks each twin is voted once and joined by the others
+        assert sum(r["stats"]["coalesced_steps"] for r in results) == 4
+        assert agent.call_count == 2 * votes_per_step
+
+    @pytest.mark.asyncio
+    async def test_coalesced_results_are_not_aliased(self):
+        """Test that tasks joining one vote each get their own result object."""
+        from maker.core import MAKEROrchestrator
+
+        class ListEchoAgent(_EchoAgent):
+            async def execute(self, context):
+                return [await super().execute(context)]
+
+        orchestrator = MAKEROrchestrator(_KeyDecomposer())
+        orchestrator.register_agent(ListEchoAgent())
+
+        results = await orchestrator.execute_many([{"key": "same"}] * 3)
+        results[0]["result"].append("mutated")
+
+        assert [r["result"] for r in results[1:]] == [["same"], ["same"]]
+
+    @pytest.mark.asyncio
+    async def test_execute_many_stops_other_tasks_on_failure(self):
+        """Test that no agent runs after one task in a batch fails."""
+        from maker.core import MAKEROrchestrator
+
+        class FailingEchoAgent(_EchoAgent):
+            completed = 0
+
+            async def execute(self, context):
+                if context["key"] == "bad":
+                    await asyncio.sleep(0.005)
+                    raise RuntimeError("task failed")
+                result = await super().execute(context)
+                self.completed += 1
+                return result
+
+        orchestrator = MAKEROrchestrator(_KeyDecomposer())
+        agent = FailingEchoAgent()
+        orchestrator.register_agent(agent)
+        tasks = [{"key": "bad"}] + [{"key": f"k{i}"} for i in range(20)]
+
+        with pytest.raises(RuntimeError):
+            await orchestrator.execute_many(tasks, concurrency=4)
+
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+        calls, completed = agent.call_count, agent.completed
+        await asyncio.sleep(0.05)
+        assert (agent.call_count, agent.completed) == (calls, completed)
+
+    @pytest.mark.asyncio
+    async def test_execute_many_shares_concurrency_budget(self):
+        """Test that distinct tasks run together within one step budget."""
+        from maker.core import MAKEROrchestrator
+
+        orchestrator = MAKEROrchestrator(_FanOutDecomposer(2))
+        agent = _ConcurrencyProbeAgent()
+        orchestrator.register_agent(agent)
+
+        results = await orchestrator.execute_many([{}] * 10, concurrency=6)
+
+        assert len(results) == 10
+        assert agent.peak == 6
+
+    def test_overhead_per_step_stays_flat(self):
+        """Test that a wide fan-in does not make per-step overhead grow."""
+        from maker.benchmark import benchmark_orchestrator_overhead
+
+        overhead = benchmark_orchestrator_overhead((500, 5000))
+
+        # An O(N^2) dependency lookup would be ~10x slower per step
+        assert overhead[5000] < overhead[500] * 4
+
+
+class _StreamingDecomposer(TaskDecomposer):
+    """Generates ``width`` leaf steps on demand, counting how many exist."""
+
+    def __init__(self, width: int):
+        self.width = width
+        self.created = 0
+
+    def iter_steps(self, task):
+        yield Step(0, "root", {})
+        for i in range(1, self.width + 1):
+            self.created += 1
+            yield Step(i, f"leaf {i}", {"payload": [i] * 100}, [0])
+
+    def decompose(self, task):
+        return list(self.iter_steps(task))
+
+    def compose_result(self, steps):
+        return len(steps)
+
+
+class _ChainDecomposer(TaskDecomposer):
+    """``length`` steps each consuming the previous; only the last is kept."""
+
+    def __init__(self, length: int):
+        self.length = length
+
+    def iter_steps(self, task):
+        yield Step(0, "head", {})
+        for i in range(1, self.length):
+            yield Step(i, f"link {i}", {"payload": [i] * 20}, (i - 1,))
+
+    def decompose(self, task):
+        return list(self.iter_steps(task))
+
+    def retain_result(self, step):
+        return step.step_id == self.length - 1
+
+    def result_consumers(self, task, step):
+        return 1
+
+    def compose_result(self, steps):
+        return {step.step_id: step.result for step in steps}
+
+
+class TestLazyDecomposition:
+    """Tests for generator-based decomposition with bounded lookahead."""
+
+    @pytest.mark.asyncio
+    async def test_frontier_is_bounded(self):
+        """Test that steps are created only as the frontier advances."""
+        from maker.core import MAKEROrchestrator
+
+        decomposer = _StreamingDecomposer(200)
+        orchestrator = MAKEROrchestrator(
+            decomposer, max_concurrent_steps=4, decomposition_lookahead=8
+        )
+        agent = _ConcurrencyProbeAgent()
+        orchestrator.register_agent(agent)
+        finished = 0
+        frontier = []
+        probe_execute = agent.execute
+
+        async def execute(context):
+            nonlocal finished
+            frontier.append(decomposer.created - finished)
+            result = await probe_execute(context)
+            finished += 1
+            return result
+
+        agent.execute = execute
+        result = await orchestrator.execute_task({})
+
+        assert result["result"] == 201
+        assert result["stats"]["total_steps"] == 201
+        assert max(frontier) <= 8
+        # Contexts of finished steps are released in lazy mode
+        assert all(step.context == {} for step in result["steps"])
+
+    @pytest.mark.asyncio
+    async def test_memory_follows_frontier(self):
+        """Test that released steps are dropped, so peak memory stays flat."""
+        import tracemalloc
+        from maker.core import MAKEROrchestrator
+
+        class InstantAgent(_ConcurrencyProbeAgent):
+            async def execute(self, context):
+                return 1
+
+        async def peak_bytes(length):
+            orchestrator = MAKEROrchestrator(
+                _ChainDecomposer(length), max_concurrent_steps=4, decomposition_lookahead=16
+            )
+            orchestrator.register_agent(InstantAgent())
+            tracemalloc.start()
+            try:
+                result = await orchestrator.execute_task({})
+                return tracemalloc.get_traced_memory()[1], result
+            finally:
+                tracemalloc.stop()
+
+        short_peak, _ = await peak_bytes(1_000)
+        long_peak, result = await peak_bytes(4_000)
+
+        assert result["result"] == {3_999: 1}
+        assert result["stats"]["total_steps"] == 4_000
+        assert long_peak < short_peak * 2
+
+    @pytest.mark.asyncio
+    async def test_benchmark_counts_dropped_steps(self):
+        """Test that benchmark totals come from stats, not the kept steps."""
+        from maker.benchmark import MAKERBenchmark
+        from maker.core import MAKEROrchestrator
+
+        class ChainEchoAgent(_EchoAgent):
+            async def execute(self, context):
+                self.call_count += 1
+                return "ok"
+
+        orchestrator = MAKEROrchestrator(_ChainDecomposer(100), decomposition_lookahead=4)
+        agent = ChainEchoAgent()
+        orchestrator.register_agent(agent)
+
+        result = await MAKERBenchmark(orchestrator).run_benchmark("chain", [{}])
+
+        assert result.total_steps == 100
+        assert result.successful_steps == 100
+        assert result.accuracy == 1.0
+        assert result.total_votes == orchestrator.execution_stats["total_votes"] >= 300
+        assert [m.step_id for m in result.step_metrics] == [99]  # Only the kept link
+        assert result.step_metrics[0].votes_required >= 3
+
+    @pytest.mark.asyncio
+    async def test_lazy_discovery_matches_eager(self):
+        """Test that the ported decomposer gives the same result lazily."""
+        from dataclasses import replace
+        from maker.api import VibecastMAKER, DiscoveryRequest
+
+        candidates = [
+            ContentItem(
+                content_id=f"c{i}",
+                title=f"Content {i}",
+                content_type=ContentType.MOVIE,
+                genres=["comedy"],
+                duration_minutes=80 + i,
+                release_year=2024,
+                rating=6.0 + i / 10,
+                platform="netflix"
+            )
+            for i in range(12)
+        ]
+        request = DiscoveryRequest(user_input="something funny", candidates=candidates, top_k=3)
+
+        eager = await VibecastMAKER(config=DEVELOPMENT_CONFIG).discover(request)
+        lazy = await VibecastMAKER(
+            config=replace(DEVELOPMENT_CONFIG, decomposition_lookahead=5)
+        ).discover(request)
+
+        assert lazy.success
+        assert lazy.recommendations == eager.recommendations
+        assert lazy.stats["total_steps"] == eager.stats["total_steps"]
+
+
+class _ReleasingDecomposer(TaskDecomposer):
+    """Root, ``width`` leaves, then a join; only the join's result is kept."""
+
+    def __init__(self, width: int):
+        self.width = width
+
+    def iter_steps(self, task):
+        yield Step(0, "root", {})
+        for i in range(1, self.width + 1):
+            yield Step(i, f"leaf {i}", {}, (0,))
+        yield Step(self.width + 1, "join", {}, range(1, self.width + 1))
+
+    def decompose(self, task):
+        return list(self.iter_steps(task))
+
+    def retain_result(self, step):
+        return step.step_id == self.width + 1
+
+    def result_consumers(self, task, step):
+        return self.width if step.step_id == 0 else 1
+
+    def compose_result(self, steps):
+        return {step.step_id: step.result for step in steps}
+
+
+class TestResultRelease:
+    """Tests for releasing step results once their dependents consumed them."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("lookahead", [None, 4])
+    async def test_consumed_results_are_released(self, lookahead):
+        """Test that only retained results survive, after being consumed."""
+        from maker.core import MAKEROrchestrator
+
+        orchestrator = MAKEROrchestrator(
+            _ReleasingDecomposer(6), max_concurrent_steps=3, decomposition_lookahead=lookahead
+        )
+        orchestrator.register_agent(_ConcurrencyProbeAgent())
+
+        result = await orchestrator.execute_task({})
+
+        # The join still saw every leaf's result
+        assert result["result"][7] == 6
+        if lookahead is None:
+            assert all(result["result"][i] is None for i in range(7))
+        else:
+            assert list(result["result"]) == [7]  # Released steps are dropped
+        assert result["stats"]["released_results"] == 7
+        assert result["stats"]["total_steps"] == 8
+
+    @pytest.mark.asyncio
+    async def test_retained_by_default(self):
+        """Test that decomposers that do not opt in keep every result."""
+        from maker.core import MAKEROrchestrator
+
+        orchestrator = MAKEROrchestrator(_FanOutDecomposer(3))
+        orchestrator.register_agent(_ConcurrencyProbeAgent())
+
+        result = await orchestrator.execute_task({})
+
+        assert result["result"] == {0: 0, 1: 1, 2: 1, 3: 1, 4: 3}
+        assert result["stats"]["released_results"] == 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("lookahead", [None, 4])
+    async def test_discovery_releases_scores(self, lookahead):
+        """Test that candidate scores are freed once every consumer has run."""
+        from dataclasses import replace
+        from maker.api import VibecastMAKER, DiscoveryRequest
+
+        candidates = [
+            ContentItem(
+                content_id=f"c{i}",
+                title=f"Content {i}",
+                content_type=ContentType.MOVIE,
+                genres=["comedy"],
+                duration_minutes=80 + i,
+                release_year=2024,
+                rating=6.0 + i / 10,
+                platform="netflix"
+            )
+            for i in range(10)
+        ]
+        request = DiscoveryRequest(user_input="something funny", candidates=candidates, top_k=3)
+
+        maker = VibecastMAKER(config=replace(DEVELOPMENT_CONFIG, decomposition_lookahead=lookahead))
+        explainer = maker.orchestrator.agents["explanation_generator"]
+        seen_scores = []
+        explain = explainer.execute
+
+        async def execute(context):
+            seen_scores.append(sum(1 for key in context if key.startswith("step_1")))
+            return await explain(context)
+
+        explainer.execute = execute
+        response = await maker.discover(request)
+
+        assert response.success
+        assert response.stats["released_results"] == 10
+        # Each explanation still received its candidate's score
+        assert seen_scores and set(seen_scores) == {1}
+
+
+class TestStepJournal:
+    """Tests for journaling decided steps and resuming tasks."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("backend", ["file", "sqlite"])
+    async def test_resume_skips_journaled_steps(self, tmp_path, backend):
+        """Test that a re-run task restores decided steps instead of re-running."""
+        from maker.core import MAKEROrchestrator
+        from maker.journal import create_step_journal
+
+        path = str(tmp_path / "journal")
+        with create_step_journal(path, backend) as journal:
+            first = MAKEROrchestrator(_FanOutDecomposer(4), journal=journal)
+            first.register_agent(_ConcurrencyProbeAgent())
+            expected = await first.execute_task({"task_id": "t1"})
+
+        # Keep only the root and two leaves, as if the run had crashed
+        partial = str(tmp_path / "partial")
+        with create_step_journal(path, backend) as journal:
+            records = journal.load("t1")
+        with create_step_journal(partial, backend) as journal:
+            for step_id in (0, 1, 2):
+                journal.record(records[step_id])
+
+        with create_step_journal(partial, backend) as journal:
+            second = MAKEROrchestrator(_FanOutDecomposer(4), journal=journal)
+            second.register_agent(_ConcurrencyProbeAgent())
+            resumed = await second.execute_task({}, task_id="t1")
+
+        assert resumed["result"] == expected["result"]
+        assert resumed["stats"]["resumed_steps"] == 3
+        assert resumed["stats"]["deterministic_steps"] == 3  # Two leaves and the join
+
+    def test_torn_line_is_skipped(self, tmp_path):
+        """Test that a partial record from a crash does not break loading."""
+        from maker.journal import FileStepJournal, StepRecord
+
+        path = str(tmp_path / "journal.jsonl")
+        with FileStepJournal(path) as journal:
+            journal.record(StepRecord("t1", 1, "completed", ["a", "b"]))
+        with open(path, "a") as f:
+            f.write('{"task_id": "t1", "step_id": 2, "sta')
+
+        with FileStepJournal(path) as journal:
+            journal.record(StepRecord("t1", 3, "completed", {"x": 1}))
+            records = journal.load("t1")
+
+        assert sorted(records) == [1, 3]
+        assert records[1].result == ["a", "b"]
+
+    def test_writes_are_batched(self, tmp_path):
+        """Test that records are buffered until the batch or interval is due."""
+        from maker.journal import FileStepJournal, StepRecord
+
+        with FileStepJournal(str(tmp_path / "j"), batch_size=10, fsync_interval_s=60) as journal:
+            for step_id in range(25):
+                journal.record(StepRecord("t1", step_id, "completed", step_id))
+            assert journal.flushes == 2
+            assert journal.records_written == 20
+
+    @pytest.mark.asyncio
+    async def test_quiet_tail_flushed_by_timer(self, tmp_path):
+        """Test that a buffered record is flushed once the interval passes."""
+        from maker.journal import FileStepJournal, StepRecord
+
+        with FileStepJournal(str(tmp_path / "j"), batch_size=10, fsync_interval_s=0.02) as journal:
+            journal.record(StepRecord("t1", 1, "completed", 1))
+            assert journal.records_written == 0
+            await asyncio.sleep(0.05)
+            assert journal.records_written == 1
+
+    @pytest.mark.asyncio
+    async def test_decided_steps_flushed_when_task_fails(self, tmp_path):
+        """Test that steps decided before an error are journaled."""
+        from maker.core import MAKEROrchestrator
+        from maker.journal import FileStepJournal
+
+        class FailingJoinAgent(_ConcurrencyProbeAgent):
+            async def execute(self, context):
+                if len(context) > 1:
+                    raise RuntimeError("join failed")
+                return await super().execute(context)
+
+        with FileStepJournal(str(tmp_path / "j"), batch_size=100, fsync_interval_s=60) as journal:
+            orchestrator = MAKEROrchestrator(_FanOutDecomposer(3), journal=journal)
+            orchestrator.register_agent(FailingJoinAgent())
+            with pytest.raises(RuntimeError):
+                await orchestrator.execute_task({}, task_id="t1")
+
+            assert journal.records_written == 4  # Root and three leaves
+
+
+class TestStreamTask:
+    """Tests for streaming step completions from a running task."""
+
+    @pytest.mark.asyncio
+    async def test_events_follow_completion_order(self):
+        """Test that every step is streamed before the final event."""
+        from maker.core import MAKEROrchestrator
+
+        orchestrator = MAKEROrchestrator(_FanOutDecomposer(4))
+        orchestrator.register_agent(_ConcurrencyProbeAgent())
+
+        events = [event async for event in orchestrator.stream_task({})]
+
+        assert [event.final for event in events] == [False] * 6 + [True]
+        assert events[0].step.step_id == 0
+        assert events[-2].step.step_id == 5  # The join finishes last
+        assert events[-1].completed_steps == 6
+        assert events[-1].result["result"] == {0: 0, 1: 1, 2: 1, 3: 1, 4: 1, 5: 4}
+
+    @pytest.mark.asyncio
+    async def test_closing_early_cancels_remaining_steps(self):
+        """Test that abandoning the stream stops the task."""
+        from maker.core import MAKEROrchestrator
+
+        orchestrator = MAKEROrchestrator(_FanOutDecomposer(4))
+        agent = _ConcurrencyProbeAgent()
+        orchestrator.register_agent(agent)
+        finished = []
+        probe_execute = agent.execute
+
+        async def execute(context):
+            result = await probe_execute(context)
+            finished.append(result)
+            return result
+
+        agent.execute = execute
+        stream = orchestrator.stream_task({})
+        first = await stream.__anext__()
+        await stream.aclose()
+        await asyncio.sleep(0.05)
+
+        assert first.step.step_id == 0
+        assert finished == [0]  # The leaves were cancelled, the join never ran
+        assert orchestrator.execution_stats["total_steps"] == 0
+
+    @pytest.mark.asyncio
+    async def test_discover_stream_yields_mood_first(self):
+        """Test that discovery streams partial responses ending in the full one."""
+        from maker.api import VibecastMAKER, DiscoveryRequest
+
+        candidates = [
+            ContentItem(
+                content_id=f"c{i}",
+                title=f"Content {i}",
+                content_type=ContentType.MOVIE,
+                genres=["comedy"],
+                duration_minutes=80 + i,
+                release_year=2024,
+                rating=6.0 + i / 10,
+                platform="netflix"
+            )
+            for i in range(8)
+        ]
+        request = DiscoveryRequest(user_input="something funny", candidates=candidates, top_k=3)
+
+        maker = VibecastMAKER(config=DEVELOPMENT_CONFIG)
+        responses = [response async for response in maker.discover_stream(request)]
+        expected = await maker.discover(request)
+
+        assert responses[0].mood is not None
+        assert responses[0].recommendations == []
+        assert not any(response.complete for response in responses[:-1])
+        # One partial response per change: mood, genres, duration, ranking, explanations
+        assert len(responses) == 4 + len(expected.explanations) + 1
+
+        final = responses[-1]
+        assert final.complete and final.success
+        assert final.recommendations == expected.recommendations
+        assert final.explanations == expected.explanations
+        assert final.stats["total_steps"] == expected.stats["total_steps"]
+
+
+class TestIntegration:
+    """Integration tests."""
+
+    @pytest.mark.asyncio
+    async def test_full_pipeline_mock(self):
+        """Test full recommendation pipeline with mock data."""
+        from maker.api import VibecastMAKER, DiscoveryRequest
+
+        # Use development config for testing
+        engine = VibecastMAKER(config=DEVELOPMENT_CONFIG)
+
+        candidates = [
+            ContentItem(
                 content_id="movie1",
                 title="Action Hero",
                 content_type=ContentType.MOVIE,
@@ -434,6 +2262,94 @@ class TestIntegration:
         assert response.mood is not None
         assert len(response.matched_genres) > 0
 
+    @pytest.mark.asyncio
+    async def test_deterministic_agents_run_once(self):
+        """Test that deterministic agents skip redundant voting."""
+        from maker.api import VibecastMAKER, DiscoveryRequest
+
+        engine = VibecastMAKER(config=DEVELOPMENT_CONFIG)
+
+        candidates = [
+            ContentItem(
+                content_id=f"c{i}",
+                title=f"Content {i}",
+                content_type=ContentType.MOVIE,
+                genres=["comedy"],
+                duration_minutes=90,
+                release_year=2024,
+                rating=7.0,
+                platform="netflix"
+            )
+            for i in range(10)
+        ]
+
+        response = await engine.discover(DiscoveryRequest(
+            user_input="something relaxing",
+            candidates=candidates,
+            top_k=3
+        ))
+
+        agents = engine.orchestrator.agents
+        assert response.success
+        assert agents["mood_analyzer"].call_count == 1
+        assert agents["content_scorer"].call_count == 10
+        assert agents["content_ranker"].call_count == 1
+        # Non-deterministic agents still vote
+        assert agents["genre_matcher"].call_count >= DEVELOPMENT_CONFIG.voting.k
+        assert response.stats["deterministic_steps"] == 13
+
+    def test_deterministic_policy_override(self):
+        """Test that registration can override an agent's determinism."""
+        from maker.core import MAKEROrchestrator
+
+        orchestrator = MAKEROrchestrator(EntertainmentDiscoveryDecomposer())
+        orchestrator.register_agent(MoodAnalyzerAgent(), deterministic=False)
+        orchestrator.register_agent(GenreMatcherAgent(), deterministic=True)
+
+        assert orchestrator.deterministic_agents == {
+            "mood_analyzer": False,
+            "genre_matcher": True,
+        }
+
+    @pytest.mark.asyncio
+    async def test_repeated_request_hits_result_cache(self):
+        """Test that identical voted steps are replayed across requests."""
+        from maker.api import VibecastMAKER, DiscoveryRequest
+
+        engine = VibecastMAKER(config=DEVELOPMENT_CONFIG)
+        request = DiscoveryRequest(user_input="something funny", top_k=3)
+
+        await engine.discover(request)
+        genre_calls = engine.orchestrator.agents["genre_matcher"].call_count
+
+        response = await engine.discover(request)
+
+        assert response.success
+        assert engine.orchestrator.agents["genre_matcher"].call_count == genre_calls
+        assert response.stats["cache_hits"] > 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_have_isolated_stats(self):
+        """Test that one engine serves concurrent requests without mixing stats."""
+        from maker.api import VibecastMAKER, DiscoveryRequest
+
+        engine = VibecastMAKER(config=DEVELOPMENT_CONFIG)
+        requests = [
+            DiscoveryRequest(user_input="something funny", top_k=2),
+            DiscoveryRequest(user_input="an exciting thriller", top_k=3),
+        ]
+
+        responses = await asyncio.gather(*(engine.discover(r) for r in requests))
+
+        assert responses[0].stats is not responses[1].stats
+        for response in responses:
+            assert response.success
+            assert response.stats["successful_steps"] + response.stats["failed_steps"] == response.stats["total_steps"]
+
+        aggregate = engine.orchestrator.execution_stats
+        assert aggregate["total_steps"] == sum(r.stats["total_steps"] for r in responses)
+        assert aggregate["total_votes"] == sum(r.stats["total_votes"] for r in responses)
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])